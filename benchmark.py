@@ -0,0 +1,257 @@
+#!/usr/bin/python
+# coding=utf-8
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import Queue
+import shutil
+import sys
+import tempfile
+from collections import OrderedDict
+from gdf import escribir_gdf
+from grafo import GrafoPesoUnitario, GrafoPesado
+from grafo import instrumentacion
+from grafo.generadores import erdos_renyi, barabasi_albert, \
+        bloques_estocasticos, grilla
+from tp1 import TP1
+
+FASES = ('carga', 'caminos_minimos', 'popularidad', 'influencias',
+        'recomendaciones')
+
+CANTIDAD_BLOQUES_SBM = 4
+
+# Segundos entre cada verificación de que el proceso de un caso sigue
+# vivo mientras se espera su resultado.
+ESPERA_RESULTADO = 1
+
+# Proporción de las aristas del modelo de bloques que quedan dentro de
+# un bloque.
+PROPORCION_INTERNA_SBM = 0.8
+
+
+def generar(generador, cantidad_vertices, grado_medio, semilla):
+    """
+    O(|V|+|E|) esperado
+    Grafo sintético de aproximadamente cantidad_vertices vértices y
+    grado medio grado_medio.
+    """
+    if generador == 'er':
+        p = float(grado_medio) / max(cantidad_vertices - 1, 1)
+        return erdos_renyi(cantidad_vertices, p, semilla)
+    if generador == 'ba':
+        return barabasi_albert(cantidad_vertices,
+                max(1, int(grado_medio) // 2), semilla)
+    if generador == 'sbm':
+        tamanio = max(2, cantidad_vertices // CANTIDAD_BLOQUES_SBM)
+        n = tamanio * CANTIDAD_BLOQUES_SBM
+        p_interna = grado_medio * PROPORCION_INTERNA_SBM / (tamanio - 1)
+        p_externa = grado_medio * (1 - PROPORCION_INTERNA_SBM) / (
+                n - tamanio)
+        return bloques_estocasticos([tamanio] * CANTIDAD_BLOQUES_SBM,
+                min(1, p_interna), min(1, p_externa), semilla)
+    if generador == 'grilla':
+        lado = max(2, int(round(math.sqrt(cantidad_vertices))))
+        return grilla(lado, lado, semilla=semilla)
+    raise Exception('Generador desconocido: %s.' % generador)
+
+
+def medir_fases(filepath, clase_grafo, fases, procesos=None, error=None,
+        semilla=None, biconexas=False):
+    """
+    Ejecuta las fases de reporte_amigos_facebook_gdf sobre filepath y
+    devuelve las mediciones de cada una (ver Instrumentacion.fase).
+    """
+    tp1 = [None]
+
+    def cargar():
+        tp1[0] = TP1(filepath, clase_grafo=clase_grafo)
+
+    def caminos_minimos():
+        tp1[0].calcular_caminos_minimos()
+        tp1[0].liberar_caminos_minimos()
+
+    acciones = {
+        'carga': cargar,
+        'caminos_minimos': caminos_minimos,
+        'popularidad': lambda: tp1[0].get_popularidad(),
+        'influencias': lambda: tp1[0].get_influencias(procesos=procesos,
+            error=error, semilla=semilla, biconexas=biconexas),
+        'recomendaciones': lambda: tp1[0].recomendaciones(),
+        }
+
+    actual = instrumentacion.activar()
+    try:
+        for fase in ('carga',) + tuple(f for f in fases if f <> 'carga'):
+            with actual.fase(fase):
+                acciones[fase]()
+    finally:
+        instrumentacion.desactivar()
+    return actual.fases
+
+
+def _medir_caso(cola, *args, **kwargs):
+    try:
+        cola.put(medir_fases(*args, **kwargs))
+    except Exception, e:
+        cola.put(e)
+
+
+def medir_caso(*args, **kwargs):
+    """
+    Ejecuta medir_fases en un proceso nuevo, para que el pico de memoria
+    de cada caso no incluya el de los anteriores. Si el proceso termina
+    sin devolver un resultado (por ejemplo, porque el sistema lo mató por
+    falta de memoria) se lanza una excepción con su código de salida.
+    """
+    cola = multiprocessing.Queue()
+    proceso = multiprocessing.Process(target=_medir_caso,
+            args=(cola,) + args, kwargs=kwargs)
+    proceso.start()
+    while True:
+        vivo = proceso.is_alive()
+        try:
+            resultado = cola.get(timeout=ESPERA_RESULTADO)
+            break
+        except Queue.Empty:
+            # Se vuelve a esperar una vez después de verlo terminado, por
+            # si el resultado llegó justo antes.
+            if not vivo:
+                proceso.join()
+                raise Exception('El proceso del caso terminó sin '
+                        'resultado (código de salida %s).' % proceso.exitcode)
+    proceso.join()
+    if isinstance(resultado, Exception):
+        raise resultado
+    return resultado
+
+
+def benchmark(generadores, tamanios, grado_medio=10, semilla=0,
+        fases=FASES, procesos=None, error=None, biconexas=False,
+        etiqueta=None, salida=sys.stdout):
+    """
+    Mide cada fase para cada generador y tamaño, escribiendo un objeto
+    JSON por línea en salida.
+    """
+    directorio = tempfile.mkdtemp()
+    try:
+        for generador in generadores:
+            for tamanio in tamanios:
+                generado = generar(generador, tamanio, grado_medio, semilla)
+                filepath = os.path.join(directorio,
+                        '%s_%s.gdf' % (generador, tamanio))
+                ids = range(1, generado.cantidad_vertices + 1)
+                escribir_gdf(filepath, ids, [ 'v%s' % id for id in ids ],
+                        generado.origenes, generado.destinos, generado.pesos)
+                clase_grafo = (GrafoPesoUnitario if generado.pesos is None
+                        else GrafoPesado)
+
+                for medicion in medir_caso(filepath, clase_grafo, fases,
+                        procesos=procesos, error=error, semilla=semilla,
+                        biconexas=biconexas):
+                    salida.write(json.dumps(OrderedDict([
+                        ('etiqueta', etiqueta),
+                        ('generador', generador),
+                        ('vertices', generado.cantidad_vertices),
+                        ('aristas', len(generado)),
+                        ('semilla', semilla),
+                        ('procesos', procesos),
+                        ('error', error),
+                        ('biconexas', biconexas),
+                        ('fase', medicion['fase']),
+                        ('segundos', round(medicion['segundos'], 6)),
+                        ('cpu', round(medicion['cpu'], 6)),
+                        ('incremento_memoria_kb',
+                            medicion['incremento_memoria_kb']),
+                        ('memoria_maxima_proceso_kb',
+                            medicion['memoria_maxima_proceso_kb']),
+                        ('contadores', medicion['contadores']),
+                        ])) + '\n')
+                    salida.flush()
+                os.remove(filepath)
+    finally:
+        shutil.rmtree(directorio)
+
+
+def leer_resultados(filepath):
+    """
+    O(tamaño del archivo)
+    Segundos por (generador, vértices, fase) de un archivo de resultados.
+    """
+    resultados = OrderedDict()
+    with open(filepath) as f:
+        for linea in f:
+            if not linea.strip():
+                continue
+            resultado = json.loads(linea)
+            resultados[(resultado['generador'], resultado['vertices'],
+                resultado['fase'])] = resultado['segundos']
+    return resultados
+
+
+def comparar(anterior, actual, salida=sys.stdout):
+    """
+    Muestra el cociente de tiempos entre dos archivos de resultados para
+    los casos presentes en ambos.
+    """
+    anteriores = leer_resultados(anterior)
+    actuales = leer_resultados(actual)
+    for clave, segundos in actuales.iteritems():
+        if clave not in anteriores:
+            continue
+        previo = anteriores[clave]
+        cociente = segundos / previo if previo > 0 else float('inf')
+        salida.write('%-8s %8s %-16s %10.4f %10.4f %7.2fx\n' % (
+            clave + (previo, segundos, cociente)))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+            description='Mide cada fase del reporte sobre grafos '
+            'sintéticos y emite los resultados en JSON (uno por línea).')
+    parser.add_argument('--generadores', default='er,ba,sbm,grilla',
+            help='Lista separada por comas de er, ba, sbm y grilla.')
+    parser.add_argument('--tamanios', default='100,200,400',
+            help='Cantidades de vértices separadas por comas.')
+    parser.add_argument('--grado-medio', type=float, default=10)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--fases', default=','.join(FASES),
+            help='Fases a medir (la carga se mide siempre).')
+    parser.add_argument('--procesos', type=int, default=None)
+    parser.add_argument('--error', type=float, default=None)
+    parser.add_argument('--biconexas', action='store_true',
+            help='Calcula las influencias por componente biconexa.')
+    parser.add_argument('--etiqueta', default=None,
+            help='Texto que identifica la versión medida.')
+    parser.add_argument('--salida', default=None,
+            help='Archivo de resultados (por defecto la salida estándar).')
+    parser.add_argument('--comparar', nargs=2, default=None,
+            metavar=('ANTERIOR', 'ACTUAL'),
+            help='Compara dos archivos de resultados en lugar de medir.')
+    args = parser.parse_args()
+
+    if args.comparar is not None:
+        comparar(*args.comparar)
+        return
+
+    fases = args.fases.split(',')
+    for fase in fases:
+        if fase not in FASES:
+            parser.error('Fase desconocida: %s.' % fase)
+    salida = sys.stdout if args.salida is None else open(args.salida, 'a')
+    try:
+        benchmark(args.generadores.split(','),
+                [ int(tamanio) for tamanio in args.tamanios.split(',') ],
+                grado_medio=args.grado_medio, semilla=args.semilla,
+                fases=fases, procesos=args.procesos, error=args.error,
+                biconexas=args.biconexas, etiqueta=args.etiqueta,
+                salida=salida)
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/python
+# coding=utf-8
+
+import cPickle
+import hashlib
+import os
+import tempfile
+
+# Tamaño de los bloques con que se lee el archivo para calcular su huella.
+TAMANIO_BLOQUE = 1 << 20
+
+# Tamaño máximo por defecto de la caché en bytes.
+TAMANIO_MAXIMO = 256 << 20
+
+# Se incrementa si cambia el formato de los resultados guardados.
+VERSION = 1
+
+EXTENSION = '.resultado'
+
+
+def huella_archivo(filepath, tamanio_bloque=TAMANIO_BLOQUE):
+    """
+    O(tamaño del archivo)
+    Hash del contenido del archivo: dos archivos idénticos tienen la
+    misma huella sin importar su nombre o fecha.
+    """
+    sha1 = hashlib.sha1()
+    with open(filepath, 'rb') as f:
+        while True:
+            bloque = f.read(tamanio_bloque)
+            if not bloque:
+                break
+            sha1.update(bloque)
+    return sha1.hexdigest()
+
+
+class CacheResultados:
+    """
+    Resultados guardados en un directorio, un archivo por clave. La clave
+    se obtiene de la huella del archivo de entrada, el tipo de resultado
+    y los parámetros con que se calculó. Cuando el total supera
+    `tamanio_maximo` bytes se descartan los resultados usados hace más
+    tiempo.
+    """
+
+    def __init__(self, directorio, tamanio_maximo=TAMANIO_MAXIMO):
+        """
+        O(1)
+        """
+        self.directorio = directorio
+        self.tamanio_maximo = tamanio_maximo
+        if not os.path.isdir(directorio):
+            os.makedirs(directorio)
+
+    def clave(self, huella, tipo, **parametros):
+        """
+        O(cantidad de parámetros)
+        """
+        descripcion = repr((VERSION, huella, tipo, sorted(parametros.items())))
+        return hashlib.sha1(descripcion).hexdigest()
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, clave + EXTENSION)
+
+    def get(self, clave, defecto=None):
+        """
+        O(tamaño del resultado)
+        """
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, 'rb') as f:
+                valor = cPickle.load(f)
+        except (IOError, EOFError, cPickle.UnpicklingError):
+            return defecto
+        # Se marca como usado recientemente; si otro proceso lo acaba de
+        # descartar, el valor leído sigue siendo válido.
+        try:
+            os.utime(ruta, None)
+        except OSError:
+            pass
+        return valor
+
+    def put(self, clave, valor):
+        """
+        O(tamaño del resultado + cantidad de resultados guardados)
+        El archivo se escribe con otro nombre y se renombra, de modo que
+        una lectura concurrente nunca ve un resultado incompleto.
+        """
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio)
+        with os.fdopen(descriptor, 'wb') as f:
+            cPickle.dump(valor, f, cPickle.HIGHEST_PROTOCOL)
+        os.rename(temporal, self._ruta(clave))
+        self.descartar_excedente()
+
+    def obtener(self, clave, calcular):
+        """
+        Devuelve el resultado guardado para la clave o lo calcula con
+        calcular() y lo guarda.
+        """
+        valor = self.get(clave)
+        if valor is None:
+            valor = calcular()
+            self.put(clave, valor)
+        return valor
+
+    def descartar_excedente(self):
+        """
+        O(n*log(n)) siendo n la cantidad de resultados guardados.
+        """
+        resultados = []
+        total = 0
+        for nombre in os.listdir(self.directorio):
+            if not nombre.endswith(EXTENSION):
+                continue
+            ruta = os.path.join(self.directorio, nombre)
+            try:
+                estado = os.stat(ruta)
+            except OSError:
+                continue
+            resultados.append((estado.st_mtime, ruta, estado.st_size))
+            total += estado.st_size
+
+        resultados.sort()
+        for _, ruta, tamanio in resultados:
+            if total <= self.tamanio_maximo:
+                break
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+            total -= tamanio
+
+
+import shutil
+import unittest
+
+
+class CacheResultadosTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directorio)
+
+    def test_huella(self):
+
+        ruta = os.path.join(self.directorio, 'a.gdf')
+        with open(ruta, 'w') as f:
+            f.write('nodedef>\n1,a\n')
+        huella = huella_archivo('ejemplo_enunciado.gdf', tamanio_bloque=7)
+
+        self.assertEqual(huella, huella_archivo('ejemplo_enunciado.gdf'))
+        self.assertNotEqual(huella, huella_archivo(ruta))
+
+    def test_obtener(self):
+
+        cache = CacheResultados(self.directorio)
+        calculos = []
+        def calcular():
+            calculos.append(1)
+            return [0.5, 2.0]
+        clave = cache.clave('abc', 'influencias', error=None)
+
+        self.assertEqual(cache.obtener(clave, calcular), [0.5, 2.0])
+        self.assertEqual(cache.obtener(clave, calcular), [0.5, 2.0])
+        self.assertEqual(len(calculos), 1)
+        self.assertEqual(
+                CacheResultados(self.directorio).get(clave), [0.5, 2.0])
+        self.assertEqual(cache.get(
+            cache.clave('abc', 'influencias', error=0.1)), None)
+
+    def test_descartar_excedente(self):
+
+        cache = CacheResultados(self.directorio)
+        for i in xrange(3):
+            cache.put(str(i), 'x' * 1000)
+            # Fechas de uso distintas aunque la resolución sea baja
+            os.utime(cache._ruta(str(i)), (i, i))
+
+        cache.tamanio_maximo = 2500
+        cache.get('0')
+        cache.put('3', 'x' * 1000)
+
+        self.assertEqual(cache.get('1'), None)
+        self.assertEqual(cache.get('2'), None)
+        self.assertEqual(cache.get('0'), 'x' * 1000)
+        self.assertEqual(cache.get('3'), 'x' * 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
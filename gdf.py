@@ -0,0 +1,477 @@
+#!/usr/bin/python
+# coding=utf-8
+
+from array import array
+
+from nodos import AcumuladorIds, AcumuladorTextos, TablaNodos, indice_ids
+
+NODEDEF = 'nodedef>'
+EDGEDEF = 'edgedef>'
+
+# Tamaño de los bloques que se leen del archivo.
+TAMANIO_BLOQUE = 1 << 20
+
+COMILLAS = '\'"'
+
+
+def _booleano(valor):
+    """
+    O(1)
+    """
+    return valor.strip().lower() in ('true', '1', 'yes')
+
+
+TIPOS = {
+    'INTEGER': int,
+    'INT': int,
+    'TINYINT': int,
+    'SMALLINT': int,
+    'BIGINT': int,
+    'FLOAT': float,
+    'DOUBLE': float,
+    'REAL': float,
+    'BOOLEAN': _booleano,
+    'VARCHAR': str,
+    }
+
+# Columnas que se asumen si el encabezado no declara ninguna.
+COLUMNAS_NODOS = [('name', 'INTEGER'), ('label', 'VARCHAR')]
+COLUMNAS_ARISTAS = [('node1', 'INTEGER'), ('node2', 'INTEGER')]
+
+
+def separar_campos(linea):
+    """
+    O(len(linea))
+    Separa los campos de una línea. Un campo que comienza con comillas
+    simples o dobles puede contener comas; las comillas se descartan.
+    """
+    if '\'' not in linea and '"' not in linea:
+        return [ campo.strip() for campo in linea.split(',') ]
+
+    campos = []
+    campo = []
+    comilla = None
+    for c in linea:
+        if comilla is not None:
+            if c == comilla:
+                comilla = None
+            else:
+                campo.append(c)
+        elif c in COMILLAS and not ''.join(campo).strip():
+            comilla = c
+            campo = []
+        elif c == ',':
+            campos.append(''.join(campo).strip())
+            campo = []
+        else:
+            campo.append(c)
+    campos.append(''.join(campo).strip())
+    return campos
+
+
+def columnas_encabezado(encabezado, por_defecto):
+    """
+    O(len(encabezado))
+    Obtiene las columnas declaradas (nombre, tipo) de una línea
+    'nodedef>' o 'edgedef>'.
+    """
+    definicion = encabezado.split('>', 1)[1].strip()
+    if not definicion:
+        return por_defecto
+    columnas = []
+    for columna in separar_campos(definicion):
+        partes = columna.split()
+        tipo = partes[1].upper() if len(partes) > 1 else 'VARCHAR'
+        columnas.append((partes[0].lower(), tipo))
+    return columnas
+
+
+def _conversor(tipo):
+    """
+    O(1)
+    """
+    return TIPOS.get(tipo.split('(')[0], str)
+
+
+def _posicion(columnas, nombres):
+    """
+    O(len(columnas))
+    """
+    for i, (nombre, _) in enumerate(columnas):
+        if nombre in nombres:
+            return i
+    return None
+
+
+def _bloques(archivo, tamanio_bloque):
+    """
+    Genera el contenido del archivo en bloques de líneas completas.
+    """
+    resto = ''
+    while True:
+        bloque = archivo.read(tamanio_bloque)
+        if not bloque:
+            break
+        bloque = resto + bloque
+        corte = bloque.rfind('\n') + 1
+        resto = bloque[corte:]
+        if corte:
+            yield bloque[:corte]
+    if resto:
+        yield resto + '\n'
+
+
+def _buscar_encabezado(bloque, desde):
+    """
+    O(len(bloque))
+    Posición del próximo encabezado de sección al comienzo de una línea
+    o -1 si no hay ninguno.
+    """
+    posiciones = []
+    for encabezado in (NODEDEF, EDGEDEF):
+        i = bloque.find(encabezado, desde)
+        while i > 0 and bloque[i-1] <> '\n':
+            i = bloque.find(encabezado, i + 1)
+        if i >= 0:
+            posiciones.append(i)
+    if not posiciones:
+        return -1
+    return min(posiciones)
+
+
+class GrupoAristas:
+    """
+    Aristas de un mismo tipo (dirigidas o no) como arreglos paralelos de
+    índices de vértices.
+    """
+
+    def __init__(self, tipo_peso=None):
+        """
+        O(1)
+        """
+        self.origenes = array('l')
+        self.destinos = array('l')
+        self.pesos = None if tipo_peso is None else array(tipo_peso)
+
+    def __len__(self):
+        return len(self.origenes)
+
+
+class ContenidoGDF:
+    """
+    Resultado de leer un archivo gdf: los nodos por columnas en el orden
+    del archivo (que es el orden de los vértices) y las aristas
+    agrupadas por dirección.
+        ids: columna de ids (ver nodos.columna_ids).
+        descripciones: ColumnaTextos con las descripciones.
+        indice: IndiceIds con el vértice de cada id.
+    Mientras se leen los nodos, ids y descripciones son acumuladores
+    (ver nodos.AcumuladorIds) y el índice es None.
+    """
+
+    def __init__(self):
+        """
+        O(1)
+        """
+        self.columnas_nodos = COLUMNAS_NODOS
+        self.columnas_aristas = COLUMNAS_ARISTAS
+        self.ids = AcumuladorIds()
+        self.descripciones = AcumuladorTextos()
+        self.indice = None
+        self.no_dirigidas = GrupoAristas()
+        self.dirigidas = GrupoAristas()
+
+    def _leer_nodos(self, texto):
+        """
+        O(len(texto))
+        """
+        if self.indice is not None:
+            raise Exception('Los nodos deben declararse antes que las '
+                    'aristas.')
+        convertir_id = _conversor(self.columnas_nodos[0][1])
+        agregar_id = self.ids.agregar
+        agregar_descripcion = self.descripciones.agregar
+        for linea in texto.splitlines():
+            if not linea.strip():
+                continue
+            campos = separar_campos(linea)
+            agregar_id(convertir_id(campos[0]))
+            agregar_descripcion(campos[1] if len(campos) > 1 else '')
+
+    def _cerrar_nodos(self):
+        """
+        O(|V|*log(|V|)) (O(|V|) si los ids son consecutivos)
+        Reemplaza los acumuladores por las columnas y arma el índice.
+        """
+        if self.indice is None:
+            self.ids = self.ids.columna()
+            self.descripciones = self.descripciones.columna()
+            self.indice = indice_ids(self.ids)
+
+    def tabla_nodos(self, crear_nodo):
+        """
+        O(1)
+        Nodos leídos como TablaNodos, que crea cada nodo con
+        crear_nodo(id, descripción) al accederlo.
+        """
+        return TablaNodos(self.ids, self.descripciones, self.indice,
+                crear_nodo)
+
+    def _preparar_aristas(self):
+        """
+        O(1), más el cierre de los nodos (ver _cerrar_nodos).
+        """
+        self._cerrar_nodos()
+        columnas = self.columnas_aristas
+        self.posicion_peso = _posicion(columnas, ('weight', 'peso'))
+        self.posicion_dirigida = _posicion(columnas, ('directed',))
+        self.convertir_id = _conversor(self.columnas_nodos[0][1])
+        tipo_peso = None
+        if self.posicion_peso is not None:
+            self.convertir_peso = _conversor(
+                    columnas[self.posicion_peso][1])
+            tipo_peso = 'l' if self.convertir_peso is int else 'd'
+            if self.convertir_peso not in (int, float):
+                self.convertir_peso = float
+        self.no_dirigidas = GrupoAristas(tipo_peso)
+        self.dirigidas = GrupoAristas(tipo_peso)
+
+    def _leer_aristas(self, texto):
+        """
+        O(len(texto)) si los ids son consecutivos, O(len(texto)+
+        cantidad de aristas*log(|V|)) si no.
+        Con ids consecutivos el vértice es el id menos el primero y los
+        que quedan fuera de rango se detectan al terminar (ver
+        _verificar_aristas).
+        """
+        indice = self.indice
+        base = indice.base if indice.orden is None else None
+        buscar = indice.buscador()
+        convertir_id = self.convertir_id
+        posicion_peso = self.posicion_peso
+        posicion_dirigida = self.posicion_dirigida
+        for linea in texto.splitlines():
+            if not linea.strip():
+                continue
+            campos = separar_campos(linea)
+            try:
+                if base is None:
+                    u = buscar(convertir_id(campos[0]))
+                    v = buscar(convertir_id(campos[1]))
+                else:
+                    u = convertir_id(campos[0]) - base
+                    v = convertir_id(campos[1]) - base
+            except KeyError, e:
+                raise Exception('La arista %s une un nodo inexistente (%s).'
+                        % (linea.strip(), e.args[0]))
+            except TypeError:
+                raise Exception('La arista %s une un nodo inexistente.'
+                        % linea.strip())
+            grupo = self.no_dirigidas
+            if (posicion_dirigida is not None and
+                    posicion_dirigida < len(campos) and
+                    _booleano(campos[posicion_dirigida])):
+                grupo = self.dirigidas
+            grupo.origenes.append(u)
+            grupo.destinos.append(v)
+            if posicion_peso is not None:
+                peso = 1
+                if posicion_peso < len(campos) and campos[posicion_peso]:
+                    peso = self.convertir_peso(campos[posicion_peso])
+                grupo.pesos.append(peso)
+
+    def _verificar_aristas(self):
+        """
+        O(cantidad de aristas) si los ids son consecutivos, O(1) si no.
+        """
+        indice = self.indice
+        if indice.orden is not None:
+            return
+        for grupo in (self.no_dirigidas, self.dirigidas):
+            for extremos in (grupo.origenes, grupo.destinos):
+                if len(extremos) == 0 or (
+                        min(extremos) >= 0 and max(extremos) < len(indice)):
+                    continue
+                for k in xrange(len(extremos)):
+                    if not 0 <= extremos[k] < len(indice):
+                        raise Exception('La arista %s,%s une un nodo '
+                                'inexistente (%s).' % (
+                                    grupo.origenes[k] + indice.base,
+                                    grupo.destinos[k] + indice.base,
+                                    extremos[k] + indice.base))
+
+
+def leer_gdf(filepath, tamanio_bloque=TAMANIO_BLOQUE):
+    """
+    O(tamaño del archivo)
+    Lee un archivo gdf en bloques. Los encabezados de sección se buscan
+    sobre el bloque completo, de modo que las líneas de nodos y aristas
+    se procesan sin volver a verificar su tipo. Los nodos se guardan
+    directamente por columnas, sin un diccionario de ids ni un str por
+    nodo (ver ContenidoGDF).
+    """
+    contenido = ContenidoGDF()
+    leer_seccion = None
+
+    with open(filepath, 'rb') as f:
+        for bloque in _bloques(f, tamanio_bloque):
+            desde = 0
+            while desde < len(bloque):
+                encabezado = _buscar_encabezado(bloque, desde)
+                hasta = len(bloque) if encabezado < 0 else encabezado
+                if leer_seccion is not None and hasta > desde:
+                    leer_seccion(bloque[desde:hasta])
+                if encabezado < 0:
+                    break
+                fin_encabezado = bloque.find('\n', encabezado)
+                linea = bloque[encabezado:fin_encabezado]
+                if linea.startswith(NODEDEF):
+                    contenido.columnas_nodos = columnas_encabezado(
+                            linea, COLUMNAS_NODOS)
+                    leer_seccion = contenido._leer_nodos
+                else:
+                    contenido.columnas_aristas = columnas_encabezado(
+                            linea, COLUMNAS_ARISTAS)
+                    contenido._preparar_aristas()
+                    leer_seccion = contenido._leer_aristas
+                desde = fin_encabezado + 1
+
+    contenido._cerrar_nodos()
+    contenido._verificar_aristas()
+    return contenido
+
+
+def _campo(valor):
+    """
+    O(len(valor))
+    """
+    valor = str(valor)
+    if ',' in valor:
+        return "'%s'" % valor
+    return valor
+
+
+def escribir_gdf(filepath, ids, descripciones, origenes, destinos,
+        pesos=None):
+    """
+    O(|V|+|E|)
+    Escribe un archivo gdf con los nodos ids[i] (descripciones[i]) y las
+    aristas no dirigidas ids[origenes[k]], ids[destinos[k]].
+    """
+    with open(filepath, 'wb') as f:
+        tipo_id = 'INTEGER' if all(
+                isinstance(id, (int, long)) for id in ids) else 'VARCHAR'
+        f.write('nodedef>name %s,label VARCHAR\n' % tipo_id)
+        for id, descripcion in zip(ids, descripciones):
+            f.write('%s,%s\n' % (_campo(id), _campo(descripcion)))
+        if pesos is None:
+            f.write('edgedef>node1 %s,node2 %s\n' % (tipo_id, tipo_id))
+            for k in xrange(len(origenes)):
+                f.write('%s,%s\n' % (_campo(ids[origenes[k]]),
+                    _campo(ids[destinos[k]])))
+        else:
+            tipo_peso = 'INTEGER' if all(
+                    isinstance(peso, (int, long)) for peso in pesos
+                    ) else 'DOUBLE'
+            f.write('edgedef>node1 %s,node2 %s,weight %s\n' % (
+                tipo_id, tipo_id, tipo_peso))
+            for k in xrange(len(origenes)):
+                f.write('%s,%s,%r\n' % (_campo(ids[origenes[k]]),
+                    _campo(ids[destinos[k]]), pesos[k]))
+
+
+import os
+import tempfile
+import unittest
+
+
+class GDFTestCase(unittest.TestCase):
+
+    def escribir(self, texto):
+        descriptor, filepath = tempfile.mkstemp(suffix='.gdf')
+        with os.fdopen(descriptor, 'w') as f:
+            f.write(texto)
+        self.addCleanup(os.remove, filepath)
+        return filepath
+
+    def test_separar_campos(self):
+
+        self.assertEqual(separar_campos('1,Roberto'), ['1', 'Roberto'])
+        self.assertEqual(separar_campos(' 1 , Roberto '), ['1', 'Roberto'])
+        self.assertEqual(separar_campos("1,'Perez, Juan',x"),
+                ['1', 'Perez, Juan', 'x'])
+        self.assertEqual(separar_campos('1,"Perez, Juan"'),
+                ['1', 'Perez, Juan'])
+        self.assertEqual(separar_campos("1,O'Higgins"), ['1', "O'Higgins"])
+
+    def test_enunciado(self):
+
+        contenido = leer_gdf('ejemplo_enunciado.gdf', tamanio_bloque=7)
+
+        self.assertEqual([ contenido.ids[u] for u in xrange(11) ],
+                range(1, 12))
+        self.assertEqual(contenido.descripciones[10], 'Nora')
+        self.assertEqual(len(contenido.no_dirigidas), 17)
+        self.assertEqual(len(contenido.dirigidas), 0)
+        self.assertEqual(contenido.no_dirigidas.pesos, None)
+        self.assertEqual(
+                (contenido.no_dirigidas.origenes[16],
+                    contenido.no_dirigidas.destinos[16]),
+                (contenido.indice[6], contenido.indice[7]))
+
+    def test_columnas_declaradas(self):
+
+        filepath = self.escribir('\n'.join([
+            "nodedef>name VARCHAR,label VARCHAR,edad INTEGER",
+            "a,'Perez, Juan',30",
+            "b,\"Gomez, Ana\",25",
+            "c,Nora,20",
+            "edgedef>node1 VARCHAR,node2 VARCHAR,weight DOUBLE,"
+            "directed BOOLEAN",
+            "a,b,2.5,false",
+            "b,c,,true",
+            "c,a,1,false",
+            ]))
+
+        contenido = leer_gdf(filepath, tamanio_bloque=16)
+
+        self.assertEqual(list(contenido.ids), ['a', 'b', 'c'])
+        self.assertEqual(list(contenido.descripciones),
+                ['Perez, Juan', 'Gomez, Ana', 'Nora'])
+        self.assertEqual(list(contenido.no_dirigidas.origenes), [0, 2])
+        self.assertEqual(list(contenido.no_dirigidas.destinos), [1, 0])
+        self.assertEqual(list(contenido.no_dirigidas.pesos), [2.5, 1.0])
+        self.assertEqual(list(contenido.dirigidas.origenes), [1])
+        self.assertEqual(list(contenido.dirigidas.destinos), [2])
+        self.assertEqual(list(contenido.dirigidas.pesos), [1.0])
+
+    def test_escribir_gdf(self):
+
+        filepath = self.escribir('')
+        escribir_gdf(filepath, ['a', 'b', 'c'], ['Perez, Juan', 'Ana', 'Nora'],
+                [0, 1], [1, 2], [2.5, 1])
+
+        contenido = leer_gdf(filepath)
+
+        self.assertEqual(list(contenido.ids), ['a', 'b', 'c'])
+        self.assertEqual(list(contenido.descripciones),
+                ['Perez, Juan', 'Ana', 'Nora'])
+        self.assertEqual(list(contenido.no_dirigidas.origenes), [0, 1])
+        self.assertEqual(list(contenido.no_dirigidas.destinos), [1, 2])
+        self.assertEqual(list(contenido.no_dirigidas.pesos), [2.5, 1.0])
+
+    def test_nodo_inexistente(self):
+
+        filepath = self.escribir('nodedef>\n1,a\nedgedef>\n1,2\n')
+
+        self.assertRaises(Exception, leer_gdf, filepath)
+        for aristas in ('0,1', '1,3', "1,'a'"):
+            filepath = self.escribir('nodedef>\n1,a\n2,b\nedgedef>\n1,2\n'
+                    + aristas + '\n')
+            self.assertRaises(Exception, leer_gdf, filepath)
+        filepath = self.escribir('nodedef>\n1,a\n5,b\nedgedef>\n1,4\n')
+        self.assertRaises(Exception, leer_gdf, filepath)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+from adyacencias import *
 from grafo import *
 from grafo_pesado import *
 from grafo_no_pesado import *
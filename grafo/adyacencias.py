@@ -0,0 +1,540 @@
+#!/usr/bin/python
+# coding=utf-8
+
+import binascii
+import bisect
+from array import array
+from itertools import izip, repeat
+from lista_ordenada import ListaOrdenada
+
+
+class AdyacenciasListas:
+    """
+    Representación original de las adyacencias: por cada vértice un
+    diccionario de pesos y una ListaOrdenada con los mismos adyacentes.
+    """
+
+    # Ver AdyacenciasBits
+    por_bits = False
+    # Ver AdyacenciasCSR
+    diferida = False
+
+    def __init__(self):
+        """
+        O(1)
+        """
+        self.pesos = []
+        self.lista_ady = []
+
+    def add_node(self):
+        """
+        O(1)
+        """
+        self.pesos.append({})
+        self.lista_ady.append(ListaOrdenada())
+
+    def connect(self, u, v, peso=1):
+        """
+        O(Au)
+        """
+        self.pesos[u][v] = peso
+        # O(Au)
+        self.lista_ady[u].insert(v)
+
+    def disconnect(self, u, v):
+        """
+        O(Au)
+        """
+        self.lista_ady[u].remove(v)
+        del self.pesos[u][v]
+
+    def cargar(self, origenes, destinos, pesos=None):
+        """
+        O(|E|*log(|V|))
+        Agrega un conjunto de aristas agrupándolas por origen y ordenando
+        una única vez los adyacentes de cada vértice. Si alguna arista ya
+        existe o se repite no se agrega ninguna.
+        """
+        nuevos = {}
+        for k in xrange(len(origenes)):
+            nuevos.setdefault(origenes[k], []).append(k)
+        # Se arman todas las listas antes de modificar nada, para que
+        # una arista repetida no deje desparejos pesos y lista_ady.
+        listas = {}
+        for u, aristas in nuevos.iteritems():
+            listas[u] = self.lista_ady[u].union(
+                    destinos[k] for k in aristas)
+        for u, aristas in nuevos.iteritems():
+            pesos_u = self.pesos[u]
+            for k in aristas:
+                pesos_u[destinos[k]] = 1 if pesos is None else pesos[k]
+            self.lista_ady[u].lista = listas[u]
+
+    def ady(self, u):
+        """
+        O(1)
+        """
+        return self.pesos[u]
+
+    def ady_con_pesos(self, u):
+        """
+        O(1)
+        Iterador de pares (adyacente, peso).
+        """
+        return self.pesos[u].iteritems()
+
+    def grado_salida(self, u):
+        """
+        O(1)
+        """
+        return len(self.pesos[u])
+
+    def conectados(self, u, v):
+        """
+        O(log(Au))
+        """
+        return self.lista_ady[u].has(v)
+
+    def conexiones_en_comun(self, u, v):
+        """
+        O(Au+Av)
+        """
+        return self.lista_ady[u].intersection(self.lista_ady[v])
+
+    def cantidad_conexiones_en_comun(self, u, v):
+        """
+        O(Au+Av)
+        """
+        return len(self.conexiones_en_comun(u, v))
+
+
+class AdyacenciasCSR:
+    """
+    Representación compacta (compressed sparse row): los adyacentes de
+    todos los vértices se guardan ordenados en un único arreglo
+    `vecinos`, y los de u ocupan vecinos[inicio[u]:inicio[u+1]]. Los
+    pesos se guardan en un arreglo paralelo sólo si alguna arista tiene
+    un peso distinto de 1.
+    Las aristas agregadas con connect quedan pendientes hasta la próxima
+    consulta, momento en que se reconstruye la estructura completa (y
+    se detectan las repetidas).
+    """
+
+    por_bits = False
+    diferida = True
+
+    def __init__(self):
+        """
+        O(1)
+        """
+        self.cantidad_vertices = 0
+        self.inicio = array('l', [0])
+        self.vecinos = array('i')
+        self.pesos = None
+        self.tipo_pesos = None
+        self.pendientes_origen = array('i')
+        self.pendientes_destino = array('i')
+        self.pendientes_pesos = None
+
+    def add_node(self):
+        """
+        O(1)
+        """
+        self.cantidad_vertices += 1
+
+    @staticmethod
+    def desde_arreglos(inicio, vecinos, pesos=None, tipo_pesos=None):
+        """
+        O(1)
+        Crea la representación a partir de arreglos ya compactados.
+        Alcanza con que los arreglos admitan len, índices y rebanadas,
+        por ejemplo arreglos de ctypes sobre un archivo mapeado en memoria.
+        """
+        adyacencias = AdyacenciasCSR()
+        adyacencias.cantidad_vertices = len(inicio) - 1
+        adyacencias.inicio = inicio
+        adyacencias.vecinos = vecinos
+        adyacencias.pesos = pesos
+        adyacencias.tipo_pesos = None if pesos is None else tipo_pesos
+        return adyacencias
+
+    def connect(self, u, v, peso=1):
+        """
+        O(1) amortizado. La arista se incorpora al compactar.
+        """
+        self.pendientes_origen.append(u)
+        self.pendientes_destino.append(v)
+        if self.pendientes_pesos is None and peso == 1:
+            return
+        if self.pendientes_pesos is None:
+            self.pendientes_pesos = array(
+                    _tipo_peso(peso), [1] * (len(self.pendientes_origen) - 1))
+        elif (self.pendientes_pesos.typecode == 'l' and
+                _tipo_peso(peso) == 'd'):
+            self.pendientes_pesos = array('d', self.pendientes_pesos)
+        self.pendientes_pesos.append(peso)
+
+    def cargar(self, origenes, destinos, pesos=None):
+        """
+        O(|E|) La estructura se reconstruye en la próxima consulta.
+        """
+        cantidad_previa = len(self.pendientes_origen)
+        self.pendientes_origen.extend(array('i', origenes))
+        self.pendientes_destino.extend(array('i', destinos))
+        if pesos is None:
+            if self.pendientes_pesos is not None:
+                self.pendientes_pesos.extend(
+                        array(self.pendientes_pesos.typecode, [1]) *
+                        len(origenes))
+            return
+        tipo = 'd' if 'd' in (_tipo_arreglo(pesos),
+                _tipo_arreglo(self.pendientes_pesos)) else 'l'
+        if self.pendientes_pesos is None:
+            self.pendientes_pesos = array(tipo, [1]) * cantidad_previa
+        elif self.pendientes_pesos.typecode <> tipo:
+            self.pendientes_pesos = array(tipo, self.pendientes_pesos)
+        self.pendientes_pesos.extend(array(tipo, pesos))
+
+    def disconnect(self, u, v):
+        """
+        O(|V|+|E|)
+        """
+        self.compactar()
+        j = self.inicio[u+1]
+        k = bisect.bisect_left(self.vecinos, v, self.inicio[u], j)
+        if k == j or self.vecinos[k] <> v:
+            raise Exception('La arista (%s, %s) no existe.' % (u, v))
+        # Los arreglos pueden estar mapeados desde un snapshot.
+        self.inicio = array('l', self.inicio)
+        self.vecinos = array('i', self.vecinos)
+        del self.vecinos[k]
+        if self.pesos is not None:
+            self.pesos = array(self.tipo_pesos, self.pesos)
+            del self.pesos[k]
+        for w in xrange(u + 1, self.cantidad_vertices + 1):
+            self.inicio[w] -= 1
+
+    def compactar(self):
+        """
+        O(|V|+|E|*log(|V|)) si hay aristas pendientes, O(1) si no.
+        Incorpora las aristas pendientes ordenando los adyacentes de
+        cada vértice.
+        """
+        cantidad_vertices_previa = len(self.inicio) - 1
+        if (len(self.pendientes_origen) == 0 and
+                cantidad_vertices_previa == self.cantidad_vertices):
+            return
+
+        # O(|V|+|E|)
+        grado = array('l', [0]) * self.cantidad_vertices
+        for u in xrange(cantidad_vertices_previa):
+            grado[u] = self.inicio[u+1] - self.inicio[u]
+        for u in self.pendientes_origen:
+            grado[u] += 1
+
+        inicio = array('l', [0]) * (self.cantidad_vertices + 1)
+        for u in xrange(self.cantidad_vertices):
+            inicio[u+1] = inicio[u] + grado[u]
+
+        cantidad_aristas = inicio[self.cantidad_vertices]
+        vecinos = array('i', [0]) * cantidad_aristas
+        pesos = None
+        if self.pesos is not None or self.pendientes_pesos is not None:
+            tipo = 'd' if 'd' in (self.tipo_pesos,
+                    _tipo_arreglo(self.pendientes_pesos)) else 'l'
+            pesos = array(tipo, [1]) * cantidad_aristas
+
+        # O(|V|+|E|) Se ubican las aristas existentes y las pendientes
+        posicion = inicio[:-1]
+        for u in xrange(cantidad_vertices_previa):
+            for k in xrange(self.inicio[u], self.inicio[u+1]):
+                vecinos[posicion[u]] = self.vecinos[k]
+                if self.pesos is not None:
+                    pesos[posicion[u]] = self.pesos[k]
+                posicion[u] += 1
+        for k in xrange(len(self.pendientes_origen)):
+            u = self.pendientes_origen[k]
+            vecinos[posicion[u]] = self.pendientes_destino[k]
+            if self.pendientes_pesos is not None:
+                pesos[posicion[u]] = self.pendientes_pesos[k]
+            posicion[u] += 1
+
+        # O(|E|*log(|V|)) Se ordenan los adyacentes de cada vértice
+        for u in xrange(self.cantidad_vertices):
+            i, j = inicio[u], inicio[u+1]
+            if j - i < 2:
+                continue
+            if pesos is None:
+                fila = sorted(vecinos[i:j])
+                vecinos[i:j] = array('i', fila)
+            else:
+                fila = sorted(izip(vecinos[i:j], pesos[i:j]))
+                vecinos[i:j] = array('i', [v for v, _ in fila])
+                pesos[i:j] = array(pesos.typecode, [p for _, p in fila])
+            for k in xrange(i + 1, j):
+                if vecinos[k] == vecinos[k-1]:
+                    raise Exception('La arista (%s, %s) ya existe.' % (
+                        u, vecinos[k]))
+
+        self.inicio = inicio
+        self.vecinos = vecinos
+        self.pesos = pesos
+        self.tipo_pesos = None if pesos is None else pesos.typecode
+        self.pendientes_origen = array('i')
+        self.pendientes_destino = array('i')
+        self.pendientes_pesos = None
+
+    def ady(self, u):
+        """
+        O(Au)
+        """
+        self.compactar()
+        return self.vecinos[self.inicio[u]:self.inicio[u+1]]
+
+    def ady_con_pesos(self, u):
+        """
+        O(Au)
+        Iterador de pares (adyacente, peso).
+        """
+        self.compactar()
+        i, j = self.inicio[u], self.inicio[u+1]
+        if self.pesos is None:
+            return izip(self.vecinos[i:j], repeat(1))
+        return izip(self.vecinos[i:j], self.pesos[i:j])
+
+    def grado_salida(self, u):
+        """
+        O(1)
+        """
+        self.compactar()
+        return self.inicio[u+1] - self.inicio[u]
+
+    def conectados(self, u, v):
+        """
+        O(log(Au))
+        """
+        self.compactar()
+        j = self.inicio[u+1]
+        i = bisect.bisect_left(self.vecinos, v, self.inicio[u], j)
+        return i <> j and self.vecinos[i] == v
+
+    def conexiones_en_comun(self, u, v):
+        """
+        O(Au+Av)
+        """
+        self.compactar()
+        vecinos = self.vecinos
+        i_u, fin_u = self.inicio[u], self.inicio[u+1]
+        i_v, fin_v = self.inicio[v], self.inicio[v+1]
+        interseccion = []
+
+        while i_u < fin_u and i_v < fin_v:
+            x_u = vecinos[i_u]
+            x_v = vecinos[i_v]
+
+            if x_u < x_v:
+                i_u += 1
+            elif x_u > x_v:
+                i_v += 1
+            else:
+                interseccion.append(x_u)
+                i_u += 1
+                i_v += 1
+
+        return interseccion
+
+    def cantidad_conexiones_en_comun(self, u, v):
+        """
+        O(Au+Av)
+        """
+        return len(self.conexiones_en_comun(u, v))
+
+
+class AdyacenciasBits(AdyacenciasCSR):
+    """
+    Representación para grafos densos: además de la estructura CSR
+    (que se usa para recorrer los adyacentes), los adyacentes de cada
+    vértice se guardan como un entero de |V| bits. Verificar una arista
+    es consultar un bit y contar conexiones en común es un AND y contar
+    los bits resultantes, operaciones que Python resuelve en C sobre
+    palabras de máquina. Ocupa |V|**2/8 bytes adicionales.
+    """
+
+    por_bits = True
+
+    def __init__(self):
+        """
+        O(1)
+        """
+        AdyacenciasCSR.__init__(self)
+        self.bits = []
+
+    def compactar(self):
+        """
+        O(|V|**2/8+|E|*log(|V|)) si hay aristas pendientes, O(1) si no.
+        """
+        if (len(self.pendientes_origen) == 0 and
+                len(self.inicio) - 1 == self.cantidad_vertices and
+                len(self.bits) == self.cantidad_vertices):
+            return
+        AdyacenciasCSR.compactar(self)
+        tamanio = (self.cantidad_vertices + 7) // 8
+        bits = []
+        for u in xrange(self.cantidad_vertices):
+            fila = bytearray(tamanio)
+            for k in xrange(self.inicio[u], self.inicio[u+1]):
+                v = self.vecinos[k]
+                fila[v >> 3] |= 1 << (v & 7)
+            bits.append(_entero(fila))
+        self.bits = bits
+
+    def disconnect(self, u, v):
+        """
+        O(|V|+|E|)
+        """
+        AdyacenciasCSR.disconnect(self, u, v)
+        self.bits[u] &= ~(1 << v)
+
+    def conectados(self, u, v):
+        """
+        O(|V|/64) en C
+        """
+        self.compactar()
+        return (self.bits[u] >> v) & 1 == 1
+
+    def conexiones_en_comun(self, u, v):
+        """
+        O(|V|/8)
+        """
+        self.compactar()
+        return list(_bits_activos(self.bits[u] & self.bits[v]))
+
+    def cantidad_conexiones_en_comun(self, u, v):
+        """
+        O(|V|/64) en C
+        """
+        self.compactar()
+        return _contar_bits(self.bits[u] & self.bits[v])
+
+    def contar_conexiones_en_comun(self, u):
+        """
+        O(Au*log(Au)*|V|/64) en C y O(K*log(Au)) en Python, siendo K la
+        cantidad de candidatos.
+        Devuelve un diccionario {v: cantidad} con los vértices v distintos
+        de u y no adyacentes a u que tienen conexiones en común con u (ver
+        Grafo.contar_conexiones_en_comun). Las filas de los adyacentes de
+        u se suman con un contador por bits: contadores[i] tiene en el
+        bit v el bit i de la cantidad de conexiones en común con v, de
+        modo que cada suma son unos pocos XOR y AND entre filas.
+        """
+        self.compactar()
+        bits = self.bits
+        contadores = []
+        for k in xrange(self.inicio[u], self.inicio[u+1]):
+            acarreo = bits[self.vecinos[k]]
+            for i in xrange(len(contadores)):
+                contador = contadores[i]
+                contadores[i] = contador ^ acarreo
+                acarreo &= contador
+                if not acarreo:
+                    break
+            else:
+                if acarreo:
+                    contadores.append(acarreo)
+
+        excluidos = ~(bits[u] | (1 << u))
+        conteo = {}
+        for i, contador in enumerate(contadores):
+            valor = 1 << i
+            for v in _bits_activos(contador & excluidos):
+                conteo[v] = conteo.get(v, 0) + valor
+        return conteo
+
+
+# Posiciones de los bits encendidos de cada byte.
+_BITS_DE_BYTE = [ tuple( k for k in xrange(8) if b >> k & 1 )
+        for b in xrange(256) ]
+
+# Conviene AdyacenciasBits a partir de esta densidad de aristas...
+DENSIDAD_MINIMA_BITS = 0.05
+# ... siempre que la matriz de bits no ocupe más de 128 MB.
+MAXIMO_VERTICES_BITS = 1 << 15
+
+
+def elegir_adyacencias(cantidad_vertices, cantidad_entradas):
+    """
+    O(1)
+    Representación adecuada para un grafo con cantidad_entradas
+    adyacencias (cada arista no dirigida cuenta dos veces) que se carga
+    de una vez y luego casi no se modifica: AdyacenciasBits si es denso
+    y AdyacenciasCSR si no. Cada arista agregada con connect reconstruye
+    la estructura CSR en la próxima consulta, de modo que para grafos
+    que se modifican arista por arista conviene AdyacenciasListas.
+    """
+    if 1 < cantidad_vertices <= MAXIMO_VERTICES_BITS:
+        densidad = float(cantidad_entradas) / (
+                cantidad_vertices * (cantidad_vertices - 1))
+        if densidad >= DENSIDAD_MINIMA_BITS:
+            return AdyacenciasBits
+    return AdyacenciasCSR
+
+
+def _entero(fila):
+    """
+    O(len(fila))
+    Entero cuyo bit i es el bit i de la fila (el byte 0 es el menos
+    significativo).
+    """
+    if not fila:
+        return 0
+    fila.reverse()
+    return int(binascii.hexlify(fila), 16)
+
+
+def _bits_activos(x):
+    """
+    O(log(x)/8)
+    Genera en orden creciente las posiciones de los bits encendidos.
+    """
+    hexadecimal = '%x' % x
+    if len(hexadecimal) % 2:
+        hexadecimal = '0' + hexadecimal
+    fila = bytearray(binascii.unhexlify(hexadecimal))
+    fila.reverse()
+    for i, byte in enumerate(fila):
+        if byte:
+            base = i << 3
+            for k in _BITS_DE_BYTE[byte]:
+                yield base + k
+
+
+def _contar_bits(x):
+    """
+    O(log(x)) en C
+    """
+    return bin(x).count('1')
+
+
+def _tipo_arreglo(pesos):
+    """
+    O(len(pesos)) si pesos no es un array.
+    Código de tipo de array adecuado para guardar todos los pesos.
+    """
+    if pesos is None:
+        return None
+    if isinstance(pesos, array):
+        return 'd' if pesos.typecode in 'fd' else 'l'
+    for peso in pesos:
+        if _tipo_peso(peso) == 'd':
+            return 'd'
+    return 'l'
+
+
+def _tipo_peso(peso):
+    """
+    O(1)
+    Código de tipo de array adecuado para guardar el peso.
+    """
+    if isinstance(peso, (int, long)):
+        return 'l'
+    return 'd'
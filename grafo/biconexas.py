@@ -0,0 +1,175 @@
+#!/usr/bin/python
+# coding=utf-8
+
+from array import array
+from paralelo import influencias_por_bloques
+
+
+class Descomposicion:
+    """
+    Componentes biconexas de un grafo simétrico y, por cada una, cuántos
+    vértices quedan colgando de cada uno de sus vértices fuera de ella:
+        bloques: listas de vértices de cada componente biconexa.
+        colgantes: por cada bloque, la cantidad de vértices de la misma
+        componente conexa que sólo se alcanzan desde el bloque a través
+        de cada uno de sus vértices (0 si no es punto de articulación).
+        pares_separados: por cada vértice, la cantidad de pares
+        ordenados de otros vértices que quedan en partes distintas al
+        quitarlo (0 si no es punto de articulación).
+    """
+
+    def __init__(self, cantidad_vertices):
+        """
+        O(|V|)
+        """
+        self.bloques = []
+        self.colgantes = []
+        self.pares_separados = [0] * cantidad_vertices
+
+
+def descomponer(grafo):
+    """
+    O(|V|+|E|)
+    Algoritmo de Hopcroft y Tarjan con un recorrido en profundidad
+    iterativo. Al terminar cada componente conexa se conoce su tamaño y,
+    con los tamaños de los subárboles del recorrido, los vértices que
+    cuelgan de cada vértice de cada bloque.
+    """
+    cantidad_vertices = grafo.cantidad_vertices
+    descomposicion = Descomposicion(cantidad_vertices)
+    descubierto = array('l', [-1]) * cantidad_vertices
+    bajo = array('l', [0]) * cantidad_vertices
+    padre = array('l', [-1]) * cantidad_vertices
+    tamanio = array('l', [1]) * cantidad_vertices
+    # Suma de los tamaños (y de sus cuadrados) de los subárboles hijos
+    # que quedan separados del resto al quitar el vértice.
+    separados = array('l', [0]) * cantidad_vertices
+    separados_cuadrado = [0] * cantidad_vertices
+    tiempo = 0
+
+    for raiz in grafo.iternodes():
+        if descubierto[raiz] <> -1:
+            continue
+        descubierto[raiz] = bajo[raiz] = tiempo
+        tiempo += 1
+        pila = [(raiz, iter(grafo.ady(raiz)))]
+        pila_vertices = [raiz]
+        alcanzados = [raiz]
+        # (vértice superior, primer hijo, vértices) de cada bloque
+        bloques = []
+
+        while pila:
+            v, adyacentes = pila[-1]
+            for w in adyacentes:
+                if w == padre[v] or w == v:
+                    continue
+                if descubierto[w] == -1:
+                    padre[w] = v
+                    descubierto[w] = bajo[w] = tiempo
+                    tiempo += 1
+                    pila.append((w, iter(grafo.ady(w))))
+                    pila_vertices.append(w)
+                    alcanzados.append(w)
+                    break
+                if descubierto[w] < bajo[v]:
+                    bajo[v] = descubierto[w]
+            else:
+                pila.pop()
+                p = padre[v]
+                if p == -1:
+                    continue
+                tamanio[p] += tamanio[v]
+                if bajo[v] < bajo[p]:
+                    bajo[p] = bajo[v]
+                if bajo[v] >= descubierto[p]:
+                    separados[p] += tamanio[v]
+                    separados_cuadrado[p] += tamanio[v] ** 2
+                    vertices = []
+                    while True:
+                        x = pila_vertices.pop()
+                        vertices.append(x)
+                        if x == v:
+                            break
+                    vertices.append(p)
+                    bloques.append((p, v, vertices))
+
+        # O(tamaño de la componente)
+        restantes = tamanio[raiz] - 1
+        for v in alcanzados:
+            resto = restantes - separados[v]
+            descomposicion.pares_separados[v] = (restantes ** 2 -
+                    separados_cuadrado[v] - resto ** 2)
+        for p, hijo, vertices in bloques:
+            colgantes = [ separados[x] for x in vertices ]
+            colgantes[-1] = restantes - tamanio[hijo]
+            descomposicion.bloques.append(vertices)
+            descomposicion.colgantes.append(colgantes)
+
+    return descomposicion
+
+
+def _subgrafo(grafo, vertices):
+    """
+    O(suma de los grados de vertices)
+    Grafo de la misma clase con los vértices indicados (renumerados
+    según su posición) y las aristas entre ellos.
+    """
+    local = dict( (v, i) for i, v in enumerate(vertices) )
+    origenes = array('l')
+    destinos = array('l')
+    pesos = []
+    for i, v in enumerate(vertices):
+        for w, peso in grafo.ady_con_pesos(v):
+            j = local.get(w)
+            if j is not None:
+                origenes.append(i)
+                destinos.append(j)
+                pesos.append(peso)
+    subgrafo = grafo.__class__(
+            clase_adyacencias=grafo.adyacencias.__class__)
+    for v in vertices:
+        subgrafo.add_node()
+    if all(peso == 1 for peso in pesos):
+        pesos = None
+    subgrafo.cargar_aristas(origenes, destinos, pesos)
+    return subgrafo
+
+
+def influencias_por_biconexas(grafo, procesos=None):
+    """
+    O(|V|+|E|+suma por bloque B de |B|*C(B)), siendo C(B) el costo de
+    _acumular_influencias sobre el bloque.
+    Los caminos mínimos entre dos vértices de un bloque no salen de él,
+    de modo que cada par (x, y) se resuelve dentro de los bloques que
+    unen x con y:
+        - Un punto de articulación que separa a x de y está en todos sus
+        caminos y suma 1 (ver Descomposicion.pares_separados).
+        - Dentro de un bloque, el par (s, t) de sus vértices representa
+        a los (1 + colgantes de s) * (1 + colgantes de t) pares que
+        cuelgan de ellos, por lo que el barrido de Brandes se hace sólo
+        sobre el bloque ponderando orígenes y destinos.
+    Los bloques de dos vértices (aristas puente, como las de los árboles
+    que cuelgan del resto del grafo) no tienen vértices intermedios y no
+    se recorren. Requiere un grafo simétrico.
+    procesos: si se indica, los orígenes de cada bloque se reparten
+    entre esa cantidad de procesos (ver paralelo.influencias_por_bloques).
+    """
+    descomposicion = descomponer(grafo)
+    influencias = [ float(pares) for pares in descomposicion.pares_separados ]
+    for vertices, colgantes in zip(descomposicion.bloques,
+            descomposicion.colgantes):
+        if len(vertices) < 3:
+            continue
+        subgrafo = _subgrafo(grafo, vertices)
+        pesos = array('l', [ 1 + c for c in colgantes ])
+        if procesos is not None:
+            parciales = influencias_por_bloques(subgrafo, procesos,
+                    pesos=pesos)
+        else:
+            parciales = [0.0] * len(vertices)
+            buffers = subgrafo._crear_buffers_influencias()
+            for s in subgrafo.iternodes():
+                subgrafo._acumular_influencias(s, parciales, buffers, pesos)
+        for i, v in enumerate(vertices):
+            influencias[v] += parciales[i]
+    return influencias
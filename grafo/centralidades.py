@@ -0,0 +1,107 @@
+#!/usr/bin/python
+# coding=utf-8
+
+
+class Centralidades:
+    """
+    Medidas que se acumulan en el mismo barrido de Brandes que calcula
+    las influencias (ver Grafo.calcular_centralidades). Por cada vértice
+    origen u:
+        alcanzados: vértices alcanzables desde u, sin contar a u.
+        suma_distancias: suma de las distancias a ellos.
+        armonica: suma de las inversas de esas distancias (centralidad
+        armónica).
+        excentricidad: la mayor de esas distancias (0 si u no alcanza a
+        ningún otro vértice).
+    Y si se piden aristas, por cada arista (v, w) recorrida de v a w:
+        aristas: suma sobre los pares (s, t) de la fracción de caminos
+        mínimos de s a t que la recorren (influencia de la arista).
+    """
+
+    def __init__(self, cantidad_vertices, aristas=False):
+        """
+        O(|V|)
+        """
+        self.alcanzados = [0] * cantidad_vertices
+        self.suma_distancias = [0] * cantidad_vertices
+        self.armonica = [0.0] * cantidad_vertices
+        self.excentricidad = [0] * cantidad_vertices
+        self.aristas = {} if aristas else None
+
+    def acumular(self, u, orden, cantidad_orden, distancia):
+        """
+        O(cantidad_orden)
+        Suma las medidas del origen u a partir de los vértices alcanzados
+        orden[:cantidad_orden], en orden de distancia creciente.
+        """
+        suma_distancias = 0
+        armonica = 0.0
+        for i in xrange(1, cantidad_orden):
+            d = distancia[orden[i]]
+            suma_distancias += d
+            # Las aristas de peso 0 dejan vértices a distancia 0.
+            if d > 0:
+                armonica += 1.0 / d
+        self.alcanzados[u] += cantidad_orden - 1
+        self.suma_distancias[u] += suma_distancias
+        self.armonica[u] += armonica
+        if cantidad_orden > 1:
+            self.excentricidad[u] = distancia[orden[cantidad_orden - 1]]
+
+    def sumar(self, otras):
+        """
+        O(|V|+aristas de otras)
+        Agrega las medidas de otros orígenes, calculadas por separado.
+        """
+        for u in xrange(len(self.alcanzados)):
+            self.alcanzados[u] += otras.alcanzados[u]
+            self.suma_distancias[u] += otras.suma_distancias[u]
+            self.armonica[u] += otras.armonica[u]
+            self.excentricidad[u] = max(self.excentricidad[u],
+                    otras.excentricidad[u])
+        if self.aristas is not None:
+            aristas = self.aristas
+            for arista, influencia in otras.aristas.iteritems():
+                aristas[arista] = aristas.get(arista, 0.0) + influencia
+
+    def get_cercania(self, u):
+        """
+        O(1)
+        Inversa de la distancia media de u a los vértices que alcanza (0
+        si no alcanza a ninguno).
+        """
+        if self.suma_distancias[u] == 0:
+            return 0.0
+        return float(self.alcanzados[u]) / self.suma_distancias[u]
+
+    def get_armonica(self, u):
+        """
+        O(1)
+        """
+        return self.armonica[u]
+
+    def get_excentricidad(self, u):
+        """
+        O(1)
+        """
+        return self.excentricidad[u]
+
+    def get_influencia_arista(self, v, w):
+        """
+        O(1)
+        """
+        return self.aristas.get((v, w), 0.0)
+
+    def influencias_aristas(self, no_dirigidas=False):
+        """
+        O(cantidad de aristas recorridas)
+        Diccionario de influencia por arista. Si no_dirigidas es
+        verdadero se suman ambos sentidos en la clave (min, max).
+        """
+        if not no_dirigidas:
+            return dict(self.aristas)
+        influencias = {}
+        for (v, w), influencia in self.aristas.iteritems():
+            arista = (v, w) if v < w else (w, v)
+            influencias[arista] = influencias.get(arista, 0.0) + influencia
+        return influencias
@@ -0,0 +1,264 @@
+#!/usr/bin/python
+# coding=utf-8
+
+from array import array
+from functools import partial
+from heapq import heappop, heappush
+
+# Conviene ColaBaldes mientras los pesos sean enteros no mayores a éste:
+# cada extracción recorre a lo sumo PESO_MAXIMO_BALDES baldes vacíos.
+PESO_MAXIMO_BALDES = 64
+
+
+class HeapBinario:
+    """
+    Heap binario de heapq con pares (clave, vértice). Al disminuir una
+    clave se inserta otro par y el anterior se descarta al extraerlo,
+    porque no coincide con la clave vigente: el heap puede tener tantos
+    pares como disminuciones, pero sus operaciones corren en C.
+        claves: clave vigente de cada vértice (None si no está).
+    """
+
+    def __init__(self, capacidad):
+        """
+        O(capacidad)
+        """
+        self.heap = []
+        self.claves = [None] * capacidad
+        self.cantidad = 0
+
+    def __len__(self):
+        return self.cantidad
+
+    def insertar(self, v, clave):
+        """
+        O(log(n))
+        v no debe estar en el heap.
+        """
+        self.claves[v] = clave
+        heappush(self.heap, (clave, v))
+        self.cantidad += 1
+
+    def disminuir(self, v, clave):
+        """
+        O(log(n))
+        """
+        self.claves[v] = clave
+        heappush(self.heap, (clave, v))
+
+    def extraer(self):
+        """
+        O(log(n)) amortizado.
+        Quita el vértice de menor clave y devuelve (clave, vértice).
+        """
+        heap = self.heap
+        claves = self.claves
+        while True:
+            clave, v = heappop(heap)
+            if claves[v] == clave:
+                claves[v] = None
+                self.cantidad -= 1
+                if self.cantidad == 0:
+                    # Descarta los pares anteriores que quedan.
+                    del heap[:]
+                return clave, v
+
+
+class HeapIndexado:
+    """
+    Heap de aridad `aridad` indexado por vértice: cada vértice está a lo
+    sumo una vez y su clave puede disminuirse en el lugar, de modo que
+    el heap nunca supera los vértices pendientes.
+        vertices, claves: el heap, en paralelo.
+        posicion: posición de cada vértice en el heap (-1 si no está).
+    """
+
+    def __init__(self, capacidad, aridad=4):
+        """
+        O(capacidad)
+        capacidad: cantidad de vértices (0 a capacidad-1).
+        """
+        self.aridad = aridad
+        self.vertices = []
+        self.claves = []
+        self.posicion = array('l', [-1]) * capacidad
+
+    def __len__(self):
+        return len(self.vertices)
+
+    def insertar(self, v, clave):
+        """
+        O(log(n)/log(aridad))
+        v no debe estar en el heap.
+        """
+        self.vertices.append(v)
+        self.claves.append(clave)
+        self._subir(len(self.vertices) - 1, v, clave)
+
+    def disminuir(self, v, clave):
+        """
+        O(log(n)/log(aridad))
+        v debe estar en el heap con una clave mayor o igual.
+        """
+        self._subir(self.posicion[v], v, clave)
+
+    def extraer(self):
+        """
+        O(aridad*log(n)/log(aridad))
+        Quita el vértice de menor clave y devuelve (clave, vértice).
+        """
+        vertices = self.vertices
+        claves = self.claves
+        v = vertices[0]
+        clave = claves[0]
+        self.posicion[v] = -1
+        ultimo = vertices.pop()
+        clave_ultimo = claves.pop()
+        if vertices:
+            self._bajar(ultimo, clave_ultimo)
+        return clave, v
+
+    def _subir(self, i, v, clave):
+        """
+        O(log(n)/log(aridad))
+        Ubica v con su clave en la posición libre i o en la de algún
+        ancestro.
+        """
+        vertices = self.vertices
+        claves = self.claves
+        posicion = self.posicion
+        aridad = self.aridad
+        while i > 0:
+            padre = (i - 1) // aridad
+            if claves[padre] <= clave:
+                break
+            w = vertices[padre]
+            vertices[i] = w
+            claves[i] = claves[padre]
+            posicion[w] = i
+            i = padre
+        vertices[i] = v
+        claves[i] = clave
+        posicion[v] = i
+
+    def _bajar(self, v, clave):
+        """
+        O(aridad*log(n)/log(aridad))
+        Ubica v con su clave en la raíz libre o en la de algún
+        descendiente.
+        """
+        vertices = self.vertices
+        claves = self.claves
+        posicion = self.posicion
+        aridad = self.aridad
+        n = len(vertices)
+        i = 0
+        while True:
+            primero = i * aridad + 1
+            if primero >= n:
+                break
+            menor = primero
+            clave_menor = claves[primero]
+            for j in xrange(primero + 1, min(primero + aridad, n)):
+                if claves[j] < clave_menor:
+                    menor = j
+                    clave_menor = claves[j]
+            if clave_menor >= clave:
+                break
+            w = vertices[menor]
+            vertices[i] = w
+            claves[i] = clave_menor
+            posicion[w] = i
+            i = menor
+        vertices[i] = v
+        claves[i] = clave
+        posicion[v] = i
+
+
+class ColaBaldes:
+    """
+    Cola de Dial para claves enteras que se extraen en orden no
+    decreciente y que nunca superan a la última extraída en más de
+    peso_maximo (como las distancias de Dijkstra con pesos enteros entre
+    0 y peso_maximo). Las claves pendientes entran en peso_maximo+1
+    baldes circulares: el balde de la clave d es d % (peso_maximo+1).
+    Al disminuir una clave la entrada anterior queda en su balde y se
+    descarta al encontrarla, porque no coincide con la clave vigente.
+        claves: clave vigente de cada vértice (None si no está).
+        actual: clave del balde que se está vaciando.
+    """
+
+    def __init__(self, capacidad, peso_maximo):
+        """
+        O(capacidad+peso_maximo)
+        """
+        self.baldes = [ [] for i in xrange(peso_maximo + 1) ]
+        self.cantidad_baldes = peso_maximo + 1
+        self.claves = [None] * capacidad
+        self.actual = 0
+        self.cantidad = 0
+
+    def __len__(self):
+        return self.cantidad
+
+    def insertar(self, v, clave):
+        """
+        O(1)
+        v no debe estar en la cola.
+        """
+        if self.cantidad == 0 and clave < self.actual:
+            # Empieza otro recorrido.
+            self.actual = clave
+        self.claves[v] = clave
+        self.baldes[clave % self.cantidad_baldes].append(v)
+        self.cantidad += 1
+
+    def disminuir(self, v, clave):
+        """
+        O(1)
+        """
+        self.claves[v] = clave
+        self.baldes[clave % self.cantidad_baldes].append(v)
+
+    def extraer(self):
+        """
+        O(peso_maximo) amortizado en O(1) por cada unidad que avanzan las
+        claves.
+        Quita un vértice de menor clave y devuelve (clave, vértice).
+        """
+        baldes = self.baldes
+        claves = self.claves
+        actual = self.actual
+        while True:
+            balde = baldes[actual % self.cantidad_baldes]
+            while balde:
+                v = balde.pop()
+                if claves[v] == actual:
+                    claves[v] = None
+                    self.actual = actual
+                    self.cantidad -= 1
+                    if self.cantidad == 0:
+                        # Descarta las entradas anteriores que quedan.
+                        for balde in baldes:
+                            del balde[:]
+                    return actual, v
+            actual += 1
+
+
+def elegir_cola(pesos):
+    """
+    O(len(pesos))
+    Función que crea, dada la cantidad de vértices, la cola adecuada para
+    Dijkstra con esos pesos de aristas: ColaBaldes si son enteros no
+    negativos de a lo sumo PESO_MAXIMO_BALDES y HeapBinario si no.
+    HeapIndexado nunca supera los vértices pendientes, pero en Python
+    puro resulta más lento que heapq.
+    """
+    peso_maximo = 0
+    for peso in pesos:
+        if not isinstance(peso, (int, long)) or not (
+                0 <= peso <= PESO_MAXIMO_BALDES):
+            return HeapBinario
+        if peso > peso_maximo:
+            peso_maximo = peso
+    return partial(ColaBaldes, peso_maximo=peso_maximo)
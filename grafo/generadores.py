@@ -0,0 +1,174 @@
+#!/usr/bin/python
+# coding=utf-8
+
+import math
+import random
+from array import array
+
+
+class GrafoGenerado:
+    """
+    Aristas no dirigidas de un grafo sintético como arreglos paralelos
+    (origenes[i], destinos[i], pesos[i]). pesos es None si todas las
+    aristas pesan 1.
+    """
+
+    def __init__(self, cantidad_vertices, pesos=False):
+        """
+        O(1)
+        """
+        self.cantidad_vertices = cantidad_vertices
+        self.origenes = array('l')
+        self.destinos = array('l')
+        self.pesos = array('l') if pesos else None
+
+    def __len__(self):
+        return len(self.origenes)
+
+    def agregar(self, u, v, peso=1):
+        """
+        O(1) amortizado
+        """
+        self.origenes.append(u)
+        self.destinos.append(v)
+        if self.pesos is not None:
+            self.pesos.append(peso)
+
+    def crear(self, clase_grafo, *args, **kwargs):
+        """
+        O(|V|+|E|*log(|V|))
+        Crea un grafo de clase_grafo con estos vértices y aristas.
+        """
+        grafo = clase_grafo(*args, **kwargs)
+        for u in xrange(self.cantidad_vertices):
+            grafo.add_node()
+        grafo.cargar_aristas(self.origenes, self.destinos, self.pesos,
+                both=True)
+        return grafo
+
+
+def _indices_bernoulli(cantidad, p, aleatorio):
+    """
+    O(p*cantidad) esperado
+    Genera en orden los índices de [0, cantidad) elegidos cada uno con
+    probabilidad p, salteando directamente los no elegidos (el salto
+    tiene distribución geométrica).
+    """
+    if p <= 0:
+        return
+    if p >= 1:
+        for k in xrange(cantidad):
+            yield k
+        return
+    log_q = math.log(1 - p)
+    k = -1
+    while True:
+        k += 1 + int(math.log(1 - aleatorio.random()) / log_q)
+        if k >= cantidad:
+            return
+        yield k
+
+
+def _par_triangular(k):
+    """
+    O(1)
+    Par (v, w) con w < v que ocupa la posición k al enumerar los pares
+    (1,0), (2,0), (2,1), (3,0), ...
+    """
+    v = int((1 + math.sqrt(1 + 8 * k)) / 2)
+    # Corrección de redondeo para k grandes
+    while v * (v - 1) // 2 > k:
+        v -= 1
+    while (v + 1) * v // 2 <= k:
+        v += 1
+    return v, k - v * (v - 1) // 2
+
+
+def erdos_renyi(cantidad_vertices, p, semilla=None):
+    """
+    O(|V|+|E|) esperado
+    Cada par de vértices se une con probabilidad p.
+    """
+    aleatorio = random.Random(semilla)
+    generado = GrafoGenerado(cantidad_vertices)
+    pares = cantidad_vertices * (cantidad_vertices - 1) // 2
+    for k in _indices_bernoulli(pares, p, aleatorio):
+        generado.agregar(*_par_triangular(k))
+    return generado
+
+
+def barabasi_albert(cantidad_vertices, m, semilla=None):
+    """
+    O(|V|*m) esperado
+    Crecimiento con enganche preferencial: se parte de una clique de
+    m+1 vértices y cada vértice nuevo se une a m vértices distintos
+    elegidos con probabilidad proporcional a su grado. Los grados
+    resultantes siguen una ley de potencias.
+    """
+    if m < 1 or cantidad_vertices <= m:
+        raise Exception('Se requiere 1 <= m < cantidad de vértices.')
+    aleatorio = random.Random(semilla)
+    generado = GrafoGenerado(cantidad_vertices)
+    # Cada vértice aparece una vez por cada arista que lo toca.
+    extremos = array('l')
+    for v in xrange(m + 1):
+        for w in xrange(v):
+            generado.agregar(v, w)
+            extremos.append(v)
+            extremos.append(w)
+    for v in xrange(m + 1, cantidad_vertices):
+        elegidos = set()
+        while len(elegidos) < m:
+            elegidos.add(extremos[aleatorio.randrange(len(extremos))])
+        for w in sorted(elegidos):
+            generado.agregar(v, w)
+            extremos.append(v)
+            extremos.append(w)
+    return generado
+
+
+def bloques_estocasticos(tamanios, p_interna, p_externa, semilla=None):
+    """
+    O(|V|+|E|+cantidad de bloques**2) esperado
+    Los vértices se reparten en bloques consecutivos de los tamaños
+    indicados. Dos vértices del mismo bloque se unen con probabilidad
+    p_interna y de bloques distintos con probabilidad p_externa.
+    """
+    aleatorio = random.Random(semilla)
+    generado = GrafoGenerado(sum(tamanios))
+    inicios = [0]
+    for tamanio in tamanios:
+        inicios.append(inicios[-1] + tamanio)
+    for a in xrange(len(tamanios)):
+        inicio_a = inicios[a]
+        pares = tamanios[a] * (tamanios[a] - 1) // 2
+        for k in _indices_bernoulli(pares, p_interna, aleatorio):
+            v, w = _par_triangular(k)
+            generado.agregar(inicio_a + v, inicio_a + w)
+        for b in xrange(a + 1, len(tamanios)):
+            inicio_b = inicios[b]
+            for k in _indices_bernoulli(tamanios[a] * tamanios[b],
+                    p_externa, aleatorio):
+                generado.agregar(inicio_a + k // tamanios[b],
+                        inicio_b + k % tamanios[b])
+    return generado
+
+
+def grilla(filas, columnas, peso_maximo=10, semilla=None):
+    """
+    O(filas*columnas)
+    Grilla con pesos enteros en [1, peso_maximo], similar a una red de
+    calles. El vértice de la fila i y la columna j es i*columnas+j.
+    """
+    aleatorio = random.Random(semilla)
+    generado = GrafoGenerado(filas * columnas, pesos=True)
+    for i in xrange(filas):
+        for j in xrange(columnas):
+            u = i * columnas + j
+            if j + 1 < columnas:
+                generado.agregar(u, u + 1,
+                        aleatorio.randint(1, peso_maximo))
+            if i + 1 < filas:
+                generado.agregar(u, u + columnas,
+                        aleatorio.randint(1, peso_maximo))
+    return generado
@@ -1,6 +1,14 @@
 #!/usr/bin/python
 # coding=utf-8
-from lista_ordenada import ListaOrdenada
+import math
+import random
+from array import array
+import instrumentacion
+from adyacencias import AdyacenciasListas
+from paralelo import influencias_por_bloques
+from biconexas import influencias_por_biconexas
+from centralidades import Centralidades
+from matriz_caminos import MatrizCaminos, tipo_distancias
 
 class CaminoInexistente(Exception):
 
@@ -10,49 +18,229 @@ class CaminoInexistente(Exception):
                 'Camino inexistente de %s a %s.' % (u, v),
                 *args, **kwargs)
 
+class BuffersBrandes:
+    """
+    Arreglos planos que reutiliza el cálculo de influencias de un origen
+    al siguiente. Después de procesar cada origen sólo se limpian las
+    posiciones de los vértices alcanzados, por lo que la memoria se
+    mantiene en O(|V|+|E|) para todo el cálculo.
+    """
+
+    def __init__(self, grafo):
+        """
+        O(|V|+|E|)
+        """
+        cantidad_vertices = grafo.cantidad_vertices
+        self.distancia = [None] * cantidad_vertices
+        self.cantidad_caminos = [0] * cantidad_vertices
+        self.dependencia = array('d', [0.0]) * cantidad_vertices
+        # Vértices en el orden en que se alcanzan (cola y luego pila).
+        self.orden = array('l', [0]) * cantidad_vertices
+        self.cantidad_orden = 0
+        self.asentado = bytearray(cantidad_vertices)
+
+        # Cada vértice tiene a lo sumo tantos predecesores como aristas
+        # entrantes: sus predecesores ocupan
+        # predecesores[inicio_predecesores[w]:][:cantidad_predecesores[w]]
+        grado_entrada = array('l', [0]) * cantidad_vertices
+        for u in grafo.iternodes():
+            for w in grafo.ady(u):
+                grado_entrada[w] += 1
+        self.inicio_predecesores = array('l', [0]) * cantidad_vertices
+        total = 0
+        for w in grafo.iternodes():
+            self.inicio_predecesores[w] = total
+            total += grado_entrada[w]
+        self.predecesores = array('l', [0]) * total
+        self.cantidad_predecesores = array('l', [0]) * cantidad_vertices
+        # Si se indica, acumular_dependencias suma también las demás
+        # medidas de cada origen (ver Centralidades).
+        self.centralidades = None
+        # Cola de prioridad de Dijkstra (ver GrafoPesado._crear_cola).
+        self.cola = None
+
+    def agregar_predecesor(self, w, v):
+        """
+        O(1)
+        """
+        self.predecesores[self.inicio_predecesores[w] +
+                self.cantidad_predecesores[w]] = v
+        self.cantidad_predecesores[w] += 1
+
+    def acumular_dependencias(self, u, influencias, pesos=None):
+        """
+        O(|V|+|E|)
+        Recorre los vértices alcanzados desde u en orden inverso,
+        propaga las dependencias hacia los predecesores y las suma a
+        influencias.
+        pesos: si se indica, cada vértice cuenta como pesos[w] destinos
+        y el origen como pesos[u] orígenes (ver
+        biconexas.influencias_por_biconexas).
+        """
+        if pesos is not None:
+            self._acumular_dependencias_ponderadas(u, influencias, pesos)
+            return
+        if self.centralidades is not None:
+            self._acumular_dependencias_centralidades(u, influencias)
+            return
+        orden = self.orden
+        cantidad_caminos = self.cantidad_caminos
+        dependencia = self.dependencia
+        predecesores = self.predecesores
+        inicio_predecesores = self.inicio_predecesores
+        cantidad_predecesores = self.cantidad_predecesores
+
+        for i in xrange(self.cantidad_orden - 1, 0, -1):
+            w = orden[i]
+            coeficiente = (1 + dependencia[w]) / cantidad_caminos[w]
+            inicio = inicio_predecesores[w]
+            for k in xrange(inicio, inicio + cantidad_predecesores[w]):
+                v = predecesores[k]
+                dependencia[v] += cantidad_caminos[v] * coeficiente
+            influencias[w] += dependencia[w]
+
+    def _acumular_dependencias_ponderadas(self, u, influencias, pesos):
+        """
+        O(|V|+|E|)
+        """
+        orden = self.orden
+        cantidad_caminos = self.cantidad_caminos
+        dependencia = self.dependencia
+        predecesores = self.predecesores
+        inicio_predecesores = self.inicio_predecesores
+        cantidad_predecesores = self.cantidad_predecesores
+        peso_origen = pesos[u]
+
+        for i in xrange(self.cantidad_orden - 1, 0, -1):
+            w = orden[i]
+            coeficiente = (pesos[w] + dependencia[w]) / cantidad_caminos[w]
+            inicio = inicio_predecesores[w]
+            for k in xrange(inicio, inicio + cantidad_predecesores[w]):
+                v = predecesores[k]
+                dependencia[v] += cantidad_caminos[v] * coeficiente
+            influencias[w] += peso_origen * dependencia[w]
+
+    def _acumular_dependencias_centralidades(self, u, influencias):
+        """
+        O(|V|+|E|)
+        Como acumular_dependencias, sumando además las medidas de u y, si
+        se piden, la influencia de cada arista de los caminos mínimos.
+        """
+        orden = self.orden
+        cantidad_caminos = self.cantidad_caminos
+        dependencia = self.dependencia
+        predecesores = self.predecesores
+        inicio_predecesores = self.inicio_predecesores
+        cantidad_predecesores = self.cantidad_predecesores
+        centralidades = self.centralidades
+        aristas = centralidades.aristas
+
+        centralidades.acumular(u, orden, self.cantidad_orden, self.distancia)
+        for i in xrange(self.cantidad_orden - 1, 0, -1):
+            w = orden[i]
+            coeficiente = (1 + dependencia[w]) / cantidad_caminos[w]
+            inicio = inicio_predecesores[w]
+            for k in xrange(inicio, inicio + cantidad_predecesores[w]):
+                v = predecesores[k]
+                aporte = cantidad_caminos[v] * coeficiente
+                dependencia[v] += aporte
+                if aristas is not None:
+                    aristas[v, w] = aristas.get((v, w), 0.0) + aporte
+            influencias[w] += dependencia[w]
+
+    def limpiar(self):
+        """
+        O(cantidad de vértices alcanzados)
+        """
+        for i in xrange(self.cantidad_orden):
+            w = self.orden[i]
+            self.distancia[w] = None
+            self.cantidad_caminos[w] = 0
+            self.dependencia[w] = 0.0
+            self.cantidad_predecesores[w] = 0
+            self.asentado[w] = 0
+        self.cantidad_orden = 0
+
+
 class Grafo:
 
-    def __init__(self):
+    def __init__(self, clase_adyacencias=AdyacenciasListas):
         """
         O(1) 
+        clase_adyacencias: representación de las adyacencias
+        (AdyacenciasListas o AdyacenciasCSR).
         """
         self.cantidad_aristas = 0
         self.cantidad_vertices = 0
         self.node_data = []
-        self.pesos = []
-        self.cantidad_caminos_minimos = []
-        self.recorridos = []
-        self.lista_ady = []
+        self.adyacencias = clase_adyacencias()
+        # Resultados por vértice origen, creados a medida que se procesa
+        # cada origen y liberados con liberar_camino_minimo.
+        self.cantidad_caminos_minimos = {}
         self.influencias = []
+        # Resultado de calcular_centralidades.
+        self.centralidades = None
         self.distancia = {}
         self.padre = {}
+        # Resultado de calcular_matriz_caminos.
+        self.matriz_caminos = None
+        # Si es verdadero, connect y disconnect actualizan las influencias
+        # (ver activar_influencias_incrementales).
+        self.influencias_incrementales = False
+        # Resultado de es_simetrico, None si hay que volver a verificarlo.
+        self.simetrico = True
 
     def get_grado_salida(self, u):
         """
         O(1)
         Obtiene el grado de salida de u.
         """
-        return len(self.pesos[u])
+        return self.adyacencias.grado_salida(u)
 
     def add_node(self, node_data=None):
         """
         Complejidad: O(1)
         """
         self.cantidad_vertices += 1
-        self.pesos.append({})
+        self.adyacencias.add_node()
         self.node_data.append(node_data)
-        self.lista_ady.append(ListaOrdenada())
-        self.cantidad_caminos_minimos.append(
-            [0 for i in xrange(self.cantidad_vertices - 1)])
-        self.recorridos.append(
-            [None for i in xrange(self.cantidad_vertices - 1)])
-        for i in self.iternodes():
-            self.cantidad_caminos_minimos[i].append(0)
-            self.recorridos[i].append(None)
         self.influencias.append(0)
+        if self.influencias_incrementales:
+            # O(|V|) El nuevo vértice no es alcanzable desde ningún origen
+            for u in self.distancia:
+                self.distancia[u].append(None)
+                self.padre[u].append(set())
+                if u in self.cantidad_caminos_minimos:
+                    self.cantidad_caminos_minimos[u].append(0)
+            self.calcular_camino_minimo(self.cantidad_vertices - 1)
             
         return self.cantidad_vertices - 1
 
+    def asignar_adyacencias(self, adyacencias, cantidad_aristas, node_data):
+        """
+        O(|V|)
+        Reemplaza el contenido de un grafo vacío por adyacencias ya
+        construidas (por ejemplo, abiertas desde un snapshot). node_data
+        puede ser cualquier secuencia indexable por vértice.
+        """
+        self.adyacencias = adyacencias
+        self.cantidad_vertices = adyacencias.cantidad_vertices
+        self.cantidad_aristas = cantidad_aristas
+        self.node_data = node_data
+        self.influencias = [0] * self.cantidad_vertices
+        self.simetrico = None
+
+    def asignar_node_data(self, node_data):
+        """
+        O(1)
+        Reemplaza los node_data de todos los vértices por una secuencia
+        indexable por vértice (por ejemplo, guardada por columnas).
+        """
+        if len(node_data) <> self.cantidad_vertices:
+            raise Exception('Se esperaban los datos de %s vértices.' %
+                    self.cantidad_vertices)
+        self.node_data = node_data
+
     def get_node_data(self, u):
         """
         Complejidad: O(1)
@@ -63,18 +251,102 @@ class Grafo:
         """
         O(log(Au)) si no se conecta a ambos.
         O(max(log(Au),log(Av))) si se conecta a ambos.
+        Si las influencias son incrementales, se suma el costo de
+        reprocesar los orígenes afectados.
         """
-        self.pesos[u][v] = peso
+        aristas = [(u, v, peso)]
+        if both:
+            aristas.append((v, u, peso))
+        # Con conexión diferida las aristas repetidas se detectan al
+        # compactar; verificarlas aquí lo obligaría a compactar.
+        if self.influencias_incrementales or not self.adyacencias.diferida:
+            self._verificar_aristas(aristas, True)
+        if self.influencias_incrementales:
+            self._actualizar_influencias(aristas, True,
+                    lambda: self._conectar(u, v, peso, both))
+        else:
+            self._conectar(u, v, peso, both)
+
+    def _conectar(self, u, v, peso, both):
         # O(log(|V|))
-        self.lista_ady[u].insert(v)
+        self.adyacencias.connect(u, v, peso)
         if both:
-            self.pesos[v][u] = peso
             # O(log(|V|))
-            self.lista_ady[v].insert(u)
+            self.adyacencias.connect(v, u, peso)
+        else:
+            self.simetrico = None
         self.cantidad_aristas += 1
 
+    def disconnect(self, u, v, both=False):
+        """
+        O(Au) (O(|V|+|E|) con AdyacenciasCSR)
+        Elimina la arista de u a v (y de v a u si both).
+        Si las influencias son incrementales, se suma el costo de
+        reprocesar los orígenes afectados.
+        """
+        aristas = [(u, v, None)]
+        if both:
+            aristas.append((v, u, None))
+        self._verificar_aristas(aristas, False)
+        if self.influencias_incrementales:
+            self._actualizar_influencias(aristas, False,
+                    lambda: self._desconectar(u, v, both))
+        else:
+            self._desconectar(u, v, both)
+
+    def _verificar_aristas(self, aristas, agregar):
+        """
+        O(len(aristas)*log(|V|))
+        Antes de modificar el grafo, verifica que ninguna de las aristas
+        (u, v, peso) exista si se van a agregar, o que existan todas si
+        se van a eliminar, de modo que ambos sentidos se aplican juntos o
+        ninguno.
+        """
+        for u, v, _ in aristas:
+            if self.adyacencias.conectados(u, v) == agregar:
+                raise Exception('La arista (%s, %s) %s.' % (u, v,
+                    'ya existe' if agregar else 'no existe'))
+
+    def _desconectar(self, u, v, both):
+        self.adyacencias.disconnect(u, v)
+        if both:
+            self.adyacencias.disconnect(v, u)
+        else:
+            self.simetrico = None
+        self.cantidad_aristas -= 1
+
+    def cargar_aristas(self, origenes, destinos, pesos=None, both=False):
+        """
+        O(|E|*log(|V|))
+        Conecta en bloque origenes[i] con destinos[i] (con peso pesos[i]
+        si se indican pesos). origenes, destinos y pesos deben ser
+        secuencias del mismo tipo (listas o arreglos).
+        """
+        if self.influencias_incrementales:
+            for k in xrange(len(origenes)):
+                self.connect(origenes[k], destinos[k],
+                        1 if pesos is None else pesos[k], both)
+            return
+        cantidad = len(origenes)
+        if both:
+            # Ambos sentidos en una única carga: si alguna arista ya
+            # existe no se agrega ninguno.
+            origenes, destinos = origenes + destinos, destinos + origenes
+            if pesos is not None:
+                pesos = pesos + pesos
+        elif cantidad > 0:
+            self.simetrico = None
+        self.adyacencias.cargar(origenes, destinos, pesos)
+        self.cantidad_aristas += cantidad
+
     def ady(self, v):
-        return self.pesos[v]
+        return self.adyacencias.ady(v)
+
+    def ady_con_pesos(self, v):
+        """
+        Iterador de pares (adyacente, peso).
+        """
+        return self.adyacencias.ady_con_pesos(v)
 
     def verificar_existe_camino(self, u, v):
         """
@@ -93,39 +365,143 @@ class Grafo:
             if distancia is None:
                 raise CaminoInexistente(u,v)
             return distancia
+        if self.matriz_caminos is not None:
+            distancia = self.matriz_caminos.get_distancia(u, v)
+            if distancia is None:
+                raise CaminoInexistente(u,v)
+            return distancia
         if intentar_al_reves:
             return self.get_distancia(v, u, intentar_al_reves=False)
         raise Exception('Debe calcular previamente el camino mínimo.')
 
     def get_recorrido(self, u, v, intentar_al_reves=True):
         """
+        O(|V|)
         Se obtiene uno de los posibles recorridos.
         Previamente se debe haber llamado a calcular_camino_minimo(u)
         o calcular_camino_minimo(v).
         """
         if u in self.padre:
-            w = [v]
-            recorrido = []
-            while len(w) > 0:
-                recorrido.insert(0, iter(w).next())
-                w = self.padre[u][iter(w).next()]
+            self.verificar_existe_camino(u, v)
+            padre = self.padre[u]
+            recorrido = [v]
+            while recorrido[-1] <> u:
+                recorrido.append(iter(padre[recorrido[-1]]).next())
+            recorrido.reverse()
             return recorrido
         if intentar_al_reves:
-            return reversed(
-                    self.get_recorrido(v, u, intentar_al_reves=False))
+            recorrido = self.get_recorrido(v, u, intentar_al_reves=False)
+            recorrido.reverse()
+            return recorrido
         raise Exception('Debe calcular previamente el camino mínimo.')
 
     def get_recorridos(self, u, v):
-        if u==v:
-          return [[u]]
-        if u in self.padre:
-            if self.recorridos[u][v] is None:
-                self.recorridos[u][v] = []
-                for w in self.padre[u][v]:
-                    for recorrido in self.get_recorridos(u,w):
-                        self.recorridos[u][v].append(recorrido+[v])
-            return self.recorridos[u][v]
-        raise Exception('Debe calcular previamente el camino mínimo.')
+        """
+        O(|V|*C), siendo C la cantidad de caminos mínimos de u a v.
+        Listado de todos los caminos mínimos de u a v (ver
+        iter_recorridos). No se guardan: para muchos caminos conviene
+        recorrerlos con iter_recorridos.
+        """
+        return list(self.iter_recorridos(u, v))
+
+    def _cantidad_caminos_hasta(self, u, v):
+        """
+        O(1) si ya se calculó, O(|V|+|E|) si no.
+        Fila de cantidades de caminos mínimos desde u, completa al menos
+        para v y los vértices de sus caminos mínimos desde u.
+        """
+        self.get_cantidad_caminos_minimos(u, v, intentar_al_reves=False)
+        return self.cantidad_caminos_minimos[u]
+
+    def iter_recorridos(self, u, v, limite=None, desde=0):
+        """
+        O(|V|) por recorrido generado, más O(|V|*Amax) para ubicar el
+        primero.
+        Genera uno por uno los caminos mínimos de u a v (listas que
+        comienzan en u) sin guardarlos. Se arman desde v eligiendo los
+        predecesores en orden creciente, por lo que el orden es siempre
+        el mismo.
+        desde: cantidad de caminos a saltear. No se generan: se descartan
+        predecesores completos según su cantidad de caminos mínimos.
+        limite: cantidad máxima de caminos a generar.
+        Previamente se debe haber llamado a calcular_camino_minimo(u).
+        """
+        if u not in self.padre:
+            raise Exception('Debe calcular previamente el camino mínimo.')
+        if limite is not None and limite <= 0:
+            return
+        if u == v:
+            if desde == 0:
+                yield [u]
+            return
+        if self.distancia[u][v] is None:
+            return
+        padre = self.padre[u]
+        cantidad = self._cantidad_caminos_hasta(u, v)
+        if desde >= cantidad[v]:
+            return
+
+        # Cada elemento de la pila es [vértice, predecesores ordenados,
+        # posición del predecesor elegido]; la pila va de v a u.
+        pila = []
+        w = v
+        saltear = desde
+        generados = 0
+        while True:
+            # Se desciende hasta u eligiendo el primer predecesor que
+            # todavía tiene caminos sin saltear.
+            while w <> u:
+                predecesores = sorted(padre[w])
+                k = 0
+                while saltear >= cantidad[predecesores[k]]:
+                    saltear -= cantidad[predecesores[k]]
+                    k += 1
+                pila.append([w, predecesores, k])
+                w = predecesores[k]
+
+            recorrido = [u]
+            for i in xrange(len(pila) - 1, -1, -1):
+                recorrido.append(pila[i][0])
+            yield recorrido
+            generados += 1
+            if limite is not None and generados >= limite:
+                return
+
+            # Se avanza al siguiente predecesor del vértice más cercano a
+            # u que todavía tenga alguno.
+            while pila and pila[-1][2] + 1 >= len(pila[-1][1]):
+                pila.pop()
+            if not pila:
+                return
+            pila[-1][2] += 1
+            w = pila[-1][1][pila[-1][2]]
+
+    def get_recorrido_aleatorio(self, u, v, aleatorio=random):
+        """
+        O(|V|*Amax)
+        Uno de los caminos mínimos de u a v elegido con probabilidad
+        uniforme: desde v se elige cada predecesor con probabilidad
+        proporcional a su cantidad de caminos mínimos desde u.
+        aleatorio: generador con randrange (por ejemplo random.Random).
+        Previamente se debe haber llamado a calcular_camino_minimo(u).
+        """
+        if u not in self.padre:
+            raise Exception('Debe calcular previamente el camino mínimo.')
+        self.verificar_existe_camino(u, v)
+        padre = self.padre[u]
+        cantidad = self._cantidad_caminos_hasta(u, v)
+        recorrido = [v]
+        w = v
+        while w <> u:
+            elegido = aleatorio.randrange(cantidad[w])
+            for predecesor in sorted(padre[w]):
+                if elegido < cantidad[predecesor]:
+                    break
+                elegido -= cantidad[predecesor]
+            w = predecesor
+            recorrido.append(w)
+        recorrido.reverse()
+        return recorrido
 
     def conectados(self, u, v):
         """
@@ -133,7 +509,19 @@ class Grafo:
         Verifica si u y v están conectados.
         """
         # O(log(n))
-        return self.lista_ady[u].has(v)
+        return self.adyacencias.conectados(u, v)
+
+    def es_simetrico(self):
+        """
+        O(|E|*log(|V|)) la primera vez, O(1) mientras no cambien las
+        aristas.
+        Verifica que por cada arista de u a v exista la de v a u, es
+        decir, que el grafo pueda recorrerse como no dirigido.
+        """
+        if self.simetrico is None:
+            self.simetrico = all(self.conectados(v, u)
+                    for u in self.iternodes() for v in self.ady(u))
+        return self.simetrico
 
     def conexiones_en_comun(self, u, v):
         """
@@ -141,8 +529,91 @@ class Grafo:
         Av: Cantidad de aristas que salen de v.
         O(Au+Av)
         """
-        return self.lista_ady[u].intersection(
-                self.lista_ady[v])
+        return self.adyacencias.conexiones_en_comun(u, v)
+
+    def cantidad_conexiones_en_comun(self, u, v):
+        """
+        O(Au+Av) (O(|V|/64) con AdyacenciasBits)
+        """
+        return self.adyacencias.cantidad_conexiones_en_comun(u, v)
+
+    def contar_conexiones_en_comun(self, u):
+        """
+        O(Sum(w in ady(u),Aw))
+        Devuelve un diccionario {v: cantidad} con los vértices v distintos
+        de u y no adyacentes a u que tienen conexiones en común con u.
+        Sólo se recorren los adyacentes de los adyacentes de u (con
+        AdyacenciasBits, ver AdyacenciasBits.contar_conexiones_en_comun).
+        """
+        if self.adyacencias.por_bits:
+            conteo = self.adyacencias.contar_conexiones_en_comun(u)
+            instrumentacion.contar('intersecciones', len(conteo))
+            return conteo
+        adyacentes = self.ady(u)
+        conteo = {}
+        for w in adyacentes:
+            for v in self.ady(w):
+                conteo[v] = conteo.get(v, 0) + 1
+        if instrumentacion.actual is not None:
+            self._contar_intersecciones(adyacentes)
+        conteo.pop(u, None)
+        for w in adyacentes:
+            conteo.pop(w, None)
+        return conteo
+
+    def iter_conexiones_en_comun(self):
+        """
+        O(Sum(w in V,Aw**2))
+        Producto por filas A*A de la matriz de adyacencias, enmascarado
+        por las aristas existentes: para cada vértice u se genera
+        (u, [(v, cantidad), ...]) con los v distintos de u y no
+        adyacentes a u que tienen `cantidad` conexiones en común con u.
+        Cada fila se acumula en un arreglo denso reutilizado, recorriendo
+        sólo los adyacentes de los adyacentes de u. Se asume que las
+        adyacencias son simétricas (grafo no dirigido).
+        Con AdyacenciasBits cada fila se obtiene de
+        contar_conexiones_en_comun.
+        """
+        if self.adyacencias.por_bits:
+            for u in self.iternodes():
+                yield u, self.contar_conexiones_en_comun(u).items()
+            return
+
+        acumulador = array('l', [0]) * self.cantidad_vertices
+        marca = array('l', [-1]) * self.cantidad_vertices
+
+        for u in self.iternodes(): # |V|
+            adyacentes = self.ady(u)
+            # O(Au) Se enmascaran u y sus adyacentes
+            marca[u] = u
+            for w in adyacentes:
+                marca[w] = u
+
+            # O(Sum(w in ady(u),Aw))
+            candidatos = []
+            for w in adyacentes:
+                for v in self.ady(w):
+                    if marca[v] == u:
+                        continue
+                    if acumulador[v] == 0:
+                        candidatos.append(v)
+                    acumulador[v] += 1
+
+            fila = [ (v, acumulador[v]) for v in candidatos ]
+            for v in candidatos:
+                acumulador[v] = 0
+            if instrumentacion.actual is not None:
+                self._contar_intersecciones(adyacentes)
+            yield u, fila
+
+    def _contar_intersecciones(self, adyacentes):
+        """
+        O(len(adyacentes))
+        Suma a la instrumentación activa los pasos u-w-v recorridos desde
+        los adyacentes de u.
+        """
+        instrumentacion.actual.sumar('intersecciones',
+                sum(self.get_grado_salida(w) for w in adyacentes))
 
     def iternodes(self):
         return xrange(self.cantidad_vertices)
@@ -153,6 +624,226 @@ class Grafo:
         """
         return self.influencias[u]
 
+    def calcular_influencias(self, procesos=None, biconexas=False):
+        """
+        O(|V|*C), siendo C el costo de _acumular_influencias.
+        No requiere haber calculado previamente los caminos mínimos y
+        utiliza memoria O(|V|+|E|).
+        procesos: si se indica, los orígenes se reparten entre esa
+        cantidad de procesos (ver paralelo.influencias_por_bloques).
+        biconexas: si es verdadero y el grafo es simétrico, se recorre
+        cada componente biconexa por separado y los árboles colgantes se
+        resuelven sin recorrerlos (ver
+        biconexas.influencias_por_biconexas).
+        """
+        if biconexas and self.es_simetrico():
+            self.influencias = influencias_por_biconexas(self, procesos)
+            return
+        if procesos is not None:
+            self.influencias = influencias_por_bloques(self, procesos)
+            return
+        self.influencias = [0.0] * self.cantidad_vertices
+        buffers = self._crear_buffers_influencias() # O(|V|+|E|)
+        for u in self.iternodes(): #|V|
+            self._acumular_influencias(u, self.influencias, buffers)
+
+    def calcular_centralidades(self, procesos=None, aristas=True):
+        """
+        O(|V|*C), siendo C el costo de _acumular_influencias.
+        Calcula las influencias y, en el mismo recorrido desde cada
+        origen, la cercanía, la centralidad armónica, la excentricidad y,
+        si aristas es verdadero, la influencia de cada arista. Quedan en
+        self.influencias y self.centralidades (ver Centralidades).
+        Las aristas agregan O(|E|) de memoria.
+        """
+        centralidades = Centralidades(self.cantidad_vertices, aristas)
+        if procesos is not None:
+            self.influencias = influencias_por_bloques(self, procesos,
+                    centralidades=centralidades)
+        else:
+            self.influencias = [0.0] * self.cantidad_vertices
+            buffers = self._crear_buffers_influencias() # O(|V|+|E|)
+            buffers.centralidades = centralidades
+            for u in self.iternodes(): #|V|
+                self._acumular_influencias(u, self.influencias, buffers)
+        self.centralidades = centralidades
+
+    def calcular_influencias_aproximadas(self, error, confianza=0.95,
+            semilla=None, procesos=None):
+        """
+        O(k*C), siendo k = min(|V|, ln(2*|V|/(1-confianza))/(2*error**2))
+        y C el costo de _acumular_influencias.
+        Estima las influencias procesando una muestra uniforme de k
+        orígenes y escalando el resultado por |V|/k. La dependencia de
+        cada origen sobre un vértice está acotada por |V|-2, por lo que
+        (Hoeffding y cota de la unión sobre los |V| vértices) con
+        probabilidad `confianza` todas las influencias estimadas quedan a
+        menos de error*|V|*(|V|-2) de las exactas.
+        Devuelve esa cota absoluta, que es 0 si la muestra abarca todos
+        los vértices y el cálculo resulta exacto.
+        """
+        if not 0 < error or not 0 < confianza < 1:
+            raise ValueError(
+                'El error debe ser positivo y la confianza estar en (0,1).')
+
+        cantidad_vertices = self.cantidad_vertices
+        if cantidad_vertices == 0:
+            self.cantidad_muestras_influencias = 0
+            self.cota_error_influencias = 0
+            return 0
+        ln = math.log(2.0 * cantidad_vertices / (1 - confianza))
+        cantidad_muestras = int(math.ceil(ln / (2 * error ** 2)))
+
+        if cantidad_muestras >= cantidad_vertices:
+            self.calcular_influencias(procesos=procesos)
+            self.cantidad_muestras_influencias = cantidad_vertices
+            self.cota_error_influencias = 0
+            return 0
+
+        # O(k*log(k)) Se procesan en orden para recorrer la memoria
+        # de forma más local.
+        muestra = sorted(random.Random(semilla).sample(
+            xrange(cantidad_vertices), cantidad_muestras))
+
+        if procesos is not None:
+            influencias = influencias_por_bloques(self, procesos, muestra)
+        else:
+            influencias = [0.0] * cantidad_vertices
+            buffers = self._crear_buffers_influencias() # O(|V|+|E|)
+            for u in muestra: # k
+                self._acumular_influencias(u, influencias, buffers)
+
+        escala = float(cantidad_vertices) / cantidad_muestras
+        self.influencias = [ x * escala for x in influencias ]
+        self.cantidad_muestras_influencias = cantidad_muestras
+        self.cota_error_influencias = (math.sqrt(ln / (2 * cantidad_muestras))
+                * cantidad_vertices * max(cantidad_vertices - 2, 0))
+        return self.cota_error_influencias
+
+    def activar_influencias_incrementales(self):
+        """
+        O(|V|*C) en tiempo, siendo C el costo de calcular_camino_minimo, y
+        O(|V|**2) en memoria.
+        Calcula las influencias conservando distancias y predecesores de
+        todos los orígenes. A partir de entonces connect y disconnect
+        mantienen actualizadas las influencias reprocesando sólo los
+        orígenes cuyo grafo de caminos mínimos cambia.
+        """
+        self.liberar_caminos_minimos()
+        self.calcular_caminos_minimos()
+        self.influencias = [0.0] * self.cantidad_vertices
+        for u in self.iternodes():
+            self._sumar_dependencias(u, 1)
+        self.influencias_incrementales = True
+        self.origenes_reprocesados = 0
+
+    def desactivar_influencias_incrementales(self):
+        """
+        O(1)
+        """
+        self.influencias_incrementales = False
+        self.liberar_caminos_minimos()
+
+    def _longitud_arista(self, peso):
+        """
+        O(1)
+        Longitud con que una arista de ese peso cuenta en los caminos.
+        """
+        return peso
+
+    def _origenes_afectados(self, aristas, agregar):
+        """
+        O(|V|*len(aristas))
+        Orígenes cuyo grafo de caminos mínimos cambia al agregar o
+        eliminar las aristas (u, v, peso). Al agregar, cambia si la
+        arista alcanza a v con un camino igual o más corto; al eliminar,
+        si u es predecesor de v.
+        """
+        afectados = []
+        for s in self.iternodes():
+            distancia = self.distancia[s]
+            for u, v, peso in aristas:
+                if distancia[u] is None:
+                    continue
+                if agregar:
+                    afectado = (distancia[v] is None or
+                        distancia[u] + self._longitud_arista(peso) <=
+                        distancia[v])
+                else:
+                    afectado = u in self.padre[s][v]
+                if afectado:
+                    afectados.append(s)
+                    break
+        return afectados
+
+    def _actualizar_influencias(self, aristas, agregar, modificar):
+        """
+        O(|V|*len(aristas)+k*C), siendo k la cantidad de orígenes
+        afectados y C el costo de calcular_camino_minimo.
+        Descuenta el aporte de los orígenes afectados, aplica la
+        modificación y vuelve a sumar su aporte sobre el grafo nuevo.
+        """
+        afectados = self._origenes_afectados(aristas, agregar)
+        for s in afectados:
+            self._sumar_dependencias(s, -1)
+        modificar()
+        for s in afectados:
+            self.liberar_camino_minimo(s)
+            self.calcular_camino_minimo(s)
+            self._sumar_dependencias(s, 1)
+        self.origenes_reprocesados = len(afectados)
+
+    def _sumar_dependencias(self, s, signo):
+        """
+        O(|V|*log(|V|)+|E|)
+        Suma (signo=1) o resta (signo=-1) a las influencias las
+        dependencias del origen s, a partir de las distancias y
+        predecesores ya calculados para s.
+        """
+        distancia = self.distancia[s]
+        padre = self.padre[s]
+        # O(|V|*log(|V|)) Vértices alcanzados por distancia creciente
+        alcanzados = sorted( (d, w) for w, d in enumerate(distancia)
+                if d is not None )
+
+        # O(|V|+|E|)
+        cantidad_caminos = [0] * self.cantidad_vertices
+        cantidad_caminos[s] = 1
+        for _, w in alcanzados:
+            if w <> s:
+                cantidad_caminos[w] = sum(
+                        cantidad_caminos[v] for v in padre[w])
+
+        # O(|V|+|E|)
+        dependencia = [0.0] * self.cantidad_vertices
+        for _, w in reversed(alcanzados):
+            coeficiente = (1 + dependencia[w]) / cantidad_caminos[w]
+            for v in padre[w]:
+                dependencia[v] += cantidad_caminos[v] * coeficiente
+            if w <> s:
+                self.influencias[w] += signo * dependencia[w]
+
+    def _crear_buffers_influencias(self):
+        """
+        O(|V|+|E|)
+        """
+        return BuffersBrandes(self)
+
+    def _contar_recorrido(self, vertices, aristas, empujes_heap=None):
+        """
+        O(1)
+        Suma a la instrumentación activa los contadores de un recorrido
+        desde un origen, contados por el recorrido en variables locales:
+        los vértices extraídos, las aristas examinadas y, en Dijkstra,
+        las inserciones y disminuciones de clave en la cola.
+        """
+        actual = instrumentacion.actual
+        actual.sumar('origenes')
+        actual.sumar('aristas_examinadas', aristas)
+        actual.sumar('vertices_extraidos', vertices)
+        if empujes_heap is not None:
+            actual.sumar('empujes_heap', empujes_heap)
+
     def calcular_caminos_minimos(self):
         """
         O(|V|*(|E|+|V|)
@@ -162,6 +853,73 @@ class Grafo:
             # O(|V|+|E|)
             self.calcular_camino_minimo(i)
 
+    def liberar_camino_minimo(self, u):
+        """
+        O(1)
+        Descarta los resultados calculados para el origen u.
+        """
+        self.distancia.pop(u, None)
+        self.padre.pop(u, None)
+        self.cantidad_caminos_minimos.pop(u, None)
+
+    def liberar_caminos_minimos(self):
+        """
+        O(1)
+        Descarta los resultados calculados para todos los orígenes,
+        incluida la matriz de caminos.
+        """
+        self.distancia = {}
+        self.padre = {}
+        self.cantidad_caminos_minimos = {}
+        if self.matriz_caminos is not None:
+            self.matriz_caminos.cerrar()
+            self.matriz_caminos = None
+
+    def _longitudes_simetricas(self):
+        """
+        O(|E|) además de es_simetrico.
+        Verifica que el grafo sea simétrico y que cada arista mida lo
+        mismo en ambos sentidos.
+        """
+        if not self.es_simetrico():
+            return False
+        longitudes = {}
+        for u in self.iternodes():
+            for v, peso in self.ady_con_pesos(u):
+                if u < v:
+                    longitudes[u, v] = self._longitud_arista(peso)
+        return all( longitudes[v, u] == self._longitud_arista(peso)
+                for u in self.iternodes()
+                for v, peso in self.ady_con_pesos(u) if v < u )
+
+    def calcular_matriz_caminos(self, archivo=None, cantidades=True):
+        """
+        O(|V|*C+|V|**2), siendo C el costo de _recorrer_caminos_minimos.
+        Guarda en una MatrizCaminos mapeada en memoria las distancias y
+        (si cantidades es verdadero) la cantidad de caminos mínimos
+        entre todos los pares, sin conservar los predecesores. Si las
+        aristas miden lo mismo en ambos sentidos sólo se guarda un
+        triángulo. get_distancia y get_cantidad_caminos_minimos la
+        consultan para los orígenes sin resultados propios; como en el
+        barrido de influencias, no se cuentan los caminos que usan
+        aristas de peso 0 entre vértices a igual distancia.
+        archivo: ver MatrizCaminos.
+        """
+        self.liberar_caminos_minimos()
+        tipo = tipo_distancias(self.cantidad_vertices,
+                ( self._longitud_arista(peso) for u in self.iternodes()
+                    for _, peso in self.ady_con_pesos(u) ))
+        matriz = MatrizCaminos(self.cantidad_vertices,
+                self._longitudes_simetricas(), tipo, cantidades, archivo)
+        buffers = self._crear_buffers_influencias() # O(|V|+|E|)
+        for u in self.iternodes():
+            self._recorrer_caminos_minimos(u, buffers)
+            # O(|V|)
+            matriz.guardar_fila(u, buffers.orden, buffers.cantidad_orden,
+                    buffers.distancia, buffers.cantidad_caminos)
+            buffers.limpiar()
+        self.matriz_caminos = matriz
+
     def get_recorrido_anchura_caminos_minimos(self, u, v):
         """
         Obtiene el recorrido en anchura por caminos mínimos 
@@ -196,25 +954,40 @@ class Grafo:
         Previamente se debe haber llamado a calcular_camino_minimo(u)
         o calcular_camino_minimo(v).
         """
-        if self.cantidad_caminos_minimos[u][v] <> 0:
-            return self.cantidad_caminos_minimos[u][v]
+        cantidad = self.cantidad_caminos_minimos.get(u)
+        if cantidad is not None and cantidad[v] <> 0:
+            return cantidad[v]
+        if u not in self.padre and self.matriz_caminos is not None:
+            return self.matriz_caminos.get_cantidad_caminos(u, v)
 
         try:
-            recorrido = self.get_recorrido_anchura_caminos_minimos(u,v)
+            self.verificar_existe_camino(u,v)
         except CaminoInexistente:
             return 0
 
-        # O(|V|+|E|): Idem explicación get_recorrido_anchura_caminos_minimos
-        for w in recorrido:
-            if self.cantidad_caminos_minimos[u][w] <> 0:
+        if cantidad is None:
+            # O(|V|) Sólo se reserva la fila del origen u
+            cantidad = [0] * self.cantidad_vertices
+            self.cantidad_caminos_minimos[u] = cantidad
+        cantidad[u] = 1
+
+        # O(|V|+|E|) Recorrido en profundidad por los predecesores desde
+        # v: cada vértice se suma recién cuando ya se sumaron todos sus
+        # predecesores (el orden en anchura no lo garantiza con pesos).
+        padre = self.padre[u]
+        pila = [v]
+        while pila:
+            w = pila[-1]
+            if cantidad[w] <> 0:
+                pila.pop()
                 continue
-            if w==u:
-                self.cantidad_caminos_minimos[u][w] = 1
+            pendientes = [ p for p in padre[w] if cantidad[p] == 0 ]
+            if pendientes:
+                pila.extend(pendientes)
             else:
-                for padre in self.padre[u][w]:
-                    self.cantidad_caminos_minimos[u][w] += (
-                        self.cantidad_caminos_minimos[u][padre] )
-        return self.cantidad_caminos_minimos[u][v]
+                cantidad[w] = sum(cantidad[p] for p in padre[w])
+                pila.pop()
+        return cantidad[v]
 
     def get_cantidad_caminos_minimos_con_intermediario(self, u, w, v):
         """
@@ -1,105 +1,239 @@
 #!/usr/bin/python
 # coding=utf-8
 
+import instrumentacion
 from grafo import Grafo
 
+# Se pasa a expandir de abajo hacia arriba cuando las aristas de la
+# frontera superan 1/ALFA de las aristas de los vértices no visitados, y
+# se vuelve a expandir de arriba hacia abajo cuando la frontera tiene
+# menos de 1/BETA de los vértices. Si se cuentan caminos, de abajo hacia
+# arriba se recorren todas las aristas de los no visitados, por lo que
+# sólo conviene cuando la frontera tiene más aristas que ellos.
+ALFA = 14
+ALFA_CONTANDO_CAMINOS = 1
+BETA = 24
+
+
+class RecorridoPorNiveles:
+    """
+    Resultado de GrafoPesoUnitario.recorrer_por_niveles: distancia y
+    cantidad de caminos mínimos desde el origen por vértice (None y 0
+    si no es alcanzable), los vértices de cada nivel, cuántos niveles se
+    expandieron de abajo hacia arriba y, si se pidieron, los
+    predecesores de cada vértice.
+    """
+
+    def __init__(self, cantidad_vertices, padres=False):
+        """
+        O(|V|)
+        """
+        self.distancia = [None] * cantidad_vertices
+        self.cantidad_caminos = [0] * cantidad_vertices
+        self.niveles = []
+        self.niveles_abajo_arriba = 0
+        self.padre = None
+        if padres:
+            self.padre = [ set() for i in xrange(cantidad_vertices) ]
+
+
 class GrafoPesoUnitario(Grafo):
 
     def bfs(self, u):
         """
         O(|V|+|E|)
-        Devuelve un listado comenzando poe la raiz (u) y terminando 
+        Devuelve un listado comenzando por la raiz (u) y terminando 
         por los vertices a mayor distancia de u.
-        Es requisito que ya se hayan calculado los caminos mínimos
-        para el vértice u
         """
+        recorrido = []
+        for nivel in self.recorrer_por_niveles(u, contar_caminos=False
+                ).niveles:
+            recorrido.extend(nivel)
+        return recorrido
 
-        s=[]
-
-        visitado = [False] * self.cantidad_vertices
-        q = [u]
-
-        while len(q)>0:
-            w = q.pop(0)
-
-            if visitado[w]:
-                continue
-
-            visitado[w] = True
+    def recorrer_por_niveles(self, u, contar_caminos=True, padres=False):
+        """
+        O(|V|+|E|)
+        Recorrido en anchura nivel por nivel desde u. Cada nivel se
+        expande de arriba hacia abajo (recorriendo los adyacentes de la
+        frontera) o, si el grafo es simétrico y la frontera tiene más
+        aristas que lo que queda por explorar, de abajo hacia arriba
+        (cada vértice no visitado busca adyacentes en la frontera,
+        marcada en un bytearray). En los niveles centrales de los grafos
+        sociales esto último examina muchas menos aristas.
+        contar_caminos: si es falso no se calcula la cantidad de caminos
+        mínimos y la búsqueda de abajo hacia arriba se detiene en el
+        primer adyacente de la frontera.
+        padres: si es verdadero se guardan los predecesores de cada
+        vértice en caminos mínimos.
+        """
+        cantidad_vertices = self.cantidad_vertices
+        recorrido = RecorridoPorNiveles(cantidad_vertices, padres)
+        distancia = recorrido.distancia
+        cantidad_caminos = recorrido.cantidad_caminos
+        padre = recorrido.padre
+        distancia[u] = 0
+        cantidad_caminos[u] = 1
+        frontera = [u]
+        recorrido.niveles.append(frontera)
+
+        simetrico = self.es_simetrico()
+        en_frontera = bytearray(cantidad_vertices)
+        sin_visitar = None
+        alfa = ALFA_CONTANDO_CAMINOS if contar_caminos else ALFA
+        # O(|V|) Aristas de la frontera y de los vértices no visitados
+        aristas_frontera = self.get_grado_salida(u)
+        aristas_sin_visitar = -aristas_frontera
+        for v in self.iternodes():
+            aristas_sin_visitar += self.get_grado_salida(v)
+        abajo_arriba = False
+        examinadas = 0
+
+        while frontera:
+            if simetrico:
+                if not abajo_arriba:
+                    abajo_arriba = (aristas_frontera * alfa >
+                            aristas_sin_visitar)
+                else:
+                    abajo_arriba = (len(frontera) * BETA >=
+                            cantidad_vertices)
+            distancia_siguiente = len(recorrido.niveles)
+            siguiente = []
+
+            if abajo_arriba:
+                recorrido.niveles_abajo_arriba += 1
+                if sin_visitar is None:
+                    # O(|V|)
+                    sin_visitar = [ v for v in self.iternodes()
+                            if distancia[v] is None ]
+                for w in frontera:
+                    en_frontera[w] = 1
+                restantes = []
+                for v in sin_visitar:
+                    caminos = 0
+                    for a in self.ady(v):
+                        examinadas += 1
+                        if en_frontera[a]:
+                            caminos += cantidad_caminos[a]
+                            if padre is not None:
+                                padre[v].add(a)
+                            if not contar_caminos:
+                                break
+                    if caminos:
+                        distancia[v] = distancia_siguiente
+                        cantidad_caminos[v] = caminos
+                        siguiente.append(v)
+                    else:
+                        restantes.append(v)
+                for w in frontera:
+                    en_frontera[w] = 0
+                sin_visitar = restantes
+            else:
+                sin_visitar = None
+                for w in frontera:
+                    caminos_w = cantidad_caminos[w]
+                    for a in self.ady(w):
+                        examinadas += 1
+                        distancia_a = distancia[a]
+                        if distancia_a is None:
+                            distancia[a] = distancia_siguiente
+                            cantidad_caminos[a] = caminos_w
+                            siguiente.append(a)
+                            if padre is not None:
+                                padre[a].add(w)
+                        elif (distancia_a == distancia_siguiente and
+                                contar_caminos):
+                            cantidad_caminos[a] += caminos_w
+                            if padre is not None:
+                                padre[a].add(w)
+
+            # O(len(siguiente))
+            aristas_frontera = 0
+            for v in siguiente:
+                aristas_frontera += self.get_grado_salida(v)
+            aristas_sin_visitar -= aristas_frontera
+            if siguiente:
+                recorrido.niveles.append(siguiente)
+            frontera = siguiente
+
+        if instrumentacion.actual is not None:
+            self._contar_recorrido(sum(len(nivel) for nivel in
+                recorrido.niveles), examinadas)
+        return recorrido
+
+    def _acumular_influencias(self, u, influencias, buffers, pesos=None):
+        """
+        O(|V|+|E|)
+        Barrido de Brandes desde u: en un mismo recorrido en anchura se
+        calculan distancias, cantidad de caminos mínimos y predecesores,
+        y luego se propagan las dependencias en orden inverso. No se
+        conserva nada del origen u al terminar.
+        """
+        self._recorrer_caminos_minimos(u, buffers)
+        # O(|V|+|E|)
+        buffers.acumular_dependencias(u, influencias, pesos)
+        buffers.limpiar()
 
-            s.append(w)
+    def _recorrer_caminos_minimos(self, u, buffers):
+        """
+        O(|V|+|E|)
+        Recorrido en anchura desde u: deja en los buffers las distancias,
+        la cantidad de caminos mínimos, los predecesores y el orden de
+        visita.
+        """
+        distancia = buffers.distancia
+        cantidad_caminos = buffers.cantidad_caminos
+        orden = buffers.orden
 
-            for a in self.ady(w):
-                if ( self.distancia[u][w] + 1 == self.distancia[u][a] ):
-                    q.append(a)
-        return s
+        distancia[u] = 0
+        cantidad_caminos[u] = 1
+        orden[0] = u
+        cabeza = 0
+        cola = 1
+        examinadas = 0
 
-    def __acumular_influencias(self, u):
         # O(|V|+|E|)
-        S = self.bfs(u)
-
-        # O(|E|)
-        # Se acumulan las influencias a partir del calculo de
-        # dependencias del vertice u hacia el resto.
-        dependencias = [0 for i in self.iternodes()]
-        while len(S) > 0:
-            w = S.pop()
-            for v in self.padre[u][w]:
-                dependencias[v] += (float(self.cantidad_caminos_minimos[u][v]) /
-                        float(self.cantidad_caminos_minimos[u][w])) * (
-                                1 + dependencias[w])
-                if w <> u:
-                    self.influencias[w] += dependencias[w]
-
-    def calcular_influencias(self):
+        while cabeza < cola:
+            w = orden[cabeza]
+            cabeza += 1
+            distancia_ady = distancia[w] + 1
+            for a in self.ady(w):
+                examinadas += 1
+                if distancia[a] is None:
+                    distancia[a] = distancia_ady
+                    orden[cola] = a
+                    cola += 1
+                if distancia[a] == distancia_ady:
+                    cantidad_caminos[a] += cantidad_caminos[w]
+                    buffers.agregar_predecesor(a, w)
+
+        buffers.cantidad_orden = cola
+        if instrumentacion.actual is not None:
+            self._contar_recorrido(cola, examinadas)
+
+    def _longitud_arista(self, peso):
         """
-        # O(|V|*(|V|+|E|))
+        O(1)
         """
-        for u in self.iternodes(): #|V|
-            self.__acumular_influencias(u) # O(|V|+|E|)
+        return 1
 
     def calcular_camino_minimo(self, u):
         """
         Calcula las distancias de u al resto de los vertices.
-        O(|E|+|V|)
+        O(|E|+|V|) (ver recorrer_por_niveles)
         """
-
-        distancia = [None] * self.cantidad_vertices
-        padre = [set() for i in self.iternodes()]
-        visitado = [False] * self.cantidad_vertices
-        q = [u]
-        distancia[u] = 0
-        cantidad_caminos_minimos = [0] * self.cantidad_vertices
-        cantidad_caminos_minimos[u] = 1
-
-        while len(q)>0:
-            w = q.pop(0)
-
-            if visitado[w]:
-                continue
-
-            visitado[w] = True
-
-            for adyacente in self.ady(w):
-
-                if ( distancia[adyacente] is None or 
-                        distancia[w] + 1 < distancia[adyacente] ):
-                    q.append(adyacente)
-                    distancia[adyacente] = distancia[w] + 1
-                    padre[adyacente] = set([ w ])
-                    cantidad_caminos_minimos[adyacente] = cantidad_caminos_minimos[w] 
-                elif (distancia[w] + 1 == distancia[adyacente]):
-                    padre[adyacente].add(w)
-                    cantidad_caminos_minimos[adyacente] += cantidad_caminos_minimos[w] 
-
-        self.distancia[u] = distancia
-        self.padre[u] = padre
-        self.cantidad_caminos_minimos[u] = cantidad_caminos_minimos
+        recorrido = self.recorrer_por_niveles(u, padres=True)
+        self.distancia[u] = recorrido.distancia
+        self.padre[u] = recorrido.padre
+        self.cantidad_caminos_minimos[u] = recorrido.cantidad_caminos
 
     def get_cantidad_caminos_minimos(self, u, v, intentar_al_reves=True):
         """
         O(1)
         """
+        if (u not in self.cantidad_caminos_minimos and
+                self.matriz_caminos is not None):
+            return self.matriz_caminos.get_cantidad_caminos(u, v)
         return self.cantidad_caminos_minimos[u][v]
 
 
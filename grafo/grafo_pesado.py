@@ -1,18 +1,26 @@
 #!/usr/bin/python
 # coding=utf-8
 
+import instrumentacion
 from grafo import Grafo
-from heapq import heappop, heappush
+from colas import elegir_cola, ColaBaldes
 
 class GrafoPesado(Grafo):
 
-    def __init__(self, cantidad_vertices=0, pesos=[], *args, **kwargs):
+    def __init__(self, cantidad_vertices=0, pesos=[], cola=None, *args,
+            **kwargs):
         """
         O(1) si los valores de los parámetros son los definidos 
         por defecto.
         O(|E|*log(|V|))
+        cola: función que crea la cola de prioridad de Dijkstra dada la
+        cantidad de vértices (por ejemplo HeapIndexado o ColaBaldes). Si
+        no se indica se elige según los pesos (ver colas.elegir_cola).
         """
         Grafo.__init__(self, *args, **kwargs)
+        self.cola = cola
+        # Resultado de elegir_cola, None si hay que volver a elegirla.
+        self.cola_elegida = None
         for i in xrange(cantidad_vertices):
             self.add_node()
         for peso in pesos:
@@ -21,64 +29,240 @@ class GrafoPesado(Grafo):
             # O(log(|V|))
             self.connect(peso[0], peso[1], peso[2])
 
+    def _conectar(self, u, v, peso, both):
+        Grafo._conectar(self, u, v, peso, both)
+        self.cola_elegida = None
+
+    def cargar_aristas(self, origenes, destinos, pesos=None, both=False):
+        Grafo.cargar_aristas(self, origenes, destinos, pesos, both)
+        self.cola_elegida = None
+
+    def asignar_adyacencias(self, adyacencias, cantidad_aristas, node_data):
+        Grafo.asignar_adyacencias(self, adyacencias, cantidad_aristas,
+                node_data)
+        self.cola_elegida = None
+
+    def _crear_cola(self):
+        """
+        O(|V|), más O(|E|) si cambiaron las aristas desde la última
+        elección.
+        """
+        cola = self.cola
+        if cola is None:
+            if self.cola_elegida is None:
+                self.cola_elegida = elegir_cola( peso
+                        for u in self.iternodes()
+                        for _, peso in self.ady_con_pesos(u) )
+            cola = self.cola_elegida
+        return cola(self.cantidad_vertices)
+
     def calcular_camino_minimo(self, vertice):
         """
-        O(|E|*log(|V|))
+        O(|E|*log(|V|)) con un heap, O(|E|+|V|*peso máximo) con
+        ColaBaldes.
+        Los empates sólo agregan el predecesor: cada vértice entra una
+        vez en la cola. La cantidad de caminos mínimos de cada vértice se
+        suma al asentarlo, cuando ya están asentados todos sus
+        predecesores.
         """
         distancia = [None] * self.cantidad_vertices
         padre = [set() for i in self.iternodes()]
+        cantidad = [0] * self.cantidad_vertices
         visitado = [False] * self.cantidad_vertices
         distancia[vertice] = 0
-        heap = []
-        heappush(heap, (distancia[vertice], vertice))
-        while heap:
-            (_, v) = heappop(heap)
+        cantidad[vertice] = 1
+        cola = self._crear_cola()
+        cola.insertar(vertice, 0)
+        extraidos = 0
+        examinadas = 0
+        empujes = 1
+        while cola:
+            (distancia_v, v) = cola.extraer()
+            extraidos += 1
             visitado[v] = True
-            for w, peso in self.ady(v).iteritems():
+            if v <> vertice:
+                cantidad[v] = sum(cantidad[p] for p in padre[v])
+            for w, peso in self.ady_con_pesos(v):
+                examinadas += 1
                 if visitado[w]:
                     continue
-                if ( distancia[w] is None or 
-                        distancia[v] + peso < distancia[w] ):
-                    distancia[w] = distancia[v] + peso
-                    heappush(heap,
-                            (distancia[w], w))
-                    padre[w] =set([ v ])
-                elif (distancia[v] + peso == distancia[w]):
-                    heappush(heap,
-                            (distancia[w], w))
+                distancia_w = distancia_v + peso
+                if distancia[w] is None:
+                    distancia[w] = distancia_w
+                    cola.insertar(w, distancia_w)
+                    padre[w] = set([ v ])
+                    empujes += 1
+                elif distancia_w < distancia[w]:
+                    distancia[w] = distancia_w
+                    cola.disminuir(w, distancia_w)
+                    padre[w] = set([ v ])
+                    empujes += 1
+                elif distancia_w == distancia[w]:
                     padre[w].add(v)
 
+        if instrumentacion.actual is not None:
+            self._contar_recorrido(extraidos, examinadas, empujes)
+
         self.distancia[vertice] = distancia
         self.padre[vertice] = padre
+        self.cantidad_caminos_minimos[vertice] = cantidad
 
-    def calcular_influencias(self):
-        # O(n)
-        self.influencias = [0 for w in self.iternodes()]
+    def _acumular_influencias(self, u, influencias, buffers, pesos=None):
+        """
+        O(|E|*log(|V|)) con un heap, O(|E|+|V|*peso máximo) con
+        ColaBaldes.
+        Barrido de Brandes desde u sobre Dijkstra: al asentar cada
+        vértice ya se conocen todos sus predecesores, de modo que la
+        cantidad de caminos mínimos se cuenta durante el mismo recorrido
+        (sumando también los empates de igual longitud) y las
+        dependencias se propagan en el orden inverso de asentamiento.
+        Los caminos que usan aristas de peso 0 entre vértices a igual
+        distancia no se cuentan.
+        """
+        self._recorrer_caminos_minimos(u, buffers)
+        # O(|V|+|E|)
+        buffers.acumular_dependencias(u, influencias, pesos)
+        buffers.limpiar()
 
+    def _recorrer_caminos_minimos(self, u, buffers):
+        """
+        O(|E|*log(|V|)) con un heap, O(|E|+|V|*peso máximo) con
+        ColaBaldes.
+        """
+        if isinstance(buffers.cola, ColaBaldes):
+            empujes, examinadas = self._recorrer_con_baldes(u, buffers)
+        else:
+            empujes, examinadas = self._recorrer_con_cola(u, buffers)
+        if instrumentacion.actual is not None:
+            self._contar_recorrido(buffers.cantidad_orden, examinadas,
+                    empujes)
 
-        # Preprocesamiento de cantidad de caminos mínimos
-        # O((|V|**2)*(|V|+|E|))
-        for u in self.iternodes():  # |V|
-            for v in self.iternodes():  # |V|
-                cantidad_u_v = self.get_cantidad_caminos_minimos(u,v) # O(|V|+|E|)
+    def _recorrer_con_cola(self, u, buffers):
+        """
+        O(|E|*log(|V|)) con un heap.
+        Dijkstra desde u con la cola de los buffers: deja en los buffers
+        las distancias, la cantidad de caminos, los predecesores y el
+        orden de asentamiento. Devuelve la cantidad de inserciones y
+        disminuciones de clave y la de aristas examinadas.
+        """
+        distancia = buffers.distancia
+        cantidad_caminos = buffers.cantidad_caminos
+        cantidad_predecesores = buffers.cantidad_predecesores
+        asentado = buffers.asentado
+        orden = buffers.orden
+        insertar = buffers.cola.insertar
+        disminuir = buffers.cola.disminuir
+        extraer = buffers.cola.extraer
+
+        distancia[u] = 0
+        cantidad_caminos[u] = 1
+        cantidad_orden = 0
+        insertar(u, 0)
+        pendientes = 1
+        empujes = 1
+        examinadas = 0
 
-        # O(|V|**3)
-        for u in self.iternodes():  # |V|
-            for v in self.iternodes():  # |V|
-                if u>=v:
+        while pendientes:
+            (distancia_v, v) = extraer()
+            pendientes -= 1
+            asentado[v] = 1
+            orden[cantidad_orden] = v
+            cantidad_orden += 1
+            for w, peso in self.ady_con_pesos(v):
+                examinadas += 1
+                if asentado[w]:
                     continue
-                # O(1) c/preprocesamiento
-                cantidad_u_v = self.get_cantidad_caminos_minimos(u,v)
-                if cantidad_u_v == 0:
+                distancia_w = distancia_v + peso
+                distancia_actual = distancia[w]
+                if distancia_actual is None or distancia_w < distancia_actual:
+                    distancia[w] = distancia_w
+                    cantidad_caminos[w] = cantidad_caminos[v]
+                    cantidad_predecesores[w] = 0
+                    buffers.agregar_predecesor(w, v)
+                    if distancia_actual is None:
+                        insertar(w, distancia_w)
+                        pendientes += 1
+                    else:
+                        disminuir(w, distancia_w)
+                    empujes += 1
+                elif distancia_w == distancia_actual:
+                    cantidad_caminos[w] += cantidad_caminos[v]
+                    buffers.agregar_predecesor(w, v)
+
+        buffers.cantidad_orden = cantidad_orden
+        return empujes, examinadas
+
+    def _recorrer_con_baldes(self, u, buffers):
+        """
+        O(|E|+|V|*peso máximo)
+        Como _recorrer_con_cola, pero con los baldes de la ColaBaldes de
+        los buffers manejados en el mismo ciclo, como la cola del
+        recorrido en anchura de GrafoPesoUnitario: cada balde guarda los
+        vértices alcanzados a una misma distancia (módulo la cantidad de
+        baldes) y las entradas cuya distancia ya bajó se descartan al
+        vaciarlo.
+        """
+        distancia = buffers.distancia
+        cantidad_caminos = buffers.cantidad_caminos
+        cantidad_predecesores = buffers.cantidad_predecesores
+        asentado = buffers.asentado
+        orden = buffers.orden
+        baldes = buffers.cola.baldes
+        cantidad_baldes = buffers.cola.cantidad_baldes
+
+        distancia[u] = 0
+        cantidad_caminos[u] = 1
+        cantidad_orden = 0
+        baldes[0].append(u)
+        pendientes = 1
+        empujes = 1
+        examinadas = 0
+        actual = 0
+
+        while pendientes:
+            balde = baldes[actual % cantidad_baldes]
+            while balde:
+                v = balde.pop()
+                if asentado[v] or distancia[v] <> actual:
                     continue
-                for w in self.iternodes(): # |V|
-                    if w==u or w==v:
+                pendientes -= 1
+                asentado[v] = 1
+                orden[cantidad_orden] = v
+                cantidad_orden += 1
+                for w, peso in self.ady_con_pesos(v):
+                    examinadas += 1
+                    if asentado[w]:
                         continue
-                    influencias[w] += float(
-                                # O(1) (c/preprocesamiento)
-                                self.get_cantidad_caminos_minimos_con_intermediario(u,w,v)
-                                ) / cantidad_u_v
-        return self.influencias
+                    distancia_w = actual + peso
+                    distancia_actual = distancia[w]
+                    if (distancia_actual is None or
+                            distancia_w < distancia_actual):
+                        distancia[w] = distancia_w
+                        cantidad_caminos[w] = cantidad_caminos[v]
+                        cantidad_predecesores[w] = 0
+                        buffers.agregar_predecesor(w, v)
+                        baldes[distancia_w % cantidad_baldes].append(w)
+                        if distancia_actual is None:
+                            pendientes += 1
+                        empujes += 1
+                    elif distancia_w == distancia_actual:
+                        cantidad_caminos[w] += cantidad_caminos[v]
+                        buffers.agregar_predecesor(w, v)
+            actual += 1
+
+        # O(peso máximo) Descarta las entradas anteriores que quedan.
+        for balde in baldes:
+            del balde[:]
+        buffers.cantidad_orden = cantidad_orden
+        return empujes, examinadas
+
+    def _crear_buffers_influencias(self):
+        """
+        O(|V|+|E|)
+        """
+        buffers = Grafo._crear_buffers_influencias(self)
+        buffers.cola = self._crear_cola()
+        return buffers
 
     def calcular_caminos_minimos(self):
         """
@@ -0,0 +1,152 @@
+#!/usr/bin/python
+# coding=utf-8
+
+import cProfile
+import resource
+import time
+from contextlib import contextmanager
+
+# Instrumentación activa o None. Los recorridos cuentan en variables
+# locales y la consultan una única vez por origen.
+actual = None
+
+
+def memoria_maxima():
+    """
+    O(1)
+    Pico de memoria residente del proceso en KB desde que empezó: nunca
+    disminuye.
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def tiempo_cpu():
+    """
+    O(1)
+    Segundos de cpu (usuario y sistema) consumidos por el proceso.
+    """
+    uso = resource.getrusage(resource.RUSAGE_SELF)
+    return uso.ru_utime + uso.ru_stime
+
+
+class Instrumentacion:
+    """
+    Tiempos y memoria de cada fase y contadores de las operaciones
+    principales de los recorridos:
+        origenes: recorridos completos desde un origen.
+        vertices_extraidos: vértices extraídos de la cola o del heap.
+        aristas_examinadas: aristas recorridas en los ciclos de los
+        recorridos (incluidas las que llevan a vértices ya asentados, y
+        en anchura de abajo hacia arriba sólo hasta dar con la frontera).
+        empujes_heap: inserciones y disminuciones de clave en la cola de
+        Dijkstra.
+        intersecciones: pasos u-w-v recorridos al contar conexiones en
+        común.
+    Si se indica prefijo_perfiles, cada fase se perfila con cProfile y
+    se guarda en prefijo_perfiles + nombre de la fase + '.prof'.
+    """
+
+    def __init__(self, prefijo_perfiles=None):
+        """
+        O(1)
+        """
+        self.prefijo_perfiles = prefijo_perfiles
+        self.fases = []
+        self.contadores = {}
+
+    def sumar(self, nombre, cantidad=1):
+        """
+        O(1)
+        """
+        self.contadores[nombre] = self.contadores.get(nombre, 0) + cantidad
+
+    def sumar_contadores(self, contadores):
+        """
+        O(len(contadores))
+        """
+        for nombre, cantidad in contadores.iteritems():
+            self.sumar(nombre, cantidad)
+
+    @contextmanager
+    def fase(self, nombre):
+        """
+        Mide el bloque: segundos, segundos de cpu, contadores sumados
+        durante el bloque y memoria en KB:
+            incremento_memoria_kb: cuánto subió el pico de memoria del
+            proceso durante el bloque (0 si el bloque no superó el pico
+            de alguna fase anterior).
+            memoria_maxima_proceso_kb: pico acumulado del proceso al
+            terminar el bloque, incluidas las fases anteriores.
+        """
+        contadores_previos = dict(self.contadores)
+        memoria_inicial = memoria_maxima()
+        perfil = None
+        if self.prefijo_perfiles is not None:
+            perfil = cProfile.Profile()
+        inicio, inicio_cpu = time.time(), tiempo_cpu()
+        if perfil is not None:
+            perfil.enable()
+        try:
+            yield
+        finally:
+            if perfil is not None:
+                perfil.disable()
+                perfil.dump_stats(self.prefijo_perfiles + nombre + '.prof')
+            self.fases.append({
+                'fase': nombre,
+                'segundos': time.time() - inicio,
+                'cpu': tiempo_cpu() - inicio_cpu,
+                'incremento_memoria_kb': memoria_maxima() - memoria_inicial,
+                'memoria_maxima_proceso_kb': memoria_maxima(),
+                'contadores': dict( (contador, cantidad -
+                    contadores_previos.get(contador, 0)) for contador, cantidad
+                    in self.contadores.iteritems()
+                    if cantidad <> contadores_previos.get(contador, 0) ),
+                })
+
+    def como_dict(self):
+        """
+        O(cantidad de fases y contadores)
+        """
+        return {'fases': list(self.fases),
+                'contadores': dict(self.contadores)}
+
+
+def activar(instrumentacion=None):
+    """
+    O(1)
+    Activa la instrumentación indicada (o una nueva) y la devuelve.
+    """
+    global actual
+    if instrumentacion is None:
+        instrumentacion = Instrumentacion()
+    actual = instrumentacion
+    return instrumentacion
+
+
+def desactivar():
+    """
+    O(1)
+    """
+    global actual
+    actual = None
+
+
+@contextmanager
+def fase(nombre):
+    """
+    Mide el bloque como una fase de la instrumentación activa, si la hay.
+    """
+    if actual is None:
+        yield
+    else:
+        with actual.fase(nombre):
+            yield
+
+
+def contar(nombre, cantidad=1):
+    """
+    O(1)
+    """
+    if actual is not None:
+        actual.sumar(nombre, cantidad)
@@ -20,6 +20,34 @@ class ListaOrdenada():
             raise Exception('El nodo %s ya existe en la lista.' % node)
         return self.lista.insert(i, node)
 
+    def extend(self, nodes):
+        """
+        O((n+m)*log(n+m))
+        Agrega varios nodos con un único ordenamiento.
+        """
+        self.lista = self.union(nodes)
+
+    def union(self, nodes):
+        """
+        O((n+m)*log(n+m))
+        Lista ordenada con los nodos de ésta y los indicados, sin
+        modificarla. Falla si alguno ya estaba o se repite.
+        """
+        lista = sorted(self.lista + list(nodes))
+        for i in xrange(1, len(lista)):
+            if lista[i] == lista[i-1]:
+                raise Exception('El nodo %s ya existe en la lista.' % lista[i])
+        return lista
+
+    def remove(self, node):
+        """
+        O(n)
+        """
+        i = bisect.bisect_left(self.lista, node)
+        if i == len(self.lista) or self.lista[i] <> node:
+            raise Exception('El nodo %s no existe en la lista.' % node)
+        del self.lista[i]
+
     def has(self, node):
         """
         O(n*log(n))
@@ -74,6 +102,28 @@ class ListaOrdenadaTestCase(unittest.TestCase):
 
         self.assertEqual(items, [1,2,3,5,10])
 
+    def test_extend(self):
+
+        l = ListaOrdenada()
+
+        l.insert(5)
+        l.extend([10, 1, 3])
+        l.extend([])
+        l.extend([2])
+
+        self.assertEqual([ x for x in l.iteritems()], [1,2,3,5,10])
+        self.assertRaises(Exception, l.extend, [4, 3])
+
+    def test_remove(self):
+
+        l = ListaOrdenada()
+
+        l.extend([10, 1, 3])
+        l.remove(3)
+
+        self.assertEqual([ x for x in l.iteritems()], [1,10])
+        self.assertRaises(Exception, l.remove, 3)
+
     def test_has(self):
 
         l = ListaOrdenada()
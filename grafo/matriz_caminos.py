@@ -0,0 +1,196 @@
+#!/usr/bin/python
+# coding=utf-8
+
+import ctypes
+import mmap
+import tempfile
+from array import array
+
+TIPOS_CTYPES = {
+    'H': ctypes.c_uint16,
+    'I': ctypes.c_uint32,
+    'l': ctypes.c_int64,
+    'L': ctypes.c_uint64,
+    'd': ctypes.c_double,
+    }
+
+# Cantidad de caminos que no entra en un entero de 64 bits: el valor se
+# guarda aparte (ver MatrizCaminos.desbordes).
+DESBORDE = (1 << 64) - 1
+
+
+def _maximo(tipo):
+    """
+    O(1)
+    Mayor valor que entra en un array de ese tipo.
+    """
+    if tipo == 'd':
+        return float('inf')
+    bits = 8 * array(tipo).itemsize
+    if tipo.islower():
+        bits -= 1
+    return (1 << bits) - 1
+
+
+def tipo_distancias(cantidad_vertices, longitudes):
+    """
+    O(len(longitudes))
+    Tipo de array más chico que guarda cualquier distancia entre
+    cantidad_vertices vértices con esas longitudes de aristas, reservando
+    su mayor valor para los pares sin camino: 'H' (16 bits), 'I' (32
+    bits) o 'l' (64 bits) si las longitudes son enteras y 'd' si no.
+    """
+    longitud_maxima = 0
+    for longitud in longitudes:
+        if not isinstance(longitud, (int, long)):
+            return 'd'
+        if longitud > longitud_maxima:
+            longitud_maxima = longitud
+    cota = max(cantidad_vertices - 1, 0) * longitud_maxima
+    for tipo in ('H', 'I', 'l'):
+        if cota < _maximo(tipo):
+            return tipo
+    return 'd'
+
+
+class MatrizCaminos:
+    """
+    Distancias y cantidad de caminos mínimos entre todos los pares de
+    vértices, en arreglos de tipo fijo mapeados en memoria desde un
+    archivo: el sistema operativo mantiene en memoria sólo las páginas
+    que se usan, de modo que la matriz puede superar la memoria
+    disponible.
+        distancias: una entrada del tipo tipo_distancia por par; los
+        pares sin camino guardan sin_camino (el mayor valor del tipo).
+        cantidades: un entero sin signo de 64 bits por par (None si no
+        se guardan); los que no entran valen DESBORDE y se guardan en
+        desbordes por número de entrada.
+    Si la matriz es simétrica sólo se guardan los pares (u, v) con
+    u <= v, fila por fila: la fila u ocupa cantidad_vertices-u entradas.
+    """
+
+    def __init__(self, cantidad_vertices, simetrica, tipo_distancia,
+            cantidades=True, archivo=None):
+        """
+        O(1) (el archivo se crea disperso)
+        archivo: ruta del archivo que respalda la matriz. Si no se
+        indica se usa un archivo temporal que se borra al cerrarla.
+        """
+        n = cantidad_vertices
+        self.cantidad_vertices = n
+        self.simetrica = simetrica
+        self.entradas = n * (n + 1) // 2 if simetrica else n * n
+        self.tipo_distancia = tipo_distancia
+        self.sin_camino = _maximo(tipo_distancia)
+        self.tamanio_distancia = array(tipo_distancia).itemsize
+        self.desbordes = {}
+
+        tamanio = self.entradas * self.tamanio_distancia
+        inicio_cantidades = tamanio + (-tamanio % 8)
+        if cantidades:
+            tamanio = inicio_cantidades + self.entradas * 8
+
+        if archivo is None:
+            f = tempfile.TemporaryFile()
+        else:
+            f = open(archivo, 'w+b')
+        with f:
+            # mmap no admite archivos vacíos.
+            f.truncate(max(tamanio, 8))
+            self.mapa = mmap.mmap(f.fileno(), max(tamanio, 8))
+
+        self.inicio_cantidades = inicio_cantidades
+        self.distancias = (TIPOS_CTYPES[tipo_distancia] *
+                self.entradas).from_buffer(self.mapa)
+        self.cantidades = None
+        if cantidades:
+            self.cantidades = (ctypes.c_uint64 * self.entradas).from_buffer(
+                    self.mapa, inicio_cantidades)
+
+    def _inicio_fila(self, u):
+        """
+        O(1)
+        Entrada del par (u, u) si es simétrica, (u, 0) si no.
+        """
+        n = self.cantidad_vertices
+        if self.simetrica:
+            return u * n - u * (u - 1) // 2
+        return u * n
+
+    def _entrada(self, u, v):
+        """
+        O(1)
+        """
+        if self.simetrica:
+            if u > v:
+                u, v = v, u
+            return self._inicio_fila(u) + v - u
+        return u * self.cantidad_vertices + v
+
+    def guardar_fila(self, u, orden, cantidad_orden, distancia,
+            cantidad_caminos):
+        """
+        O(|V|)
+        Guarda los resultados de un recorrido desde u que alcanzó
+        orden[:cantidad_orden] con esas distancias y cantidades de
+        caminos (por ejemplo, los de BuffersBrandes). Si es simétrica
+        sólo se guardan los vértices v >= u.
+        """
+        desde = u if self.simetrica else 0
+        largo = self.cantidad_vertices - desde
+        inicio = self._inicio_fila(u)
+
+        distancias = array(self.tipo_distancia, [self.sin_camino]) * largo
+        cantidades = array('L', [0]) * largo
+        for i in xrange(cantidad_orden):
+            v = orden[i]
+            if v < desde:
+                continue
+            distancias[v - desde] = distancia[v]
+            cantidad = cantidad_caminos[v]
+            if cantidad >= DESBORDE:
+                self.desbordes[inicio + v - desde] = cantidad
+                cantidad = DESBORDE
+            cantidades[v - desde] = cantidad
+
+        # O(|V|) Se copian los bytes de cada fila de una vez.
+        posicion = inicio * self.tamanio_distancia
+        self.mapa[posicion:posicion + largo * self.tamanio_distancia] = (
+                distancias.tostring())
+        if self.cantidades is not None:
+            posicion = self.inicio_cantidades + inicio * 8
+            self.mapa[posicion:posicion + largo * 8] = cantidades.tostring()
+
+    def get_distancia(self, u, v):
+        """
+        O(1)
+        Distancia de u a v, None si no hay camino.
+        """
+        distancia = self.distancias[self._entrada(u, v)]
+        if distancia == self.sin_camino:
+            return None
+        return distancia
+
+    def get_cantidad_caminos(self, u, v):
+        """
+        O(1)
+        Cantidad de caminos mínimos de u a v, 0 si no hay camino.
+        """
+        if self.cantidades is None:
+            raise Exception(
+                    'La matriz no guarda la cantidad de caminos mínimos.')
+        entrada = self._entrada(u, v)
+        cantidad = self.cantidades[entrada]
+        if cantidad == DESBORDE:
+            return self.desbordes[entrada]
+        return int(cantidad)
+
+    def cerrar(self):
+        """
+        O(1)
+        Libera el mapa de memoria. La matriz no puede volver a usarse.
+        """
+        # Los arreglos apuntan al mapa: se descartan antes de cerrarlo.
+        self.distancias = None
+        self.cantidades = None
+        self.mapa.close()
@@ -0,0 +1,107 @@
+#!/usr/bin/python
+# coding=utf-8
+
+import instrumentacion
+import multiprocessing
+from centralidades import Centralidades
+from array import array
+from itertools import imap
+
+# Cantidad fija de bloques en que se reparten los orígenes. No depende de
+# la cantidad de procesos, de modo que las sumas parciales y el orden en
+# que se reducen son siempre los mismos.
+CANTIDAD_BLOQUES = 128
+
+# Grafo, pesos de los vértices y medidas a acumular (None, o si se
+# acumulan las aristas) que heredan los procesos hijos al crearse el pool.
+_grafo = None
+_pesos = None
+_aristas = None
+
+
+def _bloques(fuentes, cantidad_bloques=CANTIDAD_BLOQUES):
+    """
+    O(|V|)
+    Divide el listado de orígenes en a lo sumo cantidad_bloques bloques
+    consecutivos de tamaño similar.
+    """
+    tamanio = max(1, -(-len(fuentes) // cantidad_bloques))
+    return [ fuentes[i:i+tamanio] for i in xrange(0, len(fuentes), tamanio) ]
+
+
+def _influencias_bloque(bloque):
+    """
+    O(len(bloque)*(|V|+|E|))
+    Acumula las influencias de los orígenes del bloque en un vector
+    parcial. Se devuelve serializado para reducir el costo de envío
+    entre procesos, junto con los contadores del bloque si la
+    instrumentación está activa y las Centralidades del bloque si se
+    piden.
+    """
+    influencias = [0.0] * _grafo.cantidad_vertices
+    buffers = _grafo._crear_buffers_influencias()
+    if _aristas is not None:
+        buffers.centralidades = Centralidades(_grafo.cantidad_vertices,
+                _aristas)
+    previa = instrumentacion.actual
+    if previa is not None:
+        instrumentacion.activar()
+    try:
+        for u in bloque:
+            _grafo._acumular_influencias(u, influencias, buffers, _pesos)
+        contadores = None
+        if previa is not None:
+            contadores = instrumentacion.actual.contadores
+    finally:
+        instrumentacion.actual = previa
+    return (array('d', influencias).tostring(), contadores,
+            buffers.centralidades)
+
+
+def influencias_por_bloques(grafo, procesos, fuentes=None, pesos=None,
+        centralidades=None):
+    """
+    O(|V|*(|V|+|E|)/procesos)
+    Calcula las influencias repartiendo los orígenes en bloques entre
+    `procesos` procesos. Los vectores parciales se suman en el orden de
+    los bloques, por lo que el resultado es el mismo para cualquier
+    cantidad de procesos.
+    pesos: ver BuffersBrandes.acumular_dependencias.
+    centralidades: si se indica, se le suman las Centralidades de cada
+    bloque.
+    """
+    global _grafo, _pesos, _aristas
+
+    if fuentes is None:
+        fuentes = list(grafo.iternodes())
+    bloques = _bloques(fuentes)
+
+    influencias = [0.0] * grafo.cantidad_vertices
+    _grafo = grafo
+    _pesos = pesos
+    if centralidades is not None:
+        _aristas = centralidades.aristas is not None
+    pool = None
+    try:
+        if procesos == 1:
+            parciales = imap(_influencias_bloque, bloques)
+        else:
+            pool = multiprocessing.Pool(procesos)
+            parciales = pool.imap(_influencias_bloque, bloques)
+        # O(|V|*CANTIDAD_BLOQUES)
+        for parcial, contadores, centralidades_bloque in parciales:
+            if contadores is not None:
+                instrumentacion.actual.sumar_contadores(contadores)
+            if centralidades_bloque is not None:
+                centralidades.sumar(centralidades_bloque)
+            parcial = array('d', parcial)
+            for w in xrange(len(parcial)):
+                influencias[w] += parcial[w]
+    finally:
+        _grafo = None
+        _pesos = None
+        _aristas = None
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return influencias
@@ -1,10 +1,22 @@
 #!/usr/bin/python
 # coding=utf-8
 
+import os
+import random
+import shutil
+import tempfile
 import unittest
+from functools import partial
+from adyacencias import AdyacenciasCSR, AdyacenciasBits, AdyacenciasListas, \
+        elegir_adyacencias
 from grafo import CaminoInexistente
 from grafo_pesado import GrafoPesado
 from grafo_no_pesado import GrafoPesoUnitario
+from colas import HeapBinario, HeapIndexado, ColaBaldes, elegir_cola
+from matriz_caminos import tipo_distancias
+import instrumentacion
+from generadores import erdos_renyi, barabasi_albert, \
+        bloques_estocasticos, grilla
 
 class GrafoPesoUnitarioTestCase(unittest.TestCase):
 
@@ -92,12 +104,201 @@ class GrafoPesoUnitarioTestCase(unittest.TestCase):
             grafo.get_cantidad_caminos_minimos_con_intermediario(2,5,11),
             1)
  
+    def test_conexiones(self):
+
+        grafo = self.clase_grafo()
+
+        for i in xrange(6):
+            grafo.add_node()
+
+        grafo.connect(0,1,both=True)
+        grafo.connect(0,2,both=True)
+        grafo.connect(3,1,both=True)
+        grafo.connect(3,2,both=True)
+        grafo.connect(3,4,both=True)
+        grafo.connect(0,4,both=True)
+
+        self.assertTrue(grafo.conectados(0,1))
+        self.assertTrue(grafo.conectados(1,0))
+        self.assertFalse(grafo.conectados(0,3))
+        self.assertFalse(grafo.conectados(5,0))
+        self.assertEqual(grafo.conexiones_en_comun(0,3), [1,2,4])
+        self.assertEqual(grafo.conexiones_en_comun(1,2), [0,3])
+        self.assertEqual(grafo.conexiones_en_comun(0,5), [])
+        self.assertEqual(sorted(grafo.ady(3)), [1,2,4])
+        self.assertEqual(grafo.get_grado_salida(0), 3)
+        self.assertEqual(grafo.get_grado_salida(5), 0)
+
+        grafo.connect(5,0,both=True)
+        self.assertTrue(grafo.conectados(0,5))
+        self.assertEqual(grafo.get_grado_salida(0), 4)
+        self.assertEqual(grafo.conexiones_en_comun(5,4), [0])
+
+    def test_cargar_aristas(self):
+
+        grafo = self.clase_grafo()
+
+        for i in xrange(5):
+            grafo.add_node()
+
+        grafo.connect(0,4,both=True)
+        grafo.cargar_aristas([0,0,1], [1,2,3], both=True)
+        grafo.cargar_aristas([3], [4], pesos=[2])
+
+        self.assertEqual(grafo.cantidad_aristas, 5)
+        self.assertEqual(sorted(grafo.ady(0)), [1,2,4])
+        self.assertEqual(sorted(grafo.ady(3)), [1,4])
+        self.assertEqual(sorted(grafo.ady(4)), [0])
+        self.assertEqual(sorted(grafo.ady_con_pesos(3)), [(1,1),(4,2)])
+        self.assertTrue(grafo.conectados(2,0))
+        self.assertEqual(grafo.conexiones_en_comun(1,2), [0])
+
+    def test_cargar_aristas_repetidas(self):
+
+        grafo = self.clase_grafo()
+        if grafo.adyacencias.diferida:
+            # Las repetidas se detectan al compactar (ver AdyacenciasCSR).
+            return
+        for i in xrange(4):
+            grafo.add_node()
+        grafo.connect(0,1)
+
+        # 1->0 no existe, pero 0->1 sí: no se agrega ninguna.
+        self.assertRaises(Exception, grafo.cargar_aristas, [2,1], [3,0],
+                both=True)
+        self.assertRaises(Exception, grafo.cargar_aristas, [2,2], [3,3])
+
+        self.assertEqual(grafo.cantidad_aristas, 1)
+        self.assertEqual([ sorted(grafo.ady(u)) for u in grafo.iternodes() ],
+                [[1], [], [], []])
+        self.assertFalse(grafo.conectados(2,3))
+        grafo.cargar_aristas([2], [3], pesos=[5], both=True)
+        self.assertEqual(list(grafo.ady_con_pesos(3)), [(2,5)])
+
+    def test_iter_conexiones_en_comun(self):
+
+        grafo = self.clase_grafo()
+
+        for i in xrange(7):
+            grafo.add_node()
+
+        grafo.connect(0,1,both=True)
+        grafo.connect(0,2,both=True)
+        grafo.connect(1,3,both=True)
+        grafo.connect(2,3,both=True)
+        grafo.connect(3,4,both=True)
+        grafo.connect(1,2,both=True)
+        grafo.connect(4,5,both=True)
+
+        for u, fila in grafo.iter_conexiones_en_comun():
+            esperada = []
+            for v in grafo.iternodes():
+                if u == v or grafo.conectados(u,v):
+                    continue
+                cantidad = len(grafo.conexiones_en_comun(u,v))
+                if cantidad > 0:
+                    esperada.append((v, cantidad))
+            self.assertEqual(sorted(fila), esperada)
+            self.assertEqual(
+                    sorted(grafo.contar_conexiones_en_comun(u).items()),
+                    esperada)
+
+    def test_caminos_minimos_por_origen(self):
+
+        grafo = self.clase_grafo()
+
+        for i in xrange(4):
+            grafo.add_node()
+
+        grafo.connect(0,1,both=True)
+        grafo.connect(1,2,both=True)
+        grafo.connect(0,3,both=True)
+        grafo.connect(3,2,both=True)
+
+        self.assertEqual(grafo.cantidad_caminos_minimos, {})
+
+        grafo.calcular_camino_minimo(0)
+        self.assertEqual(grafo.get_cantidad_caminos_minimos(0,2), 2)
+        self.assertEqual(len(grafo.get_recorridos(0,2)), 2)
+        self.assertEqual(grafo.cantidad_caminos_minimos.keys(), [0])
+
+        grafo.liberar_camino_minimo(0)
+        self.assertEqual(grafo.cantidad_caminos_minimos, {})
+        self.assertEqual(grafo.distancia, {})
+        self.assertEqual(grafo.padre, {})
+
     def validar_recorrido(self, grafo, u, v, recorridos_esperados):
         recorridos = grafo.get_recorridos(u,v)
         self.assertEqual(len(recorridos), len(recorridos_esperados))
         for r in recorridos:
             self.assertIn(r, recorridos_esperados)
 
+    def crear_rombos(self, cantidad_rombos):
+        """
+        Cadena de rombos: 2**cantidad_rombos caminos mínimos del primer
+        al último vértice.
+        """
+        grafo = self.clase_grafo()
+        grafo.add_node()
+        for i in xrange(cantidad_rombos):
+            inicio = grafo.cantidad_vertices - 1
+            arriba, abajo, fin = (grafo.add_node(), grafo.add_node(),
+                    grafo.add_node())
+            grafo.connect(inicio, arriba, both=True)
+            grafo.connect(inicio, abajo, both=True)
+            grafo.connect(arriba, fin, both=True)
+            grafo.connect(abajo, fin, both=True)
+        return grafo
+
+    def test_iter_recorridos(self):
+
+        grafo = self.crear_rombos(6)
+        ultimo = grafo.cantidad_vertices - 1
+        grafo.calcular_camino_minimo(0)
+
+        recorridos = list(grafo.iter_recorridos(0, ultimo))
+
+        self.assertEqual(len(recorridos), 2 ** 6)
+        self.assertEqual(len(set(map(tuple, recorridos))), 2 ** 6)
+        self.assertEqual(recorridos,
+                sorted(recorridos, key=lambda r: r[::-1]))
+        for recorrido in recorridos:
+            self.assertEqual(recorrido[0], 0)
+            self.assertEqual(recorrido[-1], ultimo)
+            for w, x in zip(recorrido, recorrido[1:]):
+                self.assertTrue(grafo.conectados(w, x))
+        for desde, limite in ((0, 5), (13, 7), (60, 10), (64, 1), (3, 0)):
+            self.assertEqual(
+                    list(grafo.iter_recorridos(0, ultimo, limite, desde)),
+                    recorridos[desde:desde+limite])
+        self.assertEqual(grafo.get_recorridos(0, ultimo), recorridos)
+        self.assertEqual(list(grafo.iter_recorridos(0, 0)), [[0]])
+
+        grafo.add_node()
+        grafo.calcular_camino_minimo(0)
+        self.assertEqual(list(grafo.iter_recorridos(0, ultimo + 1)), [])
+
+    def test_get_recorrido_aleatorio(self):
+
+        grafo = self.crear_rombos(3)
+        grafo.calcular_camino_minimo(0)
+        recorridos = grafo.get_recorridos(0, 9)
+        aleatorio = random.Random(11)
+
+        frecuencias = {}
+        for i in xrange(800):
+            recorrido = grafo.get_recorrido_aleatorio(0, 9, aleatorio)
+            self.assertIn(recorrido, recorridos)
+            frecuencias[tuple(recorrido)] = frecuencias.get(
+                    tuple(recorrido), 0) + 1
+
+        # Cada uno de los 8 caminos se espera 100 veces
+        self.assertEqual(len(frecuencias), 8)
+        self.assertTrue(all(60 < f < 140 for f in frecuencias.values()))
+        self.assertEqual(grafo.get_recorrido(0, 9)[0], 0)
+        self.assertIn(grafo.get_recorrido(9, 0), [ list(reversed(r))
+            for r in recorridos ])
+
     def test_recorridos(self):
  
         grafo = self.clase_grafo()
@@ -323,11 +524,1022 @@ class GrafoPesadoTestCase(GrafoPesoUnitarioTestCase):
                 [0,1,6,4,5],
                 grafo.get_recorrido(0,5))
 
+    def enumerar_caminos_minimos(self, grafo, u, v):
+        """
+        Todos los caminos de u a v de longitud mínima, por fuerza bruta
+        sobre los caminos simples.
+        """
+        distancia = grafo.get_distancia(u, v, intentar_al_reves=False)
+        caminos = []
+        pila = [([u], 0)]
+        while pila:
+            camino, longitud = pila.pop()
+            w = camino[-1]
+            if w == v:
+                if longitud == distancia:
+                    caminos.append(camino)
+                continue
+            for x, peso in grafo.ady_con_pesos(w):
+                if x not in camino and longitud + peso <= distancia:
+                    pila.append((camino + [x], longitud + peso))
+        return caminos
+
+    def test_recorridos_con_pesos(self):
+
+        aleatorio = random.Random(5)
+        for semilla in xrange(15):
+            generador = random.Random(semilla)
+            pesos = [ (w, x, generador.randint(1, 3))
+                    for w in xrange(8) for x in xrange(8)
+                    if w <> x and generador.random() < 0.35 ]
+            grafo = self.clase_grafo(cantidad_vertices=8, pesos=pesos)
+            for u in grafo.iternodes():
+                grafo.calcular_camino_minimo(u)
+            for u in grafo.iternodes():
+                for v in grafo.iternodes():
+                    if u == v or grafo.distancia[u][v] is None:
+                        continue
+                    recorridos = grafo.get_recorridos(u, v)
+                    esperados = self.enumerar_caminos_minimos(grafo, u, v)
+                    self.assertEqual(sorted(recorridos), sorted(esperados))
+                    self.assertEqual(
+                            grafo.get_cantidad_caminos_minimos(u, v),
+                            len(esperados))
+                    for desde in xrange(len(recorridos) + 1):
+                        for limite in (1, 2):
+                            self.assertEqual(list(grafo.iter_recorridos(
+                                u, v, limite, desde)),
+                                recorridos[desde:desde+limite])
+
+        # Muestreo uniforme en un par con caminos de distinta cantidad
+        # de aristas: 0-3 (peso 2), 0-1-3 y 0-2-3 (pesos 1+1).
+        grafo = self.clase_grafo(cantidad_vertices=4, pesos=[
+            (0,3,2), (0,1,1), (1,3,1), (0,2,1), (2,3,1), (1,2,1)])
+        grafo.calcular_camino_minimo(0)
+        self.assertEqual(len(grafo.get_recorridos(0, 3)), 3)
+        frecuencias = {}
+        for i in xrange(900):
+            recorrido = tuple(grafo.get_recorrido_aleatorio(0, 3, aleatorio))
+            frecuencias[recorrido] = frecuencias.get(recorrido, 0) + 1
+        # Cada uno de los 3 caminos se espera 300 veces
+        self.assertEqual(len(frecuencias), 3)
+        self.assertTrue(all(230 < f < 370 for f in frecuencias.values()))
 
     def __init__(self, *args, **kwargs):
         super(GrafoPesadoTestCase, self).__init__(*args,**kwargs)
         self.clase_grafo = GrafoPesado
 
 
+class InfluenciasTestCase(unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(InfluenciasTestCase, self).__init__(*args,**kwargs)
+        self.clase_grafo = GrafoPesoUnitario
+
+    def crear_grafo(self):
+
+        grafo = self.clase_grafo()
+
+        for i in xrange(14):
+            grafo.add_node()
+
+        grafo.connect(0,1,both=True)
+        grafo.connect(0,2,both=True)
+        grafo.connect(1,3,both=True)
+        grafo.connect(1,4,both=True)
+        grafo.connect(2,5,both=True)
+        grafo.connect(2,6,both=True)
+        grafo.connect(2,7,both=True)
+        grafo.connect(3,8,both=True)
+        grafo.connect(4,8,both=True)
+        grafo.connect(5,9,both=True)
+        grafo.connect(6,9,both=True)
+        grafo.connect(7,9,both=True)
+        grafo.connect(8,10,both=True)
+        grafo.connect(9,10,both=True)
+        grafo.connect(10,11,both=True)
+        grafo.connect(10,12,both=True)
+        grafo.connect(11,13,both=True)
+        grafo.connect(12,13,both=True)
+
+        return grafo
+
+    def calcular_influencias(self, **kwargs):
+        grafo = self.crear_grafo()
+        grafo.calcular_caminos_minimos()
+        grafo.calcular_influencias(**kwargs)
+        return [ grafo.get_influencia(u) for u in grafo.iternodes() ]
+
+    def test_influencias_sin_caminos_minimos(self):
+
+        grafo = self.clase_grafo()
+
+        for i in xrange(7):
+            grafo.add_node()
+
+        # Cuadrado 0-1-2-3 y camino 3-4-5; 6 aislado.
+        grafo.connect(0,1,both=True)
+        grafo.connect(1,2,both=True)
+        grafo.connect(2,3,both=True)
+        grafo.connect(3,0,both=True)
+        grafo.connect(3,4,both=True)
+        grafo.connect(4,5,both=True)
+
+        grafo.calcular_influencias()
+
+        self.assertEqual(grafo.distancia, {})
+        self.assertEqual(grafo.padre, {})
+        self.assertEqual(
+                [ grafo.get_influencia(u) for u in grafo.iternodes() ],
+                [3, 1, 3, 13, 8, 0, 0])
+
+    def test_influencias_por_definicion(self):
+
+        grafo = self.crear_grafo()
+        grafo.calcular_caminos_minimos()
+        esperadas = [0] * grafo.cantidad_vertices
+        for u in grafo.iternodes():
+            for v in grafo.iternodes():
+                cantidad_u_v = grafo.get_cantidad_caminos_minimos(u,v)
+                if u == v or cantidad_u_v == 0:
+                    continue
+                for w in grafo.iternodes():
+                    if w == u or w == v:
+                        continue
+                    esperadas[w] += float(
+                        grafo.get_cantidad_caminos_minimos_con_intermediario(
+                            u,w,v)) / cantidad_u_v
+
+        influencias = self.calcular_influencias()
+
+        for esperada, obtenida in zip(esperadas, influencias):
+            self.assertAlmostEqual(esperada, obtenida)
+
+    def test_influencias_aproximadas(self):
+
+        grafo = self.crear_grafo()
+        grafo.calcular_influencias()
+        exactas = list(grafo.influencias)
+
+        grafo = self.crear_grafo()
+        cota = grafo.calcular_influencias_aproximadas(0.5, semilla=3)
+        self.assertEqual(grafo.cantidad_muestras_influencias, 13)
+        self.assertTrue(cota > 0)
+        for exacta, aproximada in zip(exactas, grafo.influencias):
+            self.assertTrue(abs(exacta - aproximada) <= cota)
+
+        repetida = self.crear_grafo()
+        repetida.calcular_influencias_aproximadas(0.5, semilla=3, procesos=2)
+        for esperada, obtenida in zip(grafo.influencias, repetida.influencias):
+            self.assertAlmostEqual(esperada, obtenida)
+
+        grafo = self.crear_grafo()
+        self.assertEqual(grafo.calcular_influencias_aproximadas(0.1), 0)
+        for exacta, obtenida in zip(exactas, grafo.influencias):
+            self.assertAlmostEqual(exacta, obtenida)
+
+        self.assertRaises(ValueError,
+                grafo.calcular_influencias_aproximadas, 0.1, confianza=1)
+
+    def verificar_influencias(self, grafo):
+
+        copia = self.clase_grafo()
+        for u in grafo.iternodes():
+            copia.add_node()
+        for u in grafo.iternodes():
+            for v, peso in grafo.ady_con_pesos(u):
+                copia.connect(u, v, peso)
+        copia.calcular_influencias()
+
+        for u in grafo.iternodes():
+            self.assertAlmostEqual(
+                    grafo.get_influencia(u), copia.get_influencia(u))
+
+    def test_influencias_incrementales(self):
+
+        grafo = self.crear_grafo()
+        grafo.activar_influencias_incrementales()
+        self.verificar_influencias(grafo)
+
+        # 3 y 4 están a la misma distancia de 0, 1 y 8
+        grafo.connect(3,4,both=True)
+        self.verificar_influencias(grafo)
+        self.assertTrue(grafo.origenes_reprocesados < grafo.cantidad_vertices)
+
+        grafo.connect(0,13,both=True)
+        self.verificar_influencias(grafo)
+
+        grafo.disconnect(10,11,both=True)
+        self.verificar_influencias(grafo)
+
+        grafo.disconnect(9,10,both=True)
+        grafo.disconnect(8,10,both=True)
+        self.verificar_influencias(grafo)
+
+        u = grafo.add_node()
+        grafo.connect(u,13,both=True)
+        self.verificar_influencias(grafo)
+
+        grafo.cargar_aristas([u,u], [1,2], both=True)
+        self.verificar_influencias(grafo)
+
+        grafo.disconnect(5,9)
+        self.verificar_influencias(grafo)
+
+        self.assertRaises(Exception, grafo.disconnect, 5, 9)
+
+    def test_aristas_inexistentes_o_repetidas(self):
+
+        grafo = self.crear_grafo()
+        grafo.activar_influencias_incrementales()
+        grafo.connect(0, 13)
+        cantidad_aristas = grafo.cantidad_aristas
+        adyacentes = [ sorted(grafo.ady(u)) for u in grafo.iternodes() ]
+
+        # 0->13 existe pero 13->0 no: no se modifica ningún sentido.
+        self.assertRaises(Exception, grafo.disconnect, 0, 13, both=True)
+        self.assertRaises(Exception, grafo.connect, 13, 0, both=True)
+        self.assertRaises(Exception, grafo.connect, 0, 13)
+
+        self.assertEqual(grafo.cantidad_aristas, cantidad_aristas)
+        self.assertEqual([ sorted(grafo.ady(u)) for u in grafo.iternodes() ],
+                adyacentes)
+        self.verificar_influencias(grafo)
+
+        grafo.disconnect(0, 13)
+        self.verificar_influencias(grafo)
+
+    def test_influencias_repetidas(self):
+
+        grafo = self.crear_grafo()
+        grafo.calcular_influencias()
+        primeras = list(grafo.influencias)
+        grafo.calcular_influencias()
+
+        self.assertEqual(grafo.influencias, primeras)
+        self.assertEqual(self.calcular_influencias(procesos=2), primeras)
+
+    def test_influencias_paralelas(self):
+
+        esperadas = self.calcular_influencias()
+        influencias = self.calcular_influencias(procesos=1)
+
+        for esperada, obtenida in zip(esperadas, influencias):
+            self.assertAlmostEqual(esperada, obtenida)
+
+        for procesos in (2, 3):
+            self.assertEqual(
+                self.calcular_influencias(procesos=procesos), influencias)
+
+
+    def verificar_centralidades(self, grafo, **kwargs):
+
+        grafo.calcular_caminos_minimos()
+        grafo.calcular_centralidades(**kwargs)
+        centralidades = grafo.centralidades
+        esperadas = self.calcular_influencias()
+        caminos = grafo.get_cantidad_caminos_minimos
+
+        for u, esperada in zip(grafo.iternodes(), esperadas):
+            self.assertAlmostEqual(grafo.get_influencia(u), esperada)
+            distancias = [ d for v, d in enumerate(grafo.distancia[u])
+                    if d is not None and v <> u ]
+            self.assertEqual(centralidades.get_excentricidad(u),
+                    max(distancias or [0]))
+            self.assertAlmostEqual(centralidades.get_armonica(u),
+                    sum(1.0 / d for d in distancias))
+            self.assertAlmostEqual(centralidades.get_cercania(u),
+                    float(len(distancias)) / sum(distancias))
+
+        for v in grafo.iternodes():
+            for w, peso in grafo.ady_con_pesos(v):
+                esperada = 0.0
+                for s in grafo.iternodes():
+                    d = grafo.distancia[s]
+                    for t in grafo.iternodes():
+                        if s == t or d[v] is None or d[t] is None or \
+                                grafo.distancia[w][t] is None:
+                            continue
+                        if (d[v] + grafo._longitud_arista(peso) +
+                                grafo.distancia[w][t] == d[t]):
+                            esperada += float(caminos(s, v) *
+                                    caminos(w, t)) / caminos(s, t)
+                self.assertAlmostEqual(
+                        centralidades.get_influencia_arista(v, w), esperada)
+
+    def test_centralidades(self):
+
+        self.verificar_centralidades(self.crear_grafo())
+        self.verificar_centralidades(self.crear_grafo(), procesos=2)
+
+        grafo = self.crear_grafo()
+        grafo.calcular_centralidades(aristas=False)
+        self.assertEqual(grafo.centralidades.aristas, None)
+        self.assertAlmostEqual(grafo.centralidades.get_cercania(0),
+                13.0 / sum([1, 1, 2, 2, 2, 2, 2, 3, 3, 4, 5, 5, 6]))
+
+        grafo.calcular_centralidades()
+        no_dirigidas = grafo.centralidades.influencias_aristas(True)
+        self.assertEqual(len(no_dirigidas), grafo.cantidad_aristas)
+        self.assertAlmostEqual(no_dirigidas[10, 11],
+                grafo.centralidades.get_influencia_arista(10, 11) +
+                grafo.centralidades.get_influencia_arista(11, 10))
+
+    def verificar_biconexas(self, grafo, **kwargs):
+
+        grafo.calcular_influencias()
+        esperadas = list(grafo.influencias)
+        grafo.influencias = [0] * grafo.cantidad_vertices
+        grafo.calcular_influencias(biconexas=True, **kwargs)
+
+        self.assertEqual(len(grafo.influencias), len(esperadas))
+        for esperada, obtenida in zip(esperadas, grafo.influencias):
+            self.assertAlmostEqual(esperada, obtenida)
+
+    def test_influencias_biconexas(self):
+
+        self.verificar_biconexas(self.crear_grafo())
+        self.verificar_biconexas(self.crear_grafo(), procesos=2)
+
+        # Dos triángulos unidos por un camino, con árboles colgantes,
+        # un vértice aislado y una componente que es sólo una arista.
+        grafo = self.clase_grafo()
+        for i in xrange(14):
+            grafo.add_node()
+        grafo.cargar_aristas(
+                [0, 1, 2, 2, 3, 4, 5, 6, 4, 8, 8, 11, 0],
+                [1, 2, 0, 3, 4, 5, 6, 4, 8, 9, 10, 12, 13], both=True)
+        self.verificar_biconexas(grafo)
+        self.assertEqual(grafo.get_influencia(7), 0)
+
+        for generado in (barabasi_albert(60, 1, semilla=1),
+                barabasi_albert(60, 2, semilla=2),
+                erdos_renyi(80, 0.03, semilla=3), grilla(5, 6, semilla=4)):
+            self.verificar_biconexas(generado.crear(self.clase_grafo))
+
+    def test_influencias_biconexas_dirigido(self):
+
+        grafo = self.crear_grafo()
+        grafo.connect(13, 0)
+        self.verificar_biconexas(grafo)
+
+
+class GrafoPesoUnitarioCSRTestCase(GrafoPesoUnitarioTestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(GrafoPesoUnitarioCSRTestCase, self).__init__(*args,**kwargs)
+        self.clase_grafo = partial(GrafoPesoUnitario,
+                clase_adyacencias=AdyacenciasCSR)
+
+    def test_arista_repetida(self):
+
+        grafo = self.clase_grafo()
+
+        for i in xrange(3):
+            grafo.add_node()
+
+        grafo.connect(0,1)
+        grafo.connect(0,2)
+        grafo.connect(0,1)
+
+        self.assertRaises(Exception, grafo.conectados, 0, 1)
+
+
+class InfluenciasPesadoTestCase(InfluenciasTestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(InfluenciasPesadoTestCase, self).__init__(*args,**kwargs)
+        self.clase_grafo = GrafoPesado
+
+    def test_influencias_con_empates(self):
+
+        grafo = self.clase_grafo(cantidad_vertices=5, pesos=[
+            (0,1,1),
+            (1,3,2),
+            (0,2,2),
+            (2,3,1),
+            (3,4,1),
+            (0,4,5),
+            ])
+
+        grafo.calcular_influencias()
+
+        self.assertEqual(
+                [ grafo.get_influencia(u) for u in grafo.iternodes() ],
+                [0, 1, 1, 3, 0])
+
+    def test_influencias_incrementales_con_pesos(self):
+
+        grafo = self.clase_grafo(cantidad_vertices=7, pesos=[
+            (0,1,5),
+            (0,2,3),
+            (1,2,2),
+            (1,4,3),
+            (1,6,1),
+            (2,3,7),
+            (2,4,7),
+            (3,0,2),
+            (3,5,6),
+            (4,3,2),
+            (4,5,1),
+            (6,4,1),
+            ])
+        grafo.activar_influencias_incrementales()
+
+        grafo.connect(2,6,3)
+        self.verificar_influencias(grafo)
+        grafo.connect(5,0,1)
+        self.verificar_influencias(grafo)
+        grafo.disconnect(6,4)
+        self.verificar_influencias(grafo)
+        grafo.connect(0,5,20)
+        self.assertEqual(grafo.origenes_reprocesados, 0)
+        self.verificar_influencias(grafo)
+
+    def test_influencias_dirigidas(self):
+
+        grafo = self.clase_grafo(cantidad_vertices=7, pesos=[
+            (0,1,5),
+            (0,2,3),
+            (1,2,2),
+            (1,4,3),
+            (1,6,1),
+            (2,3,7),
+            (2,4,7),
+            (3,0,2),
+            (3,5,6),
+            (4,3,2),
+            (4,5,1),
+            (6,4,1),
+            ])
+
+        grafo.calcular_caminos_minimos()
+        esperadas = [0] * grafo.cantidad_vertices
+        for u in grafo.iternodes():
+            for v in grafo.iternodes():
+                if u == v:
+                    continue
+                cantidad_u_v = grafo.get_cantidad_caminos_minimos(u,v)
+                for w in grafo.iternodes():
+                    if w == u or w == v or cantidad_u_v == 0:
+                        continue
+                    esperadas[w] += float(
+                        grafo.get_cantidad_caminos_minimos_con_intermediario(
+                            u,w,v)) / cantidad_u_v
+
+        grafo.calcular_influencias()
+
+        for u in grafo.iternodes():
+            self.assertAlmostEqual(esperadas[u], grafo.get_influencia(u))
+
+
+class InfluenciasCSRTestCase(InfluenciasTestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(InfluenciasCSRTestCase, self).__init__(*args,**kwargs)
+        self.clase_grafo = partial(GrafoPesoUnitario,
+                clase_adyacencias=AdyacenciasCSR)
+
+
+class GrafoPesadoCSRTestCase(GrafoPesadoTestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(GrafoPesadoCSRTestCase, self).__init__(*args,**kwargs)
+        self.clase_grafo = partial(GrafoPesado,
+                clase_adyacencias=AdyacenciasCSR)
+
+    def test_pesos(self):
+
+        grafo = self.clase_grafo(cantidad_vertices=3, pesos=[
+            (0,2,3),
+            (0,1,1),
+            (1,2,0.5),
+            ])
+
+        self.assertEqual(sorted(grafo.ady_con_pesos(0)), [(1,1),(2,3)])
+        self.assertEqual(list(grafo.ady_con_pesos(1)), [(2,0.5)])
+        self.assertEqual(list(grafo.ady_con_pesos(2)), [])
+
+
+class GeneradoresTestCase(unittest.TestCase):
+
+    def verificar_aristas_simples(self, generado):
+        aristas = set()
+        for u, v in zip(generado.origenes, generado.destinos):
+            self.assertNotEqual(u, v)
+            self.assertTrue(0 <= u < generado.cantidad_vertices)
+            self.assertTrue(0 <= v < generado.cantidad_vertices)
+            aristas.add((min(u, v), max(u, v)))
+        self.assertEqual(len(aristas), len(generado))
+
+    def test_erdos_renyi(self):
+
+        generado = erdos_renyi(200, 0.05, semilla=1)
+
+        self.verificar_aristas_simples(generado)
+        self.assertEqual(list(generado.origenes),
+                list(erdos_renyi(200, 0.05, semilla=1).origenes))
+        # Se esperan 0.05*200*199/2 = 995 aristas
+        self.assertTrue(850 < len(generado) < 1150)
+        self.assertEqual(len(erdos_renyi(10, 1, semilla=1)), 45)
+        self.assertEqual(len(erdos_renyi(10, 0, semilla=1)), 0)
+
+    def test_barabasi_albert(self):
+
+        generado = barabasi_albert(300, 3, semilla=2)
+        grafo = generado.crear(GrafoPesoUnitario)
+
+        self.verificar_aristas_simples(generado)
+        self.assertEqual(len(generado), 6 + 3 * (300 - 4))
+        self.assertEqual(grafo.cantidad_aristas, len(generado))
+        grados = sorted(grafo.get_grado_salida(u) for u in grafo.iternodes())
+        self.assertEqual(grados[0], 3)
+        self.assertTrue(grados[-1] > 20)
+
+    def test_bloques_estocasticos(self):
+
+        generado = bloques_estocasticos([50, 50], 0.3, 0, semilla=3)
+
+        self.verificar_aristas_simples(generado)
+        for u, v in zip(generado.origenes, generado.destinos):
+            self.assertEqual(u // 50, v // 50)
+        self.assertEqual(
+                len(bloques_estocasticos([3, 4], 0, 1, semilla=3)), 12)
+        self.assertEqual(
+                len(bloques_estocasticos([3, 4], 1, 0, semilla=3)), 9)
+
+    def test_grilla(self):
+
+        generado = grilla(3, 4, peso_maximo=5, semilla=4)
+        grafo = generado.crear(GrafoPesado, clase_adyacencias=AdyacenciasCSR)
+
+        self.verificar_aristas_simples(generado)
+        self.assertEqual(len(generado), 3 * 3 + 2 * 4)
+        self.assertTrue(all(1 <= peso <= 5 for peso in generado.pesos))
+        self.assertEqual(sorted(grafo.ady(5)), [1, 4, 6, 9])
+
+
+class GrafoPesoUnitarioBitsTestCase(GrafoPesoUnitarioTestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(GrafoPesoUnitarioBitsTestCase, self).__init__(*args,**kwargs)
+        self.clase_grafo = partial(GrafoPesoUnitario,
+                clase_adyacencias=AdyacenciasBits)
+
+
+class InfluenciasBitsTestCase(InfluenciasTestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(InfluenciasBitsTestCase, self).__init__(*args,**kwargs)
+        self.clase_grafo = partial(GrafoPesoUnitario,
+                clase_adyacencias=AdyacenciasBits)
+
+
+class GrafoPesadoHeapIndexadoTestCase(GrafoPesadoTestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(GrafoPesadoHeapIndexadoTestCase, self).__init__(*args,**kwargs)
+        self.clase_grafo = partial(GrafoPesado, cola=HeapIndexado)
+
+
+class InfluenciasHeapIndexadoTestCase(InfluenciasPesadoTestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(InfluenciasHeapIndexadoTestCase, self).__init__(*args,**kwargs)
+        self.clase_grafo = partial(GrafoPesado,
+                cola=partial(HeapIndexado, aridad=3))
+
+
+class InfluenciasHeapBinarioTestCase(InfluenciasPesadoTestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(InfluenciasHeapBinarioTestCase, self).__init__(*args,**kwargs)
+        self.clase_grafo = partial(GrafoPesado, cola=HeapBinario)
+
+
+class ColasTestCase(unittest.TestCase):
+
+    def verificar_cola(self, crear_cola, peso_maximo):
+        """
+        Inserta y disminuye claves como Dijkstra (nunca por debajo de la
+        última extraída ni a más de peso_maximo de ella) y compara cada
+        extracción con el mínimo de las claves pendientes.
+        """
+        aleatorio = random.Random(7)
+        cola = crear_cola(50)
+        for recorrido in xrange(3):
+            claves = {}
+            ultima = 0
+            cola.insertar(0, 0)
+            claves[0] = 0
+            extraidos = set()
+            while cola:
+                self.assertEqual(len(cola), len(claves))
+                clave, v = cola.extraer()
+                self.assertEqual(clave, min(claves.values()))
+                self.assertEqual(claves.pop(v), clave)
+                extraidos.add(v)
+                ultima = clave
+                for w in aleatorio.sample(xrange(50), 5):
+                    if w in extraidos:
+                        continue
+                    nueva = ultima + aleatorio.randint(0, peso_maximo)
+                    if w not in claves:
+                        cola.insertar(w, nueva)
+                        claves[w] = nueva
+                    elif nueva < claves[w]:
+                        cola.disminuir(w, nueva)
+                        claves[w] = nueva
+            self.assertTrue(len(extraidos) > 1)
+
+    def test_heap_binario(self):
+
+        self.verificar_cola(HeapBinario, 10)
+
+    def test_heap_indexado(self):
+
+        for aridad in (2, 3, 4):
+            self.verificar_cola(partial(HeapIndexado, aridad=aridad), 10)
+
+    def test_cola_baldes(self):
+
+        for peso_maximo in (0, 1, 10):
+            self.verificar_cola(
+                    partial(ColaBaldes, peso_maximo=peso_maximo), peso_maximo)
+
+    def test_elegir_cola(self):
+
+        self.assertTrue(isinstance(elegir_cola([3, 0, 7])(5), ColaBaldes))
+        self.assertEqual(elegir_cola([3, 0, 7])(5).cantidad_baldes, 8)
+        self.assertEqual(elegir_cola([1, 0.5]), HeapBinario)
+        self.assertEqual(elegir_cola([1, 1000]), HeapBinario)
+
+        grafo = GrafoPesado(cantidad_vertices=3, pesos=[(0,1,2), (1,2,3)])
+        self.assertTrue(isinstance(grafo._crear_cola(), ColaBaldes))
+        grafo.connect(0, 2, 2.5)
+        self.assertTrue(isinstance(grafo._crear_cola(), HeapBinario))
+
+    def test_pesos_cero_y_empates(self):
+
+        pesos = [(0,1,0), (1,2,1), (0,3,0), (3,2,1), (2,4,2), (0,4,3)]
+        resultados = []
+        for cola in (None, HeapBinario, HeapIndexado):
+            grafo = GrafoPesado(cantidad_vertices=5, pesos=pesos, cola=cola)
+            grafo.calcular_influencias()
+            grafo.calcular_caminos_minimos()
+            resultados.append((
+                [ grafo.get_influencia(u) for u in grafo.iternodes() ],
+                [ grafo.get_distancia(0, v) for v in grafo.iternodes() ],
+                grafo.get_cantidad_caminos_minimos(0, 2)))
+        self.assertEqual(resultados[0][1], [0, 0, 1, 0, 3])
+        self.assertEqual(resultados[0][2], 2)
+        self.assertEqual(resultados[1], resultados[0])
+        self.assertEqual(resultados[2], resultados[0])
+
+
+class MatrizCaminosTestCase(unittest.TestCase):
+
+    def verificar_matriz(self, crear_grafo, simetrica, tipo, **kwargs):
+        """
+        Compara la matriz con los resultados de calcular_caminos_minimos
+        sobre otro grafo igual.
+        """
+        referencia = crear_grafo()
+        referencia.calcular_caminos_minimos()
+        grafo = crear_grafo()
+        grafo.calcular_matriz_caminos(**kwargs)
+        self.addCleanup(grafo.liberar_caminos_minimos)
+
+        self.assertEqual(grafo.matriz_caminos.simetrica, simetrica)
+        self.assertEqual(grafo.matriz_caminos.tipo_distancia, tipo)
+        self.assertEqual(grafo.distancia, {})
+        for u in grafo.iternodes():
+            for v in grafo.iternodes():
+                try:
+                    esperada = referencia.get_distancia(u, v,
+                            intentar_al_reves=False)
+                except CaminoInexistente:
+                    self.assertRaises(CaminoInexistente,
+                            grafo.get_distancia, u, v)
+                    self.assertEqual(
+                            grafo.get_cantidad_caminos_minimos(u, v), 0)
+                    continue
+                self.assertEqual(grafo.get_distancia(u, v), esperada)
+                self.assertEqual(grafo.get_cantidad_caminos_minimos(u, v),
+                        referencia.get_cantidad_caminos_minimos(u, v))
+
+    def test_no_dirigido(self):
+
+        generado = erdos_renyi(40, 0.08, semilla=3)
+        self.verificar_matriz(lambda: generado.crear(GrafoPesoUnitario),
+                True, 'H')
+        self.verificar_matriz(lambda: generado.crear(GrafoPesoUnitario,
+            clase_adyacencias=AdyacenciasCSR), True, 'H')
+
+    def test_dirigido_con_pesos(self):
+
+        pesos = [(0,1,5), (0,2,3), (1,2,2), (1,4,3), (1,6,1), (2,3,7),
+                (2,4,7), (3,0,2), (3,5,6), (4,3,2), (4,5,1), (6,4,1)]
+        self.verificar_matriz(
+                lambda: GrafoPesado(cantidad_vertices=8, pesos=pesos),
+                False, 'H')
+        reales = [ (u, v, peso + 0.5) for u, v, peso in pesos ]
+        self.verificar_matriz(
+                lambda: GrafoPesado(cantidad_vertices=8, pesos=reales),
+                False, 'd')
+
+    def test_pesos_asimetricos(self):
+
+        grafo = GrafoPesado(cantidad_vertices=3, pesos=[(0,1,1), (1,0,4),
+            (1,2,1), (2,1,1), (0,2,3), (2,0,3)])
+        self.assertTrue(grafo.es_simetrico())
+
+        grafo.calcular_matriz_caminos()
+
+        self.assertFalse(grafo.matriz_caminos.simetrica)
+        self.assertEqual(grafo.get_distancia(0, 2), 2)
+        self.assertEqual(grafo.get_distancia(1, 0), 4)
+        # 1-0 y 1-2-0
+        self.assertEqual(grafo.get_cantidad_caminos_minimos(1, 0), 2)
+        self.assertEqual(grafo.get_cantidad_caminos_minimos(0, 1), 1)
+
+    def test_desborde(self):
+
+        # 66 rombos seguidos: 2**66 caminos mínimos de punta a punta.
+        grafo = GrafoPesoUnitario()
+        anterior = grafo.add_node()
+        for i in xrange(66):
+            a = grafo.add_node()
+            b = grafo.add_node()
+            siguiente = grafo.add_node()
+            for medio in (a, b):
+                grafo.connect(anterior, medio, both=True)
+                grafo.connect(medio, siguiente, both=True)
+            anterior = siguiente
+
+        grafo.calcular_matriz_caminos()
+
+        self.assertEqual(grafo.get_cantidad_caminos_minimos(0, anterior),
+                2 ** 66)
+        self.assertEqual(grafo.get_cantidad_caminos_minimos(anterior, 0),
+                2 ** 66)
+        self.assertEqual(grafo.get_cantidad_caminos_minimos(0, 3), 2)
+        self.assertEqual(grafo.get_distancia(anterior, 0), 2 * 66)
+        self.assertTrue(all( cantidad >= 2 ** 64 - 1 for cantidad
+            in grafo.matriz_caminos.desbordes.itervalues() ))
+
+    def test_archivo_y_sin_cantidades(self):
+
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directorio)
+        archivo = os.path.join(directorio, 'matriz')
+        grafo = erdos_renyi(300, 0.02, semilla=1).crear(GrafoPesoUnitario)
+
+        grafo.calcular_matriz_caminos(archivo=archivo, cantidades=False)
+
+        # Triángulo superior de distancias de 16 bits.
+        self.assertEqual(os.path.getsize(archivo), 300 * 301 // 2 * 2)
+        self.assertEqual(grafo.get_distancia(7, 7), 0)
+        self.assertRaises(Exception, grafo.get_cantidad_caminos_minimos,
+                0, 1)
+        grafo.liberar_caminos_minimos()
+        self.assertEqual(grafo.matriz_caminos, None)
+
+    def test_tipo_distancias(self):
+
+        self.assertEqual(tipo_distancias(10, [1, 2]), 'H')
+        self.assertEqual(tipo_distancias(70000, [1]), 'I')
+        self.assertEqual(tipo_distancias(70000, [1 << 20]), 'l')
+        self.assertEqual(tipo_distancias(10, [1, 0.5]), 'd')
+        self.assertEqual(tipo_distancias(0, []), 'H')
+
+
+class AdyacenciasBitsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        generado = bloques_estocasticos([30, 30, 30], 0.5, 0.05, semilla=10)
+        self.bits = generado.crear(GrafoPesoUnitario,
+                clase_adyacencias=AdyacenciasBits)
+        self.listas = generado.crear(GrafoPesoUnitario)
+
+    def test_conexiones_en_comun(self):
+
+        for u in self.bits.iternodes():
+            self.assertEqual(self.bits.contar_conexiones_en_comun(u),
+                    self.listas.contar_conexiones_en_comun(u))
+            for v in xrange(0, self.bits.cantidad_vertices, 7):
+                self.assertEqual(self.bits.conectados(u, v),
+                        self.listas.conectados(u, v))
+                self.assertEqual(self.bits.conexiones_en_comun(u, v),
+                        self.listas.conexiones_en_comun(u, v))
+                self.assertEqual(self.bits.cantidad_conexiones_en_comun(u, v),
+                        len(self.listas.conexiones_en_comun(u, v)))
+        self.assertEqual(
+                sorted( (u, sorted(fila)) for u, fila in
+                    self.bits.iter_conexiones_en_comun() ),
+                sorted( (u, sorted(fila)) for u, fila in
+                    self.listas.iter_conexiones_en_comun() ))
+
+    def test_disconnect(self):
+
+        v = self.bits.ady(0)[0]
+        self.bits.disconnect(0, v, both=True)
+
+        self.assertFalse(self.bits.conectados(0, v))
+        self.assertFalse(self.bits.conectados(v, 0))
+        self.assertFalse(v in self.bits.ady(0))
+        self.bits.connect(0, v, both=True)
+        self.assertTrue(self.bits.conectados(v, 0))
+
+    def test_elegir_adyacencias(self):
+
+        self.assertEqual(elegir_adyacencias(100, 2 * 1000), AdyacenciasBits)
+        self.assertEqual(elegir_adyacencias(10000, 2 * 50000),
+                AdyacenciasCSR)
+        self.assertEqual(elegir_adyacencias(1, 0), AdyacenciasCSR)
+
+
+class RecorridoPorNivelesTestCase(unittest.TestCase):
+
+    def verificar_recorridos(self, generado):
+        generado.pesos = None
+        grafo = generado.crear(GrafoPesoUnitario)
+        referencia = generado.crear(GrafoPesado)
+
+        niveles_abajo_arriba = 0
+        for u in grafo.iternodes():
+            recorrido = grafo.recorrer_por_niveles(u, padres=True)
+            referencia.calcular_camino_minimo(u)
+            niveles_abajo_arriba += recorrido.niveles_abajo_arriba
+            for v in grafo.iternodes():
+                self.assertEqual(recorrido.distancia[v],
+                        referencia.distancia[u][v])
+                self.assertEqual(recorrido.padre[v],
+                        referencia.padre[u][v])
+            for distancia, nivel in enumerate(recorrido.niveles):
+                for v in nivel:
+                    self.assertEqual(recorrido.distancia[v], distancia)
+            self.assertEqual(
+                    [ recorrido.cantidad_caminos[v]
+                        for v in grafo.iternodes() ],
+                    [ sum(recorrido.cantidad_caminos[w]
+                        for w in recorrido.padre[v]) or int(v == u)
+                        for v in grafo.iternodes() ])
+        return niveles_abajo_arriba
+
+    def test_abajo_arriba(self):
+
+        self.assertTrue(self.verificar_recorridos(
+            barabasi_albert(80, 6, semilla=6)) > 0)
+
+    def test_grilla(self):
+
+        self.verificar_recorridos(grilla(6, 6, semilla=7))
+
+    def test_dirigido(self):
+
+        grafo = barabasi_albert(60, 6, semilla=8).crear(GrafoPesoUnitario)
+        self.assertTrue(grafo.es_simetrico())
+        grafo.add_node()
+        grafo.connect(60, 0)
+        self.assertFalse(grafo.es_simetrico())
+
+        recorrido = grafo.recorrer_por_niveles(60)
+
+        # Sin aristas de regreso no puede buscarse de abajo hacia arriba
+        self.assertEqual(recorrido.niveles_abajo_arriba, 0)
+        self.assertEqual(recorrido.distancia[0], 1)
+        self.assertEqual(grafo.recorrer_por_niveles(0).distancia[60], None)
+
+    def test_bfs(self):
+
+        grafo = barabasi_albert(80, 6, semilla=9).crear(GrafoPesoUnitario)
+        grafo.calcular_camino_minimo(3)
+
+        recorrido = grafo.bfs(3)
+
+        self.assertEqual(sorted(recorrido), range(80))
+        self.assertEqual(recorrido[0], 3)
+        distancias = [ grafo.get_distancia(3, v) for v in recorrido ]
+        self.assertEqual(distancias, sorted(distancias))
+
+
+class InstrumentacionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.instrumentacion = instrumentacion.activar()
+        self.addCleanup(instrumentacion.desactivar)
+
+    def crear_camino(self, clase_grafo, cantidad_vertices):
+        grafo = clase_grafo()
+        for u in xrange(cantidad_vertices):
+            grafo.add_node()
+        for u in xrange(cantidad_vertices - 1):
+            grafo.connect(u, u + 1, both=True)
+        return grafo
+
+    def test_contadores_anchura(self):
+
+        grafo = self.crear_camino(GrafoPesoUnitario, 4)
+
+        grafo.calcular_influencias()
+
+        self.assertEqual(self.instrumentacion.contadores, {
+            'origenes': 4,
+            'vertices_extraidos': 16,
+            'aristas_examinadas': 4 * 6,
+            })
+
+    def test_contadores_dijkstra(self):
+
+        grafo = self.crear_camino(GrafoPesado, 3)
+
+        grafo.calcular_influencias()
+
+        contadores = self.instrumentacion.contadores
+        self.assertEqual(contadores['origenes'], 3)
+        self.assertEqual(contadores['empujes_heap'], 9)
+        self.assertEqual(contadores['vertices_extraidos'], 9)
+        self.assertEqual(contadores['aristas_examinadas'], 3 * 4)
+
+    def test_contadores_caminos_minimos(self):
+
+        grafo = self.crear_camino(GrafoPesoUnitario, 4)
+        grafo.calcular_caminos_minimos()
+        contadores = self.instrumentacion.contadores
+        self.assertEqual(contadores['origenes'], 4)
+        self.assertEqual(contadores['vertices_extraidos'], 16)
+        # Algunos niveles se expanden de abajo hacia arriba: se examinan
+        # menos aristas que la suma de grados de cada recorrido.
+        self.assertTrue(0 < contadores['aristas_examinadas'] < 4 * 6)
+
+        self.instrumentacion.contadores.clear()
+        grafo = self.crear_camino(GrafoPesado, 3)
+        grafo.calcular_caminos_minimos()
+        self.assertEqual(self.instrumentacion.contadores, {
+            'origenes': 3,
+            'vertices_extraidos': 9,
+            'aristas_examinadas': 3 * 4,
+            'empujes_heap': 9,
+            })
+
+    def test_contadores_abajo_arriba(self):
+
+        grafo = barabasi_albert(80, 6, semilla=6).crear(GrafoPesoUnitario)
+
+        recorrido = grafo.recorrer_por_niveles(0, contar_caminos=False)
+
+        # De abajo hacia arriba cada vértice deja de examinar aristas al
+        # encontrar la frontera.
+        self.assertTrue(recorrido.niveles_abajo_arriba > 0)
+        contadores = self.instrumentacion.contadores
+        self.assertEqual(contadores['vertices_extraidos'], 80)
+        self.assertTrue(0 < contadores['aristas_examinadas'] <
+                sum(grafo.get_grado_salida(v) for v in grafo.iternodes()))
+
+    def test_contadores_procesos(self):
+
+        grafo = barabasi_albert(60, 2, semilla=5).crear(GrafoPesoUnitario)
+
+        grafo.calcular_influencias()
+        secuencial = dict(self.instrumentacion.contadores)
+        self.instrumentacion.contadores.clear()
+        grafo.calcular_influencias(procesos=2)
+
+        self.assertEqual(self.instrumentacion.contadores, secuencial)
+
+    def test_intersecciones(self):
+
+        grafo = self.crear_camino(GrafoPesoUnitario, 4)
+
+        list(grafo.iter_conexiones_en_comun())
+        grafo.contar_conexiones_en_comun(1)
+
+        # Grados 1, 2, 2, 1: Sum(u, Sum(w in ady(u), Aw)) = 2+3+3+2
+        self.assertEqual(self.instrumentacion.contadores,
+                {'intersecciones': 10 + 3})
+
+    def test_fases(self):
+
+        with instrumentacion.fase('carga'):
+            grafo = self.crear_camino(GrafoPesoUnitario, 10)
+        with instrumentacion.fase('influencias'):
+            grafo.calcular_influencias()
+        instrumentacion.desactivar()
+        with instrumentacion.fase('ignorada'):
+            pass
+
+        fases = self.instrumentacion.como_dict()['fases']
+        self.assertEqual([ fase['fase'] for fase in fases ],
+                ['carga', 'influencias'])
+        self.assertTrue(fases[0]['segundos'] >= 0)
+        self.assertTrue(fases[0]['incremento_memoria_kb'] >= 0)
+        self.assertTrue(fases[0]['memoria_maxima_proceso_kb'] > 0)
+        self.assertTrue(fases[1]['memoria_maxima_proceso_kb'] >=
+                fases[0]['memoria_maxima_proceso_kb'])
+        self.assertEqual(fases[0]['contadores'], {})
+        self.assertEqual(fases[1]['contadores']['origenes'], 10)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,406 @@
+#!/usr/bin/python
+# coding=utf-8
+
+from array import array
+from bisect import bisect_left
+from cStringIO import StringIO
+
+
+def empaquetar_textos(valores):
+    """
+    O(suma de las longitudes)
+    Devuelve los desplazamientos y el buffer con todos los textos
+    concatenados.
+    """
+    desplazamientos = array('l', [0])
+    for valor in valores:
+        desplazamientos.append(desplazamientos[-1] + len(valor))
+    return desplazamientos, ''.join(valores)
+
+
+class ColumnaTextos:
+    """
+    Textos guardados uno a continuación del otro en `buffer` (un str o
+    un mapa de memoria); el i-ésimo ocupa [desplazamientos[i],
+    desplazamientos[i+1]) a partir de `inicio`.
+    """
+
+    def __init__(self, buffer, inicio, desplazamientos):
+        self.buffer = buffer
+        self.inicio = inicio
+        self.desplazamientos = desplazamientos
+
+    def __len__(self):
+        return len(self.desplazamientos) - 1
+
+    def __getitem__(self, i):
+        """
+        O(longitud del texto)
+        """
+        return self.buffer[self.inicio + self.desplazamientos[i]:
+                self.inicio + self.desplazamientos[i+1]]
+
+
+def columna_textos(valores):
+    """
+    O(suma de las longitudes)
+    """
+    desplazamientos, buffer = empaquetar_textos(valores)
+    return ColumnaTextos(buffer, 0, desplazamientos)
+
+
+class AcumuladorTextos:
+    """
+    Arma una ColumnaTextos agregando los textos de a uno, sin guardar
+    un str por texto: se escriben en un único buffer y se anota su
+    desplazamiento.
+    """
+
+    def __init__(self):
+        self.desplazamientos = array('l', [0])
+        self.buffer = StringIO()
+        self.tamanio = 0
+
+    def __len__(self):
+        return len(self.desplazamientos) - 1
+
+    def agregar(self, texto):
+        """
+        O(len(texto)) amortizado
+        """
+        self.buffer.write(texto)
+        self.tamanio += len(texto)
+        self.desplazamientos.append(self.tamanio)
+
+    def columna(self):
+        """
+        O(suma de las longitudes)
+        """
+        return ColumnaTextos(self.buffer.getvalue(), 0, self.desplazamientos)
+
+
+class IdsDensos:
+    """
+    Ids consecutivos a partir de `base`.
+    """
+
+    def __init__(self, base, cantidad):
+        self.base = base
+        self.cantidad = cantidad
+
+    def __len__(self):
+        return self.cantidad
+
+    def __getitem__(self, u):
+        return self.base + u
+
+
+class IndiceIds:
+    """
+    Vértice correspondiente a cada id. Si los ids son consecutivos se
+    calcula con una resta; si no, se busca en los vértices ordenados por
+    id.
+    """
+
+    def __init__(self, ids, orden, base, cantidad, ids_ordenados=None):
+        """
+        ids_ordenados: si se indica, los ids en el orden de `orden` (por
+        ejemplo en un array), que se buscan con bisect.
+        """
+        self.ids = ids
+        self.orden = orden
+        self.base = base
+        self.cantidad = cantidad
+        self.ids_ordenados = ids_ordenados
+
+    def __len__(self):
+        return self.cantidad
+
+    def __contains__(self, id):
+        return self.get(id) is not None
+
+    def __getitem__(self, id):
+        u = self.get(id)
+        if u is None:
+            raise KeyError(id)
+        return u
+
+    def get(self, id, defecto=None):
+        """
+        O(1) si los ids son consecutivos, O(log(|V|)) si no.
+        """
+        if self.orden is None:
+            if isinstance(id, (int, long)) and (
+                    0 <= id - self.base < self.cantidad):
+                return id - self.base
+            return defecto
+        if self.ids_ordenados is not None:
+            desde = bisect_left(self.ids_ordenados, id)
+            if (desde < self.cantidad and
+                    self.ids_ordenados[desde] == id):
+                return self.orden[desde]
+            return defecto
+        desde, hasta = 0, self.cantidad
+        while desde < hasta:
+            medio = (desde + hasta) // 2
+            if self.ids[self.orden[medio]] < id:
+                desde = medio + 1
+            else:
+                hasta = medio
+        if desde < self.cantidad and self.ids[self.orden[desde]] == id:
+            return self.orden[desde]
+        return defecto
+
+    def buscador(self):
+        """
+        O(1)
+        Función equivalente a indice[id] para búsquedas repetidas (por
+        ejemplo, al leer las aristas): los valores que consulta quedan
+        en variables locales.
+        """
+        base = self.base
+        cantidad = self.cantidad
+        orden = self.orden
+        ids_ordenados = self.ids_ordenados
+        if orden is None:
+            def buscar(id):
+                if isinstance(id, (int, long)) and 0 <= id - base < cantidad:
+                    return id - base
+                raise KeyError(id)
+        elif ids_ordenados is not None:
+            def buscar(id):
+                i = bisect_left(ids_ordenados, id)
+                if i < cantidad and ids_ordenados[i] == id:
+                    return orden[i]
+                raise KeyError(id)
+        else:
+            buscar = self.__getitem__
+        return buscar
+
+
+def columna_ids(ids):
+    """
+    O(|V|)
+    Representación compacta de los ids: IdsDensos si son enteros
+    consecutivos, un arreglo de enteros si son enteros, una ColumnaTextos
+    si son textos y una lista en otro caso (ver AcumuladorIds).
+    """
+    acumulador = AcumuladorIds()
+    for id in ids:
+        acumulador.agregar(id)
+    return acumulador.columna()
+
+
+class AcumuladorIds:
+    """
+    Arma la columna de ids agregándolos de a uno: se guarda sólo el
+    primero mientras sean enteros consecutivos, luego un arreglo de
+    enteros o, si son textos, un AcumuladorTextos. Cualquier otro caso
+    pasa a una lista.
+    """
+
+    def __init__(self):
+        self.cantidad = 0
+        self.base = 0
+        # IdsDensos, array('l'), AcumuladorTextos o list.
+        self.valores = None
+
+    def __len__(self):
+        return self.cantidad
+
+    def agregar(self, id):
+        """
+        O(1) amortizado (O(|V|) al cambiar de representación)
+        """
+        valores = self.valores
+        if isinstance(valores, IdsDensos):
+            if isinstance(id, (int, long)) and id == self.base + self.cantidad:
+                valores.cantidad += 1
+                self.cantidad += 1
+                return
+            try:
+                valores = array('l', xrange(self.base,
+                    self.base + self.cantidad))
+            except OverflowError:
+                valores = [ self.base + u for u in xrange(self.cantidad) ]
+            self.valores = valores
+        elif valores is None:
+            if isinstance(id, (int, long)):
+                self.base = id
+                self.valores = IdsDensos(id, 1)
+                self.cantidad = 1
+                return
+            valores = self.valores = (AcumuladorTextos()
+                    if isinstance(id, str) else [])
+
+        if isinstance(valores, AcumuladorTextos):
+            if isinstance(id, str):
+                valores.agregar(id)
+                self.cantidad += 1
+                return
+            valores = self.valores = list(valores.columna())
+        elif isinstance(valores, array):
+            try:
+                if isinstance(id, (int, long)):
+                    valores.append(id)
+                    self.cantidad += 1
+                    return
+            except OverflowError:
+                pass
+            valores = self.valores = valores.tolist()
+        valores.append(id)
+        self.cantidad += 1
+
+    def columna(self):
+        """
+        O(|V|) si son textos, O(1) si no.
+        """
+        if self.valores is None:
+            return IdsDensos(0, 0)
+        if isinstance(self.valores, AcumuladorTextos):
+            return self.valores.columna()
+        return self.valores
+
+
+def indice_ids(ids):
+    """
+    O(|V|*log(|V|))
+    Si los ids son un arreglo de enteros, se guardan además ordenados
+    para buscarlos con bisect.
+    """
+    if isinstance(ids, IdsDensos):
+        return IndiceIds(ids, None, ids.base, len(ids))
+    orden = array('i', sorted(xrange(len(ids)), key=ids.__getitem__))
+    ids_ordenados = None
+    if isinstance(ids, array):
+        ids_ordenados = array(ids.typecode, (ids[u] for u in orden))
+    return IndiceIds(ids, orden, 0, len(ids), ids_ordenados)
+
+
+class TablaNodos:
+    """
+    Nodos guardados por columnas, sin un objeto por nodo: ids (ver
+    columna_ids), descripciones en un único buffer y el índice de
+    vértices por id. Como secuencia de node_data, cada nodo se crea con
+    crear_nodo(id, descripción) recién al accederlo.
+    """
+
+    def __init__(self, ids, descripciones, indice, crear_nodo):
+        """
+        O(1)
+        """
+        self.ids = ids
+        self.descripciones = descripciones
+        self.indice = indice
+        self.crear_nodo = crear_nodo
+
+    def __len__(self):
+        return len(self.descripciones)
+
+    def __getitem__(self, u):
+        """
+        O(longitud de la descripción)
+        """
+        return self.crear_nodo(self.ids[u], self.descripciones[u])
+
+    def get_id(self, u):
+        """
+        O(1)
+        """
+        return self.ids[u]
+
+    def get_descripcion(self, u):
+        """
+        O(longitud de la descripción)
+        """
+        return self.descripciones[u]
+
+    def get_vertice(self, id):
+        """
+        O(1) si los ids son consecutivos, O(log(|V|)) si no.
+        """
+        return self.indice[id]
+
+
+def crear_tabla_nodos(ids, descripciones, crear_nodo):
+    """
+    O(|V|*log(|V|)+suma de las longitudes de las descripciones)
+    """
+    ids = columna_ids(ids)
+    return TablaNodos(ids, columna_textos(descripciones), indice_ids(ids),
+            crear_nodo)
+
+
+import unittest
+
+
+class TablaNodosTestCase(unittest.TestCase):
+
+    def test_ids_densos(self):
+
+        tabla = crear_tabla_nodos([5, 6, 7], ['Ana', '', 'Nora'],
+                lambda id, descripcion: (id, descripcion))
+
+        self.assertTrue(isinstance(tabla.ids, IdsDensos))
+        self.assertEqual(tabla.descripciones.buffer, 'AnaNora')
+        self.assertEqual(len(tabla), 3)
+        self.assertEqual(tabla[2], (7, 'Nora'))
+        self.assertEqual(tabla.get_descripcion(1), '')
+        self.assertEqual(tabla.get_vertice(6), 1)
+        self.assertRaises(KeyError, tabla.get_vertice, 8)
+        self.assertRaises(KeyError, tabla.get_vertice, '6')
+
+    def test_ids_no_densos(self):
+
+        for ids in ([30, 10, 20], ['c', 'a', 'b'], [3.0, 1.0, 2.0]):
+            tabla = crear_tabla_nodos(ids, ['x', 'y', 'z'],
+                    lambda id, descripcion: (id, descripcion))
+
+            self.assertEqual([ tabla.get_id(u) for u in xrange(3) ], ids)
+            self.assertEqual(tabla[1], (ids[1], 'y'))
+            for u, id in enumerate(ids):
+                self.assertEqual(tabla.get_vertice(id), u)
+                self.assertTrue(id in tabla.indice)
+            self.assertEqual(tabla.indice.get(0), None)
+
+        self.assertEqual(columna_ids([30, 10]).typecode, 'l')
+        self.assertEqual(columna_ids([1 << 70, 1]), [1 << 70, 1])
+        self.assertTrue(isinstance(columna_ids(['a']), ColumnaTextos))
+
+    def test_acumuladores(self):
+
+        for ids in ([5, 6, 7], [5, 6, 9], [1, 2, 1 << 70], ['c', 'a'],
+                [1, 'a'], ['a', 1], [3.0, 1.0], []):
+            acumulador = AcumuladorIds()
+            for id in ids:
+                acumulador.agregar(id)
+            columna = acumulador.columna()
+
+            self.assertEqual(len(acumulador), len(ids))
+            self.assertEqual([ columna[u] for u in xrange(len(columna)) ],
+                    ids)
+            self.assertEqual(type(columna), type(columna_ids(ids)))
+            indice = indice_ids(columna)
+            buscar = indice.buscador()
+            for u, id in enumerate(ids):
+                self.assertEqual(buscar(id), u)
+                self.assertEqual(indice[id], u)
+            self.assertRaises(KeyError, buscar, 8)
+            self.assertRaises(KeyError, buscar, 'b')
+
+        textos = AcumuladorTextos()
+        for texto in ('Ana', '', 'Nora'):
+            textos.agregar(texto)
+        self.assertEqual(list(textos.columna()), ['Ana', '', 'Nora'])
+        self.assertEqual(textos.columna().buffer, 'AnaNora')
+
+    def test_vacia(self):
+
+        tabla = crear_tabla_nodos([], [], None)
+
+        self.assertEqual(len(tabla), 0)
+        self.assertFalse(1 in tabla.indice)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,426 @@
+#!/usr/bin/python
+# coding=utf-8
+
+import csv
+import json
+import sys
+from collections import OrderedDict
+
+# Cantidad de caracteres que se acumulan antes de escribir en el archivo.
+TAMANIO_BUFFER = 1 << 16
+
+SECCIONES = ('popularidad', 'influencias', 'recomendaciones',
+        'centralidades', 'influencias_aristas')
+
+COLUMNAS_CSV = ('archivo', 'seccion', 'id', 'descripcion', 'valor',
+        'id_destino', 'descripcion_destino', 'cercania', 'excentricidad')
+
+
+class Escritor:
+    """
+    Escribe un reporte a medida que se generan sus filas, acumulando el
+    texto en bloques de TAMANIO_BUFFER caracteres. Nunca se arma el
+    reporte completo en memoria.
+    Las filas de cada sección son:
+        popularidad: (grado, id, descripción)
+        influencias: (influencia, id, descripción)
+        recomendaciones: (id, descripción, id recomendado,
+        descripción recomendada, amigos en común)
+        centralidades: (centralidad armónica, id, descripción, cercanía,
+        excentricidad)
+        influencias_aristas: (influencia, id, descripción, id del otro
+        extremo, descripción del otro extremo)
+    """
+
+    def __init__(self, archivo=None, tamanio_buffer=TAMANIO_BUFFER):
+        """
+        O(1)
+        archivo: destino del reporte (por defecto la salida estándar).
+        """
+        self.archivo = sys.stdout if archivo is None else archivo
+        self.tamanio_buffer = tamanio_buffer
+        self.pendiente = []
+        self.tamanio_pendiente = 0
+        self.filepath = None
+        self.seccion = None
+
+    def write(self, texto):
+        """
+        O(len(texto)) amortizado
+        """
+        self.pendiente.append(texto)
+        self.tamanio_pendiente += len(texto)
+        if self.tamanio_pendiente >= self.tamanio_buffer:
+            self.vaciar()
+
+    def vaciar(self):
+        """
+        O(tamaño de lo pendiente)
+        """
+        if self.pendiente:
+            self.archivo.write(''.join(self.pendiente))
+            self.pendiente = []
+            self.tamanio_pendiente = 0
+        self.archivo.flush()
+
+    def encabezado(self):
+        """
+        Se escribe una única vez al comienzo de la salida, antes de los
+        reportes de todos los archivos.
+        """
+
+    def inicio_archivo(self, filepath):
+        self.filepath = filepath
+
+    def fin_archivo(self):
+        self.vaciar()
+
+    def inicio_seccion(self, seccion):
+        self.seccion = seccion
+
+    def fin_seccion(self):
+        self.seccion = None
+
+    def popularidad(self, filas):
+        """
+        Escribe las filas de popularidad. El escritor base las ignora,
+        igual que las de las demás secciones: cada formato redefine las
+        que escribe.
+        """
+
+    def influencias(self, filas):
+        """
+        Escribe las filas de influencias.
+        """
+
+    def aproximacion(self, muestras, cota, confianza):
+        """
+        Informa que las influencias se estimaron con `muestras` orígenes.
+        """
+
+    def recomendaciones(self, filas):
+        """
+        Escribe las filas de recomendaciones.
+        """
+
+    def centralidades(self, filas):
+        """
+        Escribe las filas de centralidades.
+        """
+
+    def influencias_aristas(self, filas):
+        """
+        Escribe las filas de influencias de aristas.
+        """
+
+
+class EscritorTexto(Escritor):
+    """
+    Formato legible del reporte original: los vértices de igual grado o
+    influencia se agrupan en una línea.
+    """
+
+    def _titulo(self, nombre):
+        self.write('-----------------%s-----------------\n' % nombre)
+
+    def _cierre(self):
+        self.write('-------------------------------------------\n\n')
+
+    def inicio_archivo(self, filepath):
+        Escritor.inicio_archivo(self, filepath)
+        self._titulo('Archivo %s' % filepath)
+
+    def fin_archivo(self):
+        self._cierre()
+        Escritor.fin_archivo(self)
+
+    def inicio_seccion(self, seccion):
+        Escritor.inicio_seccion(self, seccion)
+        self._titulo(seccion)
+
+    def fin_seccion(self):
+        self._cierre()
+        Escritor.fin_seccion(self)
+
+    def popularidad(self, filas):
+        """
+        O(cantidad de filas)
+        Una línea por grado con las descripciones de sus vértices, que se
+        escriben de a una.
+        """
+        grado_actual = None
+        for grado, _, descripcion in filas:
+            if grado == grado_actual:
+                self.write(', ')
+            else:
+                if grado_actual is not None:
+                    self.write(']\n')
+                grado_actual = grado
+                self.write('#%s: [' % grado)
+            self.write(repr(descripcion))
+        if grado_actual is not None:
+            self.write(']\n')
+
+    def influencias(self, filas):
+        """
+        O(cantidad de filas)
+        Una línea por valor de influencia con el conjunto de las
+        descripciones de sus vértices. Sólo se conserva el grupo actual.
+        """
+        influencia_actual = None
+        descripciones = None
+        for influencia, _, descripcion in filas:
+            if descripciones is None or influencia <> influencia_actual:
+                if descripciones is not None:
+                    self.write('%r\n' % ((influencia_actual, descripciones),))
+                influencia_actual = influencia
+                descripciones = set()
+            descripciones.add(descripcion)
+        if descripciones is not None:
+            self.write('%r\n' % ((influencia_actual, descripciones),))
+
+    def aproximacion(self, muestras, cota, confianza):
+        self.write('Aproximación con %s orígenes: error <= %s (confianza %s)\n'
+                % (muestras, cota, confianza))
+
+    def recomendaciones(self, filas):
+        """
+        O(cantidad de filas)
+        """
+        for _, persona, _, recomendacion, amigos_comun in filas:
+            self.write('%s: %s (%s amigo(s) en común)\n' % (
+                persona, recomendacion, amigos_comun))
+
+    def centralidades(self, filas):
+        """
+        O(cantidad de filas)
+        """
+        for armonica, _, descripcion, cercania, excentricidad in filas:
+            self.write('%s: armónica %r, cercanía %r, excentricidad %s\n' % (
+                descripcion, armonica, cercania, excentricidad))
+
+    def influencias_aristas(self, filas):
+        """
+        O(cantidad de filas)
+        """
+        for influencia, _, descripcion, _, descripcion_destino in filas:
+            self.write('%s - %s: %r\n' % (descripcion, descripcion_destino,
+                influencia))
+
+
+class EscritorCSV(Escritor):
+    """
+    Una fila por vértice, recomendación o arista con las columnas
+    COLUMNAS_CSV. valor es el grado, la influencia, la cantidad de amigos
+    en común o la centralidad armónica según la sección; el destino es el
+    vértice recomendado o el otro extremo de la arista. La aproximación
+    de las influencias no se informa.
+    """
+
+    def __init__(self, *args, **kwargs):
+        Escritor.__init__(self, *args, **kwargs)
+        self.csv = csv.writer(self, lineterminator='\n')
+
+    def encabezado(self):
+        self.csv.writerow(COLUMNAS_CSV)
+
+    def popularidad(self, filas):
+        """
+        O(cantidad de filas)
+        """
+        for grado, id, descripcion in filas:
+            self.csv.writerow((self.filepath, self.seccion, id, descripcion,
+                grado, '', '', '', ''))
+
+    def influencias(self, filas):
+        """
+        O(cantidad de filas)
+        """
+        for influencia, id, descripcion in filas:
+            self.csv.writerow((self.filepath, self.seccion, id, descripcion,
+                repr(influencia), '', '', '', ''))
+
+    def recomendaciones(self, filas):
+        """
+        O(cantidad de filas)
+        """
+        for id, descripcion, recomendado, descripcion_recomendado, \
+                amigos_comun in filas:
+            self.csv.writerow((self.filepath, self.seccion, id, descripcion,
+                amigos_comun, recomendado, descripcion_recomendado, '', ''))
+
+    def centralidades(self, filas):
+        """
+        O(cantidad de filas)
+        """
+        for armonica, id, descripcion, cercania, excentricidad in filas:
+            self.csv.writerow((self.filepath, self.seccion, id, descripcion,
+                repr(armonica), '', '', repr(cercania), excentricidad))
+
+    def influencias_aristas(self, filas):
+        """
+        O(cantidad de filas)
+        """
+        for influencia, id, descripcion, destino, descripcion_destino \
+                in filas:
+            self.csv.writerow((self.filepath, self.seccion, id, descripcion,
+                repr(influencia), destino, descripcion_destino, '', ''))
+
+
+class EscritorJSONL(Escritor):
+    """
+    Un objeto JSON por línea, con el archivo, la sección y los campos de
+    cada fila.
+    """
+
+    def _objeto(self, *campos):
+        self.write(json.dumps(OrderedDict((('archivo', self.filepath),
+            ('seccion', self.seccion)) + campos)) + '\n')
+
+    def popularidad(self, filas):
+        """
+        O(cantidad de filas)
+        """
+        for grado, id, descripcion in filas:
+            self._objeto(('id', id), ('descripcion', descripcion),
+                    ('grado', grado))
+
+    def influencias(self, filas):
+        """
+        O(cantidad de filas)
+        """
+        for influencia, id, descripcion in filas:
+            self._objeto(('id', id), ('descripcion', descripcion),
+                    ('influencia', influencia))
+
+    def aproximacion(self, muestras, cota, confianza):
+        self._objeto(('muestras', muestras), ('cota_error', cota),
+                ('confianza', confianza))
+
+    def recomendaciones(self, filas):
+        """
+        O(cantidad de filas)
+        """
+        for id, descripcion, recomendado, descripcion_recomendado, \
+                amigos_comun in filas:
+            self._objeto(('id', id), ('descripcion', descripcion),
+                    ('id_recomendado', recomendado),
+                    ('descripcion_recomendado', descripcion_recomendado),
+                    ('amigos_en_comun', amigos_comun))
+
+    def centralidades(self, filas):
+        """
+        O(cantidad de filas)
+        """
+        for armonica, id, descripcion, cercania, excentricidad in filas:
+            self._objeto(('id', id), ('descripcion', descripcion),
+                    ('armonica', armonica), ('cercania', cercania),
+                    ('excentricidad', excentricidad))
+
+    def influencias_aristas(self, filas):
+        """
+        O(cantidad de filas)
+        """
+        for influencia, id, descripcion, destino, descripcion_destino \
+                in filas:
+            self._objeto(('id', id), ('descripcion', descripcion),
+                    ('id_destino', destino),
+                    ('descripcion_destino', descripcion_destino),
+                    ('influencia', influencia))
+
+
+ESCRITORES = OrderedDict([
+    ('texto', EscritorTexto),
+    ('csv', EscritorCSV),
+    ('jsonl', EscritorJSONL),
+    ])
+
+
+def crear_escritor(formato, *args, **kwargs):
+    """
+    O(1)
+    """
+    if formato not in ESCRITORES:
+        raise Exception('Formato desconocido: %s.' % formato)
+    return ESCRITORES[formato](*args, **kwargs)
+
+
+from StringIO import StringIO
+import unittest
+
+
+class EscritoresTestCase(unittest.TestCase):
+
+    def escribir(self, formato, tamanio_buffer=TAMANIO_BUFFER):
+        archivo = StringIO()
+        escritor = crear_escritor(formato, archivo, tamanio_buffer)
+        escritor.encabezado()
+        escritor.inicio_archivo('a.gdf')
+        escritor.inicio_seccion('popularidad')
+        escritor.popularidad(iter([(2, 1, 'Ana'), (2, 3, 'Juan'),
+            (1, 2, 'Perez, Nora')]))
+        escritor.fin_seccion()
+        escritor.inicio_seccion('influencias')
+        escritor.influencias(iter([(1.5, 1, 'Ana'), (0.0, 2, 'Nora'),
+            (0.0, 3, 'Juan')]))
+        escritor.aproximacion(2, 0.25, 0.95)
+        escritor.fin_seccion()
+        escritor.inicio_seccion('recomendaciones')
+        escritor.recomendaciones(iter([(2, 'Nora', 3, 'Juan', 1)]))
+        escritor.fin_seccion()
+        escritor.fin_archivo()
+        return archivo.getvalue()
+
+    def test_texto(self):
+
+        texto = self.escribir('texto')
+
+        self.assertEqual(texto, self.escribir('texto', tamanio_buffer=1))
+        self.assertIn("#2: ['Ana', 'Juan']\n#1: ['Perez, Nora']\n", texto)
+        self.assertIn("(1.5, set(['Ana']))\n(0.0, set([", texto)
+        self.assertIn('Nora: Juan (1 amigo(s) en común)\n', texto)
+        self.assertTrue(texto.startswith('-----------------Archivo a.gdf'))
+
+    def test_csv(self):
+
+        filas = list(csv.reader(StringIO(self.escribir('csv'))))
+
+        self.assertEqual(filas[0], list(COLUMNAS_CSV))
+        self.assertEqual(filas[3], ['a.gdf', 'popularidad', '2',
+            'Perez, Nora', '1', '', '', '', ''])
+        self.assertEqual(filas[4][4], '1.5')
+        self.assertEqual(filas[-1], ['a.gdf', 'recomendaciones', '2', 'Nora',
+            '1', '3', 'Juan', '', ''])
+        self.assertEqual(len(filas), 8)
+
+    def test_jsonl(self):
+
+        objetos = [ json.loads(linea)
+                for linea in self.escribir('jsonl').splitlines() ]
+
+        self.assertEqual(len(objetos), 8)
+        self.assertEqual(objetos[0], {'archivo': 'a.gdf',
+            'seccion': 'popularidad', 'id': 1, 'descripcion': 'Ana',
+            'grado': 2})
+        self.assertEqual(objetos[6]['cota_error'], 0.25)
+        self.assertEqual(objetos[7]['amigos_en_comun'], 1)
+
+    def test_escritor_base(self):
+
+        archivo = StringIO()
+        escritor = Escritor(archivo)
+        escritor.inicio_seccion('popularidad')
+        escritor.popularidad(iter([(2, 1, 'Ana')]))
+        escritor.centralidades(iter([]))
+        escritor.fin_seccion()
+        escritor.fin_archivo()
+
+        self.assertEqual(archivo.getvalue(), '')
+
+    def test_formato_desconocido(self):
+
+        self.assertRaises(Exception, crear_escritor, 'xml')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,398 @@
+#!/usr/bin/python
+# coding=utf-8
+
+import BaseHTTPServer
+import SocketServer
+import argparse
+import json
+import os
+import sys
+import urlparse
+from collections import OrderedDict
+from grafo import CaminoInexistente
+from tp1 import TP1
+
+TIPOS_CONSULTA = ('popularidad', 'influencia', 'recomendaciones',
+        'distancia', 'caminos', 'recorridos')
+
+# Cantidad de recorridos que se devuelven si la consulta no indica límite.
+LIMITE_RECORRIDOS = 10
+
+
+class CacheLRU:
+    """
+    Diccionario acotado que descarta el elemento usado hace más tiempo.
+    """
+
+    def __init__(self, capacidad, al_descartar=None):
+        self.capacidad = capacidad
+        self.al_descartar = al_descartar
+        self.elementos = OrderedDict()
+
+    def __len__(self):
+        return len(self.elementos)
+
+    def __contains__(self, clave):
+        return clave in self.elementos
+
+    def get(self, clave, defecto=None):
+        """
+        O(1)
+        """
+        if clave not in self.elementos:
+            return defecto
+        valor = self.elementos.pop(clave)
+        self.elementos[clave] = valor
+        return valor
+
+    def put(self, clave, valor):
+        """
+        O(1)
+        """
+        self.elementos.pop(clave, None)
+        self.elementos[clave] = valor
+        while len(self.elementos) > self.capacidad:
+            descartada, valor = self.elementos.popitem(last=False)
+            if self.al_descartar is not None:
+                self.al_descartar(descartada, valor)
+
+
+class ConsultaInvalida(Exception):
+    pass
+
+
+class ServicioConsultas:
+    """
+    Responde consultas sobre un grafo cargado una única vez. Las
+    respuestas se guardan en una caché LRU y los caminos mínimos se
+    calculan por origen a medida que se consultan, conservando a lo sumo
+    `origenes_en_memoria` orígenes.
+    Las consultas son diccionarios con una clave 'tipo' y los ids externos
+    de los nodos:
+        {'tipo': 'popularidad', 'id': X}
+        {'tipo': 'influencia', 'id': X}
+        {'tipo': 'recomendaciones', 'id': X, 'k': 10}
+        {'tipo': 'distancia', 'desde': X, 'hasta': Y}
+        {'tipo': 'caminos', 'desde': X, 'hasta': Y}
+        {'tipo': 'recorridos', 'desde': X, 'hasta': Y, 'limite': 10,
+            'saltear': 0}
+    """
+
+    def __init__(self, tp1, tamanio_cache=100000, origenes_en_memoria=64):
+        self.tp1 = tp1
+        self.grafo = tp1.grafo
+        self.cache = CacheLRU(tamanio_cache)
+        self.origenes = CacheLRU(origenes_en_memoria,
+                lambda u, _: self.grafo.liberar_camino_minimo(u))
+        self.influencias = None
+
+    def _vertice(self, id):
+        """
+        O(1) (O(log(|V|)) para snapshots con ids no consecutivos)
+        Los ids pueden llegar como texto desde la url.
+        """
+        indice = self.tp1.vertice_from_id
+        if id in indice:
+            return indice[id]
+        try:
+            entero = int(id)
+        except (TypeError, ValueError):
+            entero = None
+        if entero is not None and entero in indice:
+            return indice[entero]
+        raise ConsultaInvalida('No existe el nodo %s.' % id)
+
+    def _nodo(self, u):
+        """
+        O(1)
+        """
+        nodo = self.grafo.get_node_data(u)
+        return {'id': nodo.id, 'descripcion': nodo.description}
+
+    def _origen(self, u):
+        """
+        O(1) si u está en memoria, O(|V|+|E|) si no.
+        """
+        if u not in self.origenes:
+            self.grafo.calcular_camino_minimo(u)
+        self.origenes.put(u, True)
+
+    def _popularidad(self, consulta):
+        return self.grafo.get_grado_salida(self._vertice(consulta['id']))
+
+    def _influencia(self, consulta):
+        u = self._vertice(consulta['id'])
+        if self.influencias is None:
+            # O(|V|*(|V|+|E|)) una única vez
+            self.influencias = self.tp1.get_influencias()
+        return self.influencias[u]
+
+    def _recomendaciones(self, consulta):
+        u = self._vertice(consulta['id'])
+        k = consulta.get('k', 10)
+        k = None if k is None else int(k)
+        respuesta = []
+        for v, amigos_comun in self.tp1.mejores_recomendaciones_para(u, k):
+            recomendacion = self._nodo(v)
+            recomendacion['amigos_en_comun'] = amigos_comun
+            respuesta.append(recomendacion)
+        return respuesta
+
+    def _distancia(self, consulta):
+        u = self._vertice(consulta['desde'])
+        v = self._vertice(consulta['hasta'])
+        self._origen(u)
+        try:
+            return self.grafo.get_distancia(u, v)
+        except CaminoInexistente:
+            return None
+
+    def _caminos(self, consulta):
+        u = self._vertice(consulta['desde'])
+        v = self._vertice(consulta['hasta'])
+        self._origen(u)
+        return self.grafo.get_cantidad_caminos_minimos(u, v)
+
+    def _recorridos(self, consulta):
+        u = self._vertice(consulta['desde'])
+        v = self._vertice(consulta['hasta'])
+        self._origen(u)
+        ids = self.tp1.grafo.get_node_data
+        return [ [ ids(w).id for w in recorrido ] for recorrido in
+                self.grafo.iter_recorridos(u, v,
+                    int(consulta.get('limite', LIMITE_RECORRIDOS)),
+                    int(consulta.get('saltear', 0))) ]
+
+    def consultar(self, consulta):
+        """
+        O(1) si la respuesta está en caché.
+        Devuelve {'resultado': ...} o {'error': ...}.
+        """
+        if not isinstance(consulta, dict):
+            return {'error': 'Se esperaba un objeto de consulta.'}
+        tipo = consulta.get('tipo')
+        if tipo not in TIPOS_CONSULTA:
+            return {'error': 'Tipo de consulta desconocido: %s.' % tipo}
+        clave = tuple(sorted((k, str(v)) for k, v in consulta.iteritems()))
+        respuesta = self.cache.get(clave)
+        if respuesta is None:
+            try:
+                respuesta = {'resultado': getattr(self, '_' + tipo)(consulta)}
+            except (ConsultaInvalida, KeyError, ValueError), e:
+                return {'error': str(e)}
+            self.cache.put(clave, respuesta)
+        return respuesta
+
+    def consultar_lote(self, consultas):
+        """
+        Responde un lote de consultas en el orden recibido. Se procesan
+        agrupadas por origen para calcular cada camino mínimo una sola
+        vez por lote. Los elementos que no son objetos reciben un error
+        en su posición.
+        """
+        orden = sorted(xrange(len(consultas)),
+                key=lambda i: str(consultas[i].get('desde'))
+                if isinstance(consultas[i], dict) else '')
+        respuestas = [None] * len(consultas)
+        for i in orden:
+            respuestas[i] = self.consultar(consultas[i])
+        return respuestas
+
+
+class ManejadorConsultas(BaseHTTPServer.BaseHTTPRequestHandler):
+    """
+    GET /<tipo>?parametros responde una consulta.
+    POST /consultas con un arreglo JSON de consultas responde un lote.
+    """
+
+    def address_string(self):
+        if isinstance(self.client_address, tuple):
+            return BaseHTTPServer.BaseHTTPRequestHandler.address_string(self)
+        return 'unix'
+
+    def log_message(self, formato, *args):
+        if self.server.verboso:
+            BaseHTTPServer.BaseHTTPRequestHandler.log_message(
+                    self, formato, *args)
+
+    def responder(self, codigo, contenido):
+        cuerpo = json.dumps(contenido)
+        self.send_response(codigo)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def do_GET(self):
+        url = urlparse.urlparse(self.path)
+        consulta = dict( (k, v[-1]) for k, v in
+                urlparse.parse_qs(url.query).iteritems() )
+        consulta['tipo'] = url.path.strip('/')
+        respuesta = self.server.servicio.consultar(consulta)
+        self.responder(400 if 'error' in respuesta else 200, respuesta)
+
+    def do_POST(self):
+        if self.path.rstrip('/') <> '/consultas':
+            self.responder(404, {'error': 'Ruta inexistente.'})
+            return
+        try:
+            largo = int(self.headers.getheader('Content-Length', 0))
+            consultas = json.loads(self.rfile.read(largo))
+            if not isinstance(consultas, list):
+                raise ValueError('Se esperaba un arreglo de consultas.')
+        except ValueError, e:
+            self.responder(400, {'error': str(e)})
+            return
+        self.responder(200, self.server.servicio.consultar_lote(consultas))
+
+
+class ServidorConsultas(BaseHTTPServer.HTTPServer):
+
+    def __init__(self, direccion, servicio, verboso=False):
+        BaseHTTPServer.HTTPServer.__init__(
+                self, direccion, ManejadorConsultas)
+        self.servicio = servicio
+        self.verboso = verboso
+
+
+class ServidorConsultasUnix(SocketServer.UnixStreamServer):
+
+    def __init__(self, ruta, servicio, verboso=False):
+        SocketServer.UnixStreamServer.__init__(
+                self, ruta, ManejadorConsultas)
+        self.servicio = servicio
+        self.verboso = verboso
+
+
+def servir():
+    parser = argparse.ArgumentParser(
+            description='Responde consultas sobre un grafo por HTTP.')
+    parser.add_argument('archivo', metavar='archivo_gdf',
+            help='Archivo gdf o snapshot.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8000)
+    parser.add_argument('--unix', default=None, metavar='RUTA',
+            help='Escucha en un socket Unix en lugar de TCP.')
+    parser.add_argument('--cache', type=int, default=100000,
+            help='Cantidad de respuestas que se conservan.')
+    parser.add_argument('--origenes', type=int, default=64,
+            help='Cantidad de orígenes cuyos caminos mínimos se conservan.')
+    parser.add_argument('--verboso', action='store_true')
+    args = parser.parse_args()
+
+    servicio = ServicioConsultas(TP1(args.archivo),
+            tamanio_cache=args.cache, origenes_en_memoria=args.origenes)
+    if args.unix is not None:
+        if os.path.exists(args.unix):
+            os.remove(args.unix)
+        servidor = ServidorConsultasUnix(args.unix, servicio, args.verboso)
+    else:
+        servidor = ServidorConsultas((args.host, args.puerto), servicio,
+                args.verboso)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+import threading
+import unittest
+import urllib2
+
+
+class ServicioConsultasTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tp1 = TP1('ejemplo_enunciado.gdf')
+        self.servicio = ServicioConsultas(self.tp1, origenes_en_memoria=2)
+
+    def resultado(self, **consulta):
+        return self.servicio.consultar(consulta)['resultado']
+
+    def test_consultas(self):
+
+        self.assertEqual(self.resultado(tipo='popularidad', id=4), 5)
+        self.assertEqual(self.resultado(tipo='popularidad', id='11'), 1)
+        self.assertAlmostEqual(self.resultado(tipo='influencia', id=4),
+                32.333333333)
+        self.assertEqual(self.resultado(tipo='distancia', desde=11, hasta=3),
+                3)
+        self.assertEqual(self.resultado(tipo='caminos', desde=1, hasta=6),
+                2)
+        self.assertEqual(
+                self.resultado(tipo='recorridos', desde=1, hasta=6),
+                [[1, 2, 6], [1, 3, 6]])
+        self.assertEqual(self.resultado(tipo='recorridos', desde=1, hasta=6,
+            limite=5, saltear=1), [[1, 3, 6]])
+        self.assertEqual(
+                self.resultado(tipo='recomendaciones', id=3, k=1),
+                [{'id': 2, 'descripcion': 'Milena', 'amigos_en_comun': 2}])
+
+    def test_errores(self):
+
+        self.assertIn('error', self.servicio.consultar({'tipo': 'otro'}))
+        self.assertIn('error',
+                self.servicio.consultar({'tipo': 'popularidad', 'id': 99}))
+        self.assertIn('error',
+                self.servicio.consultar({'tipo': 'distancia', 'desde': 1}))
+
+    def test_cache(self):
+
+        self.resultado(tipo='distancia', desde=1, hasta=11)
+        self.resultado(tipo='distancia', desde=2, hasta=11)
+        self.resultado(tipo='distancia', desde=3, hasta=11)
+
+        # Sólo se conservan los caminos mínimos de dos orígenes
+        self.assertEqual(sorted(self.tp1.grafo.distancia.keys()), [1, 2])
+        self.assertEqual(len(self.servicio.cache), 3)
+        self.assertEqual(self.resultado(tipo='distancia', desde=1, hasta=11),
+                2)
+
+    def test_lote(self):
+
+        respuestas = self.servicio.consultar_lote([
+            {'tipo': 'distancia', 'desde': 8, 'hasta': 9},
+            {'tipo': 'popularidad', 'id': 1},
+            {'tipo': 'distancia', 'desde': 1, 'hasta': 9},
+            {'tipo': 'caminos', 'desde': 8, 'hasta': 9},
+            ])
+
+        self.assertEqual([ r['resultado'] for r in respuestas ], [2, 5, 2, 1])
+
+        respuestas = self.servicio.consultar_lote([1, None, [],
+            {'tipo': 'popularidad', 'id': 1}])
+
+        self.assertEqual([ 'error' in r for r in respuestas ],
+                [True, True, True, False])
+
+    def test_http(self):
+
+        servidor = ServidorConsultas(('127.0.0.1', 0), self.servicio)
+        hilo = threading.Thread(target=servidor.serve_forever)
+        hilo.daemon = True
+        hilo.start()
+        self.addCleanup(servidor.server_close)
+        self.addCleanup(servidor.shutdown)
+        url = 'http://127.0.0.1:%s' % servidor.server_address[1]
+
+        respuesta = json.load(urllib2.urlopen(url + '/popularidad?id=4'))
+        self.assertEqual(respuesta, {'resultado': 5})
+
+        pedido = urllib2.Request(url + '/consultas', json.dumps([
+            {'tipo': 'distancia', 'desde': 11, 'hasta': 3},
+            {'tipo': 'popularidad', 'id': 99},
+            1,
+            ]))
+        respuesta = json.load(urllib2.urlopen(pedido))
+        self.assertEqual(respuesta[0], {'resultado': 3})
+        self.assertIn('error', respuesta[1])
+        self.assertIn('error', respuesta[2])
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 1:
+        unittest.main()
+    else:
+        servir()
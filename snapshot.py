@@ -0,0 +1,213 @@
+#!/usr/bin/python
+# coding=utf-8
+
+import ctypes
+import mmap
+import struct
+from array import array
+from grafo import AdyacenciasCSR
+from nodos import empaquetar_textos, ColumnaTextos, IdsDensos, IndiceIds, \
+        TablaNodos
+
+# Formato del snapshot (orden de bytes nativo, enteros y double de 64 bits
+# como en LP64; se escribe y se mapea sin conversiones, por lo que sólo
+# puede abrirse en una arquitectura igual a la que lo creó. Secciones
+# alineadas a 8 bytes):
+#   encabezado
+#   inicio          int64 * (|V|+1)
+#   vecinos         int32 * entradas
+#   pesos           int64 o double * entradas          (si hay pesos)
+#   ids             int64 * |V|                         (ids enteros no densos)
+#                   int64 * (|V|+1) + textos           (ids de texto)
+#   orden_ids       int32 * |V|, vértices ordenados por id (ids no densos)
+#   descripciones   int64 * (|V|+1) + textos
+MAGIA = 'TP1SNAP\x01'
+ENCABEZADO = struct.Struct('=8sQQQQQqQ')
+
+SIN_PESOS = 0
+PESOS_ENTEROS = 1
+PESOS_REALES = 2
+
+IDS_ENTEROS = 0
+IDS_TEXTO = 1
+
+TIPOS_CTYPES = {
+    'i': ctypes.c_int32,
+    'l': ctypes.c_int64,
+    'q': ctypes.c_int64,
+    'd': ctypes.c_double,
+    }
+
+
+def es_snapshot(filepath):
+    """
+    O(1)
+    """
+    with open(filepath, 'rb') as f:
+        return f.read(len(MAGIA)) == MAGIA
+
+
+def _escribir(f, datos):
+    """
+    O(len(datos))
+    Escribe una sección y completa con ceros hasta múltiplo de 8 bytes.
+    """
+    if isinstance(datos, array):
+        datos.tofile(f)
+        tamanio = len(datos) * datos.itemsize
+    else:
+        f.write(datos)
+        tamanio = len(datos)
+    f.write('\0' * (-tamanio % 8))
+
+
+def _arreglos_csr(grafo):
+    """
+    O(|V|+|E|*log(|V|))
+    Obtiene inicio, vecinos y pesos de cualquier representación de
+    adyacencias.
+    """
+    adyacencias = grafo.adyacencias
+    if isinstance(adyacencias, AdyacenciasCSR):
+        adyacencias.compactar()
+        if isinstance(adyacencias.vecinos, array):
+            return adyacencias.inicio, adyacencias.vecinos, adyacencias.pesos
+
+    inicio = array('l', [0])
+    vecinos = array('i')
+    pesos = []
+    for u in grafo.iternodes():
+        fila = sorted(grafo.ady_con_pesos(u))
+        vecinos.extend([ v for v, _ in fila ])
+        pesos.extend([ peso for _, peso in fila ])
+        inicio.append(len(vecinos))
+    if all(peso == 1 for peso in pesos):
+        return inicio, vecinos, None
+    enteros = all(isinstance(peso, (int, long)) for peso in pesos)
+    return inicio, vecinos, array('l' if enteros else 'd', pesos)
+
+
+def guardar_snapshot(grafo, filepath):
+    """
+    O(|V|+|E|*log(|V|))
+    Guarda las adyacencias, los pesos, los ids y las descripciones de los
+    nodos (node_data con atributos id y description) en formato binario.
+    """
+    if array('l').itemsize <> 8:
+        raise Exception('Los snapshots requieren enteros largos de 64 bits.')
+    inicio, vecinos, pesos = _arreglos_csr(grafo)
+    ids = [ grafo.get_node_data(u).id for u in grafo.iternodes() ]
+    descripciones = [ grafo.get_node_data(u).description
+            for u in grafo.iternodes() ]
+
+    tipo_pesos = SIN_PESOS
+    if pesos is not None:
+        tipo_pesos = PESOS_REALES if pesos.typecode == 'd' else PESOS_ENTEROS
+
+    tipo_ids = IDS_ENTEROS
+    if not all(isinstance(id, (int, long)) for id in ids):
+        tipo_ids = IDS_TEXTO
+        ids = [ str(id) for id in ids ]
+    base = ids[0] if ids and tipo_ids == IDS_ENTEROS else 0
+    densos = tipo_ids == IDS_ENTEROS and all(
+            id == base + u for u, id in enumerate(ids))
+
+    with open(filepath, 'wb') as f:
+        f.write(ENCABEZADO.pack(MAGIA, grafo.cantidad_vertices,
+            grafo.cantidad_aristas, len(vecinos), tipo_pesos, tipo_ids,
+            base, int(densos)))
+        _escribir(f, inicio)
+        _escribir(f, vecinos)
+        if pesos is not None:
+            _escribir(f, pesos)
+        if not densos:
+            if tipo_ids == IDS_ENTEROS:
+                _escribir(f, array('l', ids))
+            else:
+                desplazamientos, textos = empaquetar_textos(ids)
+                _escribir(f, desplazamientos)
+                _escribir(f, textos)
+            # O(|V|*log(|V|))
+            _escribir(f, array('i', sorted(grafo.iternodes(),
+                key=ids.__getitem__)))
+        desplazamientos, textos = empaquetar_textos(descripciones)
+        _escribir(f, desplazamientos)
+        _escribir(f, textos)
+
+
+class _Lector:
+    """
+    Crea arreglos de ctypes sobre secciones consecutivas del mapa de
+    memoria, sin copiar su contenido.
+    """
+
+    def __init__(self, mapa, desplazamiento):
+        self.mapa = mapa
+        self.desplazamiento = desplazamiento
+
+    def arreglo(self, tipo, cantidad):
+        """
+        O(1)
+        """
+        clase = TIPOS_CTYPES[tipo] * cantidad
+        arreglo = clase.from_buffer(self.mapa, self.desplazamiento)
+        tamanio = ctypes.sizeof(clase)
+        self.desplazamiento += tamanio + (-tamanio % 8)
+        return arreglo
+
+    def textos(self, cantidad):
+        """
+        O(1)
+        """
+        desplazamientos = self.arreglo('l', cantidad + 1)
+        textos = ColumnaTextos(self.mapa, self.desplazamiento,
+                desplazamientos)
+        tamanio = desplazamientos[cantidad]
+        self.desplazamiento += tamanio + (-tamanio % 8)
+        return textos
+
+
+def abrir_snapshot(filepath, clase_grafo, crear_nodo):
+    """
+    O(|V|)
+    Abre un snapshot mapeándolo en memoria: adyacencias, pesos, ids y
+    descripciones se leen del archivo a medida que se acceden. El mapa es
+    copy-on-write, por lo que modificar el grafo no altera el archivo.
+    Devuelve el grafo y el índice de vértices por id.
+    """
+    with open(filepath, 'rb') as f:
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    (magia, cantidad_vertices, cantidad_aristas, entradas, tipo_pesos,
+            tipo_ids, base, densos) = ENCABEZADO.unpack_from(mapa, 0)
+    if magia <> MAGIA:
+        raise Exception('%s no es un snapshot válido.' % filepath)
+
+    lector = _Lector(mapa, ENCABEZADO.size)
+    inicio = lector.arreglo('l', cantidad_vertices + 1)
+    vecinos = lector.arreglo('i', entradas)
+    pesos = None
+    tipo_arreglo_pesos = None
+    if tipo_pesos <> SIN_PESOS:
+        tipo_arreglo_pesos = 'd' if tipo_pesos == PESOS_REALES else 'l'
+        pesos = lector.arreglo(tipo_arreglo_pesos, entradas)
+
+    if densos:
+        ids = IdsDensos(base, cantidad_vertices)
+        indice = IndiceIds(ids, None, base, cantidad_vertices)
+    else:
+        if tipo_ids == IDS_ENTEROS:
+            ids = lector.arreglo('l', cantidad_vertices)
+        else:
+            ids = lector.textos(cantidad_vertices)
+        orden = lector.arreglo('i', cantidad_vertices)
+        indice = IndiceIds(ids, orden, base, cantidad_vertices)
+    descripciones = lector.textos(cantidad_vertices)
+
+    grafo = clase_grafo(clase_adyacencias=AdyacenciasCSR)
+    grafo.asignar_adyacencias(
+            AdyacenciasCSR.desde_arreglos(inicio, vecinos, pesos,
+                tipo_arreglo_pesos),
+            cantidad_aristas,
+            TablaNodos(ids, descripciones, indice, crear_nodo))
+    return grafo, indice
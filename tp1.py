@@ -1,19 +1,28 @@
 #!/usr/bin/python
 # coding=utf-8
-from grafo import GrafoPesoUnitario
-import re
-from heapq import heappop, heappush
+from grafo import GrafoPesoUnitario, AdyacenciasListas, AdyacenciasCSR, \
+        AdyacenciasBits, elegir_adyacencias
+from grafo import instrumentacion
+from grafo.instrumentacion import Instrumentacion
+from gdf import leer_gdf
+from snapshot import es_snapshot, abrir_snapshot, guardar_snapshot
+from cache import CacheResultados, huella_archivo, TAMANIO_MAXIMO
+from salida import EscritorTexto, crear_escritor, ESCRITORES, SECCIONES
+from heapq import heappop, heappush, heapify, nsmallest, nlargest
+from array import array
+from operator import itemgetter
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
 import sys
-
-NODEDEF_TYPE = 1
-EDGEDEF_TYPE = 2
-re_nodedef = re.compile('^nodedef>.*')
-re_edgedef = re.compile('^edgedef>.*')
+import tempfile
 
 class Node:
 
     def __init__(self, id, description):
-        self.id = int(id)
+        self.id = id
         self.description = description
 
     @staticmethod
@@ -22,39 +31,58 @@ class Node:
         O(1)
         """
         fields = line.split(',')
-        return Node(id=fields[0], description=fields[1])
+        return Node(id=int(fields[0]), description=fields[1])
 
 
 class TP1:
 
-    def __init__(self, filepath, clase_grafo=GrafoPesoUnitario):
-        """
-        O(max(|E|,|V|)*|V|)
-        """
-        self.grafo = clase_grafo()
-
-        self.vertice_from_id = {}
-        linetype = None
-
-        with open(filepath) as f:
-            for line in f:
-                line = line.strip()
-                if re_nodedef.match(line):
-                    linetype = NODEDEF_TYPE
-                elif re_edgedef.match(line):
-                    linetype = EDGEDEF_TYPE
-                elif linetype == NODEDEF_TYPE: # |V|
-                    # O(1)
-                    node = Node.create_node_from_gdf_line(line)
-                    # O(|V|)
-                    # TODO Ver si aplica vertice_from_id y cambiar implementación
-                    self.vertice_from_id[node.id] = self.grafo.add_node(node)
-                elif linetype == EDGEDEF_TYPE: # |E|
-                    id1, id2 = map(int, line.split(','))
-                    # O(|V|)
-                    v1, v2 = self.vertice_from_id[id1], self.vertice_from_id[id2]
-                    # O(log(|V|))
-                    self.grafo.connect(v1, v2, both=True)
+    def __init__(self, filepath, clase_grafo=GrafoPesoUnitario,
+            clase_adyacencias=None):
+        """
+        O(|V|+|E|*log(|V|))
+        filepath puede ser un archivo gdf o un snapshot creado con
+        guardar_snapshot; en ese caso se mapea en memoria en O(|V|) y
+        siempre se usa AdyacenciasCSR.
+        clase_adyacencias: si es None se elige según la densidad del grafo
+        (ver elegir_adyacencias).
+        """
+        if es_snapshot(filepath):
+            self.grafo, self.vertice_from_id = abrir_snapshot(
+                    filepath, clase_grafo, Node)
+            self.nodos = self.grafo.node_data
+            return
+
+        # O(tamaño del archivo)
+        contenido = leer_gdf(filepath)
+
+        if clase_adyacencias is None:
+            clase_adyacencias = elegir_adyacencias(len(contenido.ids),
+                    2 * len(contenido.no_dirigidas) + len(contenido.dirigidas))
+        self.grafo = clase_grafo(clase_adyacencias=clase_adyacencias)
+
+        # O(|V|)
+        for i in xrange(len(contenido.ids)):
+            self.grafo.add_node()
+        # O(1) leer_gdf ya guardó los nodos por columnas (ver TablaNodos)
+        # y los Node se crean recién al consultarlos.
+        self.nodos = contenido.tabla_nodos(Node)
+        self.grafo.asignar_node_data(self.nodos)
+        self.vertice_from_id = self.nodos.indice
+
+        # O(|E|*log(|V|))
+        for aristas, both in ((contenido.no_dirigidas, True),
+                (contenido.dirigidas, False)):
+            if len(aristas) > 0:
+                self.grafo.cargar_aristas(aristas.origenes, aristas.destinos,
+                        aristas.pesos, both=both)
+
+    def guardar_snapshot(self, filepath):
+        """
+        O(|V|+|E|*log(|V|))
+        Guarda el grafo cargado en formato binario para poder reabrirlo
+        sin volver a procesar el gdf.
+        """
+        guardar_snapshot(self.grafo, filepath)
 
     def get_popularidad(self):
         """
@@ -81,127 +109,300 @@ class TP1:
         """
         O(|V|)
         """
-        for i in xrange(len(popularidad)-1, -1, -1):
-            if len(popularidad[i]) == 0:
-                continue
-            print "#%s: %s" % (i, [ x.description for x in popularidad[i]])
+        escritor = EscritorTexto()
+        escritor.popularidad( (i, x.id, x.description)
+                for i in xrange(len(popularidad)-1, -1, -1)
+                for x in popularidad[i] )
+        escritor.vaciar()
 
     def mostrar_influencias(self, influencias):
         """
-        O(|V|**2)
+        O(|V|*log(|V|))
         """
+        escritor = EscritorTexto()
+        escritor.influencias(self.filas_influencias(
+            self.seleccionar_influencias(influencias)))
+        escritor.vaciar()
 
-        vertices_por_influencia = {}
-
-        # O(|V|**2)
-        for i in xrange(len(influencias)): # |V|
-            # O(|V|)
-            vertices = vertices_por_influencia.get( 
-                    influencias[i],set())
-            # O(|V|)
-            vertices.add(self.grafo.get_node_data(i).description)
-            # O(|V|)
-            vertices_por_influencia[influencias[i]] = vertices
-
-        # O(|V|)
-        influencias_ordenadas = [(influencia, vertices
-            ) for influencia,vertices in vertices_por_influencia.iteritems()]
+    def mostrar_recomendaciones(self, recomendaciones):
+        """
+        O(n*log(n))
+        """
+        escritor = EscritorTexto()
+        escritor.recomendaciones(self.filas_recomendaciones(
+            self.seleccionar_recomendaciones(recomendaciones)))
+        escritor.vaciar()
 
-        # O(|V|*log(|V|))
-        influencias_ordenadas.sort(reverse=True)
-        
+    def seleccionar_popularidad(self, top=None, minimo=None):
+        """
+        O(|V|+grado máximo)
+        Pares (grado, vértice) de mayor a menor grado (y por vértice ante
+        empates), ordenados por conteo. top: cantidad máxima de vértices;
+        minimo: grado mínimo.
+        """
         # O(|V|)
-        for x in influencias_ordenadas:
-            print x
+        grados = array('l', [ self.grafo.get_grado_salida(u)
+            for u in self.grafo.iternodes() ])
+        grado_maximo = max(grados) if grados else 0
+        inicio = array('l', [0]) * (grado_maximo + 2)
+        for grado in grados:
+            inicio[grado_maximo - grado + 1] += 1
+        for i in xrange(1, len(inicio)):
+            inicio[i] += inicio[i-1]
+        orden = array('l', [0]) * len(grados)
+        for u, grado in enumerate(grados):
+            orden[inicio[grado_maximo - grado]] = u
+            inicio[grado_maximo - grado] += 1
+
+        cantidad = len(orden) if top is None else min(top, len(orden))
+        for i in xrange(cantidad):
+            u = orden[i]
+            if minimo is not None and grados[u] < minimo:
+                return
+            yield grados[u], u
+
+    def seleccionar_influencias(self, influencias, top=None, minimo=None):
+        """
+        O(|V|*log(top)) (O(|V|*log(|V|)) si no se indica top)
+        Pares (influencia, vértice) de mayor a menor influencia (y por
+        vértice ante empates). Con top se hace una selección parcial en
+        lugar de ordenar todos los vértices.
+        """
+        vertices = xrange(len(influencias))
+        if minimo is not None:
+            vertices = ( u for u in vertices if influencias[u] >= minimo )
+        if top is None:
+            seleccionados = sorted(vertices, key=influencias.__getitem__,
+                    reverse=True)
+        else:
+            seleccionados = nlargest(top, vertices,
+                    key=influencias.__getitem__)
+        return ( (influencias[u], u) for u in seleccionados )
+
+    def seleccionar_recomendaciones(self, recomendaciones, top=None,
+            minimo=None, ordenar=True):
+        """
+        O(n*log(top)) (O(n*log(n)) si no se indica top, O(n) si además
+        no se ordenan)
+        Recomendaciones (vertice, recomendacion, amigos_en_comun) de
+        mayor a menor cantidad de amigos en común, manteniendo el orden
+        original ante empates.
+        ordenar: si es falso y no se indica top, se devuelven a medida
+        que se recorren, en el orden en que se generaron.
+        """
+        if minimo is not None:
+            recomendaciones = ( x for x in recomendaciones if x[2] >= minimo )
+        if top is None:
+            if not ordenar:
+                return iter(recomendaciones)
+            return sorted(recomendaciones, key=itemgetter(2), reverse=True)
+        return nlargest(top, recomendaciones, key=itemgetter(2))
+
+    def filas_popularidad(self, seleccion):
+        """
+        Filas (grado, id, descripción) para un Escritor.
+        """
+        nodos = self.nodos
+        return ( (grado, nodos.get_id(u), nodos.get_descripcion(u))
+                for grado, u in seleccion )
 
-    def mostrar_recomendaciones(self, recomendaciones):
+    def filas_influencias(self, seleccion):
         """
-        O(n*log(n))
+        Filas (influencia, id, descripción) para un Escritor.
         """
+        nodos = self.nodos
+        return ( (influencia, nodos.get_id(u), nodos.get_descripcion(u))
+                for influencia, u in seleccion )
 
-        # O(n*log(n))
-        recomendaciones.sort(key=lambda x:x[2], reverse=True)
+    def filas_recomendaciones(self, seleccion):
+        """
+        Filas (id, descripción, id recomendado, descripción recomendada,
+        amigos en común) para un Escritor.
+        """
+        nodos = self.nodos
+        return ( (nodos.get_id(u), nodos.get_descripcion(u),
+            nodos.get_id(v), nodos.get_descripcion(v), amigos_comun)
+            for u, v, amigos_comun in seleccion )
 
-        # O(n)
-        _recomendaciones = [ (
-            self.grafo.get_node_data(u).description,
-            self.grafo.get_node_data(v).description,
-            amigos_comun ) for u, v, amigos_comun in
-            recomendaciones ]
+    def seleccionar_centralidades(self, centralidades, top=None,
+            minimo=None):
+        """
+        O(|V|*log(top)) (O(|V|*log(|V|)) si no se indica top)
+        Pares (centralidad armónica, vértice) de mayor a menor.
+        """
+        return self.seleccionar_influencias(centralidades.armonica, top,
+                minimo)
 
-        # O(n)
-        for persona, recomendacion, amigos_comun in _recomendaciones:
-            print '%s: %s (%s amigo(s) en común)' % (
-                    persona, recomendacion, amigos_comun)
+    def seleccionar_influencias_aristas(self, centralidades, top=None,
+            minimo=None):
+        """
+        O(|E|*log(top)) (O(|E|*log(|E|)) si no se indica top)
+        Ternas (influencia, v, w) de las aristas de mayor a menor
+        influencia. Si el grafo es simétrico se suman ambos sentidos.
+        """
+        aristas = centralidades.influencias_aristas(
+                no_dirigidas=self.grafo.es_simetrico())
+        seleccionadas = ( (influencia, v, w)
+                for (v, w), influencia in aristas.iteritems() )
+        if minimo is not None:
+            seleccionadas = ( x for x in seleccionadas if x[0] >= minimo )
+        if top is None:
+            return sorted(seleccionadas, reverse=True)
+        return nlargest(top, seleccionadas)
+
+    def filas_centralidades(self, centralidades, seleccion):
+        """
+        Filas (centralidad armónica, id, descripción, cercanía,
+        excentricidad) para un Escritor.
+        """
+        nodos = self.nodos
+        return ( (armonica, nodos.get_id(u), nodos.get_descripcion(u),
+            centralidades.get_cercania(u), centralidades.get_excentricidad(u))
+            for armonica, u in seleccion )
 
+    def filas_influencias_aristas(self, seleccion):
+        """
+        Filas (influencia, id, descripción, id del otro extremo,
+        descripción del otro extremo) para un Escritor.
+        """
+        nodos = self.nodos
+        return ( (influencia, nodos.get_id(v), nodos.get_descripcion(v),
+            nodos.get_id(w), nodos.get_descripcion(w))
+            for influencia, v, w in seleccion )
 
-    def get_influencias(self):
+    def get_influencias(self, procesos=None, error=None, confianza=0.95,
+            semilla=None, biconexas=False):
         """
         O(|V|*(|V|+|E|))
         Se obtiene el índice de influencia por cada vertice.
+        procesos: cantidad de procesos entre los que se reparte el
+        cálculo (None para calcularlo en el proceso actual).
+        error: si se indica, las influencias se estiman con una muestra
+        de orígenes (ver Grafo.calcular_influencias_aproximadas) y la
+        cota alcanzada queda en self.cota_error_influencias.
+        biconexas: si es verdadero, el cálculo exacto se hace por
+        componente biconexa (ver Grafo.calcular_influencias).
         """
-        self.grafo.calcular_influencias()
+        if error is None:
+            self.grafo.calcular_influencias(procesos=procesos,
+                    biconexas=biconexas)
+            self.cota_error_influencias = 0
+        else:
+            self.cota_error_influencias = (
+                self.grafo.calcular_influencias_aproximadas(error,
+                    confianza=confianza, semilla=semilla, procesos=procesos))
         return [ self.grafo.get_influencia(u) for u in self.grafo.iternodes() ]
 
-    def calcular_caminos_minimos(self):
+    def get_centralidades(self, procesos=None, aristas=True):
+        """
+        O(|V|*(|V|+|E|))
+        Calcula las influencias exactas y, en el mismo recorrido por
+        origen, la cercanía, la centralidad armónica, la excentricidad y
+        la influencia de cada arista (ver Grafo.calcular_centralidades).
+        Devuelve las Centralidades; las influencias se obtienen luego con
+        get_influencia.
+        """
+        self.grafo.calcular_centralidades(procesos=procesos, aristas=aristas)
+        self.cota_error_influencias = 0
+        return self.grafo.centralidades
+
+    def calcular_caminos_minimos(self, matriz=False, archivo=None):
         """
         O(|V|*(|E|+|V|)
+        matriz: si es verdadero, sólo se guardan las distancias y la
+        cantidad de caminos mínimos de todos los pares en una matriz
+        mapeada en memoria (respaldada por archivo si se indica; ver
+        Grafo.calcular_matriz_caminos).
         """
-        self.grafo.calcular_caminos_minimos()
+        if matriz:
+            self.grafo.calcular_matriz_caminos(archivo=archivo)
+        else:
+            self.grafo.calcular_caminos_minimos()
+
+    def liberar_caminos_minimos(self):
+        """
+        O(1)
+        """
+        self.grafo.liberar_caminos_minimos()
 
     def get_vertice_from_id(self, id):
         """
-        O(|V|)
+        O(1) si los ids son consecutivos, O(log(|V|)) si no.
         """
         return self.vertice_from_id[id]
 
+    def get_descripcion(self, u):
+        """
+        O(longitud de la descripción)
+        """
+        return self.nodos.get_descripcion(u)
+
     def recomendaciones_para(self, u):
         """
         Au: Cantidad de aristas que salen de u.
-        O(Sum(v in V,Au+Av)) = O(Au*|V|+|A|)
+        A2u: Cantidad de vértices a distancia 2 de u.
+        O(Sum(w in ady(u),Aw))
         Devuelve un heap con las recomendaciones. Solo se recomienda en 
         caso que exista algún amigo en común.
         """
-        # O(Au)
-        recomendaciones = []
-        for v in self.grafo.iternodes():
-            if u==v:
-                continue
-            # O(log(Au))
-            if self.grafo.conectados(u,v):
-                continue
-            # O(Au+Av)
-            cantidad_conexiones_en_comun = - len(
-                    self.grafo.conexiones_en_comun(u,v))
-            if cantidad_conexiones_en_comun == 0:
-                continue
-            # O(log(|V|))
-            heappush(recomendaciones, (cantidad_conexiones_en_comun, v))
+        # O(Sum(w in ady(u),Aw))
+        conteo = self.grafo.contar_conexiones_en_comun(u)
+        # O(A2u)
+        recomendaciones = [ (-cantidad, v)
+                for v, cantidad in conteo.iteritems() ]
+        heapify(recomendaciones)
         return recomendaciones
 
+    def mejores_recomendaciones_para(self, u, k=10):
+        """
+        O(Sum(w in ady(u),Aw)+A2u*log(k))
+        Devuelve las k mejores recomendaciones para u como un listado de
+        (recomendacion, amigos_en_comun), de mayor a menor cantidad de
+        amigos en común (y por vértice ante empates). Con k=None se
+        devuelven todas. El costo depende sólo del vecindario de u.
+        """
+        recomendaciones = self.recomendaciones_para(u)
+        if k is None:
+            k = len(recomendaciones)
+        # O(A2u*log(k))
+        return [ (v, -cantidad) for cantidad, v in
+                nsmallest(k, recomendaciones) ]
+
+    def mejores_recomendaciones(self, vertices, k=10):
+        """
+        O(Sum(u in vertices,Sum(w in ady(u),Aw)+A2u*log(k)))
+        Devuelve un diccionario con las k mejores recomendaciones
+        (ver mejores_recomendaciones_para) de cada vértice indicado.
+        """
+        return dict( (u, self.mejores_recomendaciones_para(u, k))
+                for u in vertices )
+
     def recomendaciones(self):
         """
-        O(Sum(u in V,Au*|V|+|A|)) = O(|V|*Sum(u in V,Au)+|V|*|A|) =
-        = O(|V|*|A|+|V|*|A|) = O(|V|*|A|)
+        O(Sum(u in V,Au**2)) (ver Grafo.iter_conexiones_en_comun)
         Devuelve un listado donde cada item tiene:
         (vertice, recomendacion, amigos_en_comun)
+        Por cada vertice se recomiendan todos los que empatan con la
+        mayor cantidad de amigos en común.
         """
         recomendaciones = []
-        for u in self.grafo.iternodes():
-            recomendaciones_u = self.recomendaciones_para(u) # O(Au*|V|+|A|)
-            max_amigos_comun = None
-            while len(recomendaciones_u) > 0:
-                # O(1)
-                amigos_comun, recomendacion = heappop(recomendaciones_u)
-                if max_amigos_comun is not None and amigos_comun > max_amigos_comun:
-                    break
-                recomendaciones.append(
-                        (u, recomendacion, -amigos_comun))
-                max_amigos_comun = amigos_comun
+        for u, candidatos in self.grafo.iter_conexiones_en_comun():
+            if len(candidatos) == 0:
+                continue
+            # O(len(candidatos))
+            max_amigos_comun = max(
+                    amigos_comun for _, amigos_comun in candidatos)
+            # O(len(candidatos)*log(len(candidatos)))
+            for recomendacion, amigos_comun in sorted(candidatos):
+                if amigos_comun == max_amigos_comun:
+                    recomendaciones.append(
+                            (u, recomendacion, amigos_comun))
         return recomendaciones
 
 
 import unittest
+from StringIO import StringIO
+from grafo import GrafoPesado
 
 
 class TP1TestCase(unittest.TestCase):
@@ -214,6 +415,33 @@ class TP1TestCase(unittest.TestCase):
     def test_create_grafo_from_gdf(self):
 
         grafo = TP1('ejemplo_enunciado.gdf').grafo
+        # El grafo del enunciado es denso
+        self.assertTrue(isinstance(grafo.adyacencias, AdyacenciasBits))
+        self.verificar_grafo_enunciado(grafo)
+
+    def test_create_grafo_from_gdf_listas(self):
+
+        grafo = TP1('ejemplo_enunciado.gdf',
+                clase_adyacencias=AdyacenciasListas).grafo
+        self.verificar_grafo_enunciado(grafo)
+
+    def test_create_grafo_from_gdf_csr(self):
+
+        grafo = TP1('ejemplo_enunciado.gdf',
+                clase_adyacencias=AdyacenciasCSR).grafo
+        self.verificar_grafo_enunciado(grafo)
+
+    def test_nodos_por_columnas(self):
+
+        tp1 = TP1('ejemplo_enunciado.gdf')
+
+        self.assertEqual(tp1.nodos.descripciones.buffer[:13], 'RobertoMilena')
+        self.assertEqual(tp1.get_descripcion(10), 'Nora')
+        self.assertEqual(tp1.get_vertice_from_id(11), 10)
+        self.assertEqual(tp1.grafo.get_node_data(10).id, 11)
+        self.assertRaises(KeyError, tp1.get_vertice_from_id, 0)
+
+    def verificar_grafo_enunciado(self, grafo):
 
         self.assertEqual(grafo.cantidad_vertices, 11)
         self.assertEqual(grafo.cantidad_aristas, 17)
@@ -278,19 +506,21 @@ class TP1TestCase(unittest.TestCase):
 
     def test_cantidad_caminos_minimos(self):
 
-        tp1 = TP1('ejemplo_enunciado.gdf')
+        for matriz in (False, True):
+            tp1 = TP1('ejemplo_enunciado.gdf')
 
-        tp1.calcular_caminos_minimos()
+            tp1.calcular_caminos_minimos(matriz=matriz)
 
-        cantidad_total_caminos_minimos = 0
-        for u in tp1.grafo.iternodes():
-            for v in tp1.grafo.iternodes():
-                if u>=v:
-                    continue
-                cantidad_total_caminos_minimos += (
-                        tp1.grafo.get_cantidad_caminos_minimos(u,v) )
+            cantidad_total_caminos_minimos = 0
+            for u in tp1.grafo.iternodes():
+                for v in tp1.grafo.iternodes():
+                    if u>=v:
+                        continue
+                    cantidad_total_caminos_minimos += (
+                            tp1.grafo.get_cantidad_caminos_minimos(u,v) )
 
-        self.assertEqual(cantidad_total_caminos_minimos, 132/2)
+            self.assertEqual(cantidad_total_caminos_minimos, 132/2)
+            tp1.liberar_caminos_minimos()
 
     def verificar_cantidad_caminos_minimos_con_intermediario(self, tp1, id, cantidad_esperada):
 
@@ -367,6 +597,145 @@ class TP1TestCase(unittest.TestCase):
                     set(['Roberto']),
                     set(['Juana'])])
 
+    def test_get_influencias_aproximadas(self):
+
+        tp1 = TP1('ejemplo_enunciado.gdf')
+        exactas = tp1.get_influencias()
+        self.assertEqual(tp1.cota_error_influencias, 0)
+
+        tp1 = TP1('ejemplo_enunciado.gdf')
+        aproximadas = tp1.get_influencias(error=0.8, semilla=1)
+        self.assertTrue(tp1.cota_error_influencias > 0)
+        for exacta, aproximada in zip(exactas, aproximadas):
+            self.assertTrue(
+                    abs(exacta - aproximada) <= tp1.cota_error_influencias)
+
+    def test_get_influencias_biconexas(self):
+
+        exactas = TP1('ejemplo_enunciado.gdf').get_influencias()
+        biconexas = TP1('ejemplo_enunciado.gdf').get_influencias(
+                biconexas=True)
+        for exacta, obtenida in zip(exactas, biconexas):
+            self.assertAlmostEqual(exacta, obtenida)
+
+    def test_get_centralidades(self):
+
+        exactas = TP1('ejemplo_enunciado.gdf').get_influencias()
+        tp1 = TP1('ejemplo_enunciado.gdf')
+        centralidades = tp1.get_centralidades()
+        for u, exacta in enumerate(exactas):
+            self.assertAlmostEqual(exacta, tp1.grafo.get_influencia(u))
+        seleccion = tp1.seleccionar_centralidades(centralidades, 2, None)
+        self.assertEqual([ fila[2] for fila in
+            tp1.filas_centralidades(centralidades, seleccion) ],
+            ['Roberto', 'Juana'])
+        self.assertEqual(list(tp1.filas_influencias_aristas(
+            tp1.seleccionar_influencias_aristas(centralidades, 1, None)))[0][2:],
+            ('Roberto', 4, 'Juana'))
+
+        texto = self.generar_reporte('ejemplo_enunciado.gdf', top=1,
+                centralidades=True)
+        self.assertIn('Roberto - Juana: ', texto)
+        self.assertRaises(Exception, self.generar_reporte,
+                'ejemplo_enunciado.gdf', centralidades=True, error=0.5)
+
+    def test_recomendaciones_por_vertice(self):
+
+        tp1 = TP1('ejemplo_enunciado.gdf')
+
+        esperadas = []
+        for u in tp1.grafo.iternodes():
+            recomendaciones_u = tp1.recomendaciones_para(u)
+            max_amigos_comun = None
+            while len(recomendaciones_u) > 0:
+                amigos_comun, recomendacion = heappop(recomendaciones_u)
+                if (max_amigos_comun is not None and
+                        amigos_comun > max_amigos_comun):
+                    break
+                esperadas.append((u, recomendacion, -amigos_comun))
+                max_amigos_comun = amigos_comun
+
+        self.assertEqual(tp1.recomendaciones(), esperadas)
+
+    def test_mejores_recomendaciones(self):
+
+        tp1 = TP1('ejemplo_enunciado.gdf')
+
+        def descripciones(id, k):
+            u = tp1.get_vertice_from_id(id)
+            return [ (tp1.grafo.get_node_data(v).description, amigos_comun)
+                    for v, amigos_comun in tp1.mejores_recomendaciones_para(
+                        u, k) ]
+
+        # Monica
+        self.assertEqual(descripciones(3, 2),
+                [('Milena', 2), ('Juana', 1)])
+        self.assertEqual(descripciones(3, None),
+                [('Milena', 2), ('Juana', 1), ('Carlos', 1),
+                    ('Pablo', 1), ('Lorena', 1)])
+        # Nora
+        self.assertEqual(descripciones(11, 10),
+                [('Roberto', 1), ('Carlos', 1), ('Lorena', 1),
+                    ('Tomas', 1)])
+        self.assertEqual(descripciones(11, 0), [])
+
+        lote = tp1.mejores_recomendaciones(tp1.grafo.iternodes(), k=1)
+        for u, v, amigos_comun in tp1.recomendaciones():
+            if lote[u][0][0] == v:
+                self.assertEqual(lote[u], [(v, amigos_comun)])
+
+    def crear_archivo_temporal(self, texto=None, suffix='.gdf'):
+        descriptor, filepath = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(descriptor, 'w') as f:
+            if texto is not None:
+                f.write(texto)
+        self.addCleanup(os.remove, filepath)
+        return filepath
+
+    def test_snapshot(self):
+
+        filepath = self.crear_archivo_temporal(suffix='.snap')
+        original = TP1('ejemplo_enunciado.gdf')
+        original.guardar_snapshot(filepath)
+
+        tp1 = TP1(filepath)
+
+        self.verificar_grafo_enunciado(tp1.grafo)
+        self.assertEqual(tp1.get_vertice_from_id(11),
+                original.get_vertice_from_id(11))
+        self.assertRaises(KeyError, tp1.get_vertice_from_id, 12)
+        self.assertEqual(tp1.get_influencias(), original.get_influencias())
+        self.assertEqual(
+                [ [ x.description for x in vertices ]
+                    for vertices in tp1.get_popularidad() ],
+                [ [ x.description for x in vertices ]
+                    for vertices in original.get_popularidad() ])
+
+    def test_snapshot_ids_texto_y_pesos(self):
+
+        gdf = self.crear_archivo_temporal('\n'.join([
+            "nodedef>name VARCHAR,label VARCHAR",
+            "b,'Perez, Juan'",
+            "a,Ana",
+            "c,Nora",
+            "edgedef>node1 VARCHAR,node2 VARCHAR,weight DOUBLE",
+            "a,b,2.5",
+            "b,c,1",
+            ]))
+        filepath = self.crear_archivo_temporal(suffix='.snap')
+        TP1(gdf, clase_grafo=GrafoPesado).guardar_snapshot(filepath)
+
+        tp1 = TP1(filepath, clase_grafo=GrafoPesado)
+
+        u = tp1.get_vertice_from_id('b')
+        self.assertEqual(u, 0)
+        self.assertEqual(tp1.grafo.get_node_data(u).description, 'Perez, Juan')
+        self.assertEqual(tp1.grafo.get_node_data(2).id, 'c')
+        self.assertEqual(tp1.grafo.cantidad_aristas, 2)
+        self.assertEqual(sorted(tp1.grafo.ady_con_pesos(u)),
+                [(1, 2.5), (2, 1.0)])
+        self.assertRaises(KeyError, tp1.get_vertice_from_id, 'd')
+
     def test_recomendaciones(self):
 
         tp1 = TP1('ejemplo_enunciado.gdf')
@@ -393,51 +762,408 @@ class TP1TestCase(unittest.TestCase):
         self.assertIn(('Tomas','Roberto',1), recomendaciones)
         self.assertIn(('Esteban','Roberto',2), recomendaciones)
 
+    def generar_reporte(self, filepath, generar=None, **kwargs):
+        salida = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            (generar or reporte_amigos_facebook_gdf)(filepath, **kwargs)
+            return sys.stdout.getvalue()
+        finally:
+            sys.stdout = salida
 
-def inicio_seccion(nombre):
-    """
-    O(1)
-    """
-    print '-----------------%s-----------------' % nombre
+    def test_seleccionar(self):
 
-def fin_seccion():
-    """
-    O(1)
-    """
-    print '-------------------------------------------'
-    print
+        tp1 = TP1('ejemplo_enunciado.gdf')
+        influencias = tp1.get_influencias()
+        recomendaciones = tp1.recomendaciones()
 
-def reporte_amigos_facebook_gdf(filepath):
+        self.assertEqual(list(tp1.seleccionar_popularidad()),
+                [ (i, x) for i in xrange(tp1.grafo.cantidad_vertices, -1, -1)
+                    for x in sorted(tp1.grafo.iternodes())
+                    if tp1.grafo.get_grado_salida(x) == i ])
+        self.assertEqual(list(tp1.seleccionar_popularidad(top=3)),
+                [(5, 0), (5, 3), (4, 4)])
+        self.assertEqual(list(tp1.seleccionar_popularidad(minimo=4)),
+                [(5, 0), (5, 3), (4, 4), (4, 5)])
+        todas = list(tp1.seleccionar_influencias(influencias))
+        self.assertEqual(list(tp1.seleccionar_influencias(influencias, 5)),
+                todas[:5])
+        self.assertEqual(
+                list(tp1.seleccionar_influencias(influencias, minimo=1)),
+                [ x for x in todas if x[0] >= 1 ])
+        todas = tp1.seleccionar_recomendaciones(recomendaciones)
+        self.assertEqual(
+                tp1.seleccionar_recomendaciones(recomendaciones, 4, 2),
+                todas[:4])
+        self.assertEqual(len(recomendaciones), len(todas))
+        self.assertEqual(list(tp1.seleccionar_recomendaciones(
+            recomendaciones, ordenar=False)), recomendaciones)
+        self.assertEqual(list(tp1.seleccionar_recomendaciones(
+            recomendaciones, minimo=2, ordenar=False)),
+            [ x for x in recomendaciones if x[2] >= 2 ])
+        self.assertEqual(
+                tp1.seleccionar_recomendaciones(recomendaciones, 4,
+                    ordenar=False),
+                todas[:4])
+
+    def test_reporte_formatos(self):
+
+        texto = self.generar_reporte('ejemplo_enunciado.gdf', top=2,
+                minimos={'recomendaciones': 2})
+        self.assertIn("#5: ['Roberto', 'Juana']\n---", texto)
+        self.assertEqual(texto.count('amigo(s) en común'), 2)
+
+        filas = self.generar_reporte(['ejemplo_enunciado.gdf'] * 2,
+                generar=reportes, formato='csv').splitlines()
+        self.assertEqual(filas[0].split(',')[:3], ['archivo', 'seccion', 'id'])
+        self.assertEqual(filas.count(filas[0]), 1)
+        self.assertEqual(len(filas), 1 + 2 * (11 + 11 + 34))
+
+        objetos = [ json.loads(linea) for linea in self.generar_reporte(
+            'ejemplo_enunciado.gdf', formato='jsonl', top=1).splitlines() ]
+        self.assertEqual([ objeto['seccion'] for objeto in objetos ],
+                ['popularidad', 'influencias', 'recomendaciones'])
+        self.assertEqual(objetos[1]['descripcion'], 'Juana')
+
+    def test_reportes_en_paralelo(self):
+
+        with open('ejemplo_enunciado.gdf') as f:
+            otro = self.crear_archivo_temporal(f.read() + '2,11\n')
+        archivos = ['ejemplo_enunciado.gdf', otro, 'ejemplo_enunciado.gdf']
+
+        secuencial = self.generar_reporte(archivos, generar=reportes)
+        paralelo = self.generar_reporte(archivos, generar=reportes,
+                archivos_en_paralelo=2)
+
+        self.assertEqual(paralelo, secuencial)
+        self.assertEqual(paralelo.count('Archivo ejemplo_enunciado.gdf'), 2)
+        self.assertTrue(paralelo.index('Archivo ejemplo_enunciado.gdf') <
+                paralelo.index('Archivo %s' % otro))
+
+    def test_reportes_en_paralelo_estadisticas(self):
+
+        salida = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            estadisticas = reportes(['ejemplo_enunciado.gdf'] * 2,
+                    archivos_en_paralelo=2, instrumentar=True)
+        finally:
+            sys.stdout = salida
+
+        self.assertEqual(len(estadisticas), 2)
+        for estadisticas_archivo in estadisticas:
+            self.assertEqual(estadisticas_archivo['archivo'],
+                    'ejemplo_enunciado.gdf')
+            self.assertEqual(estadisticas_archivo['contadores']['origenes'],
+                    11)
+
+    def test_reporte_con_cache(self):
+
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directorio)
+        cache = CacheResultados(directorio)
+        calculos = []
+        get_influencias = TP1.get_influencias
+        def contar_calculos(tp1, *args, **kwargs):
+            calculos.append(1)
+            return get_influencias(tp1, *args, **kwargs)
+        TP1.get_influencias = contar_calculos
+        self.addCleanup(setattr, TP1, 'get_influencias', get_influencias)
+
+        sin_cache = self.generar_reporte('ejemplo_enunciado.gdf')
+        primero = self.generar_reporte('ejemplo_enunciado.gdf', cache=cache)
+        segundo = self.generar_reporte('ejemplo_enunciado.gdf', cache=cache)
+
+        self.assertEqual(len(calculos), 2)
+        self.assertEqual(primero, sin_cache)
+        self.assertEqual(segundo, sin_cache)
+
+        # Otros parámetros reutilizan sólo las recomendaciones
+        self.generar_reporte('ejemplo_enunciado.gdf', cache=cache,
+                error=0.8, semilla=1)
+        self.assertEqual(len(calculos), 3)
+        self.assertEqual(len(os.listdir(directorio)), 3)
+
+
+def reporte_amigos_facebook_gdf(filepath, procesos=None, error=None,
+        confianza=0.95, semilla=None, snapshot=False, cache=None,
+        biconexas=False, formato='texto', top=None, minimos=None,
+        salida=None, centralidades=False, ordenar=True):
     """
     O(|V|**3)
+    filepath: archivo gdf o snapshot.
+    snapshot: si es verdadero y filepath es un gdf, se guarda además su
+    snapshot en filepath + EXTENSION_SNAPSHOT.
+    cache: CacheResultados donde se buscan las influencias y las
+    recomendaciones calculadas para un archivo de idéntico contenido.
+    formato: 'texto', 'csv' o 'jsonl' (ver salida.ESCRITORES). El reporte
+    se escribe en salida (por defecto la salida estándar) a medida que
+    se genera.
+    top: cantidad máxima de filas por sección.
+    minimos: valor mínimo por sección (grado, influencia o amigos en
+    común), por ejemplo {'influencias': 10}.
+    centralidades: si es verdadero, junto con las influencias se
+    calculan las centralidades y la influencia de las aristas (ver
+    TP1.get_centralidades) y se agregan sus secciones. Requiere el
+    cálculo exacto.
+    ordenar: si es falso y no se indica top, las recomendaciones se
+    escriben en el orden en que se generaron, sin ordenarlas.
     """
+    if centralidades and error is not None:
+        raise Exception('Las centralidades requieren el cálculo exacto.')
+    minimos = minimos or {}
+    escritor = crear_escritor(formato, salida)
     
-    tp1 = TP1(filepath) # O(max(|E|,|V|)*|V|)
-
-    tp1.calcular_caminos_minimos() # O(|V|*(|E|+|V|)
-
-    inicio_seccion('Archivo %s' % filepath)
-
-    inicio_seccion('popularidad')
-    popularidad = tp1.get_popularidad() # O(|V|)
-    tp1.mostrar_popularidad(popularidad) # O(|V|)
-    fin_seccion()
-
-    inicio_seccion('influencias')
-    influencias = tp1.get_influencias() # O(|V|**3)
-    tp1.mostrar_influencias(influencias) # O(|V|**2)
-    fin_seccion()
-
-    inicio_seccion('recomendaciones')
-    recomendaciones = tp1.recomendaciones() # O(|V|*|A|)
-    tp1.mostrar_recomendaciones(recomendaciones) # O(n*log(n))
-    fin_seccion()
+    with instrumentacion.fase('carga'):
+        tp1 = TP1(filepath) # O(|V|+|E|*log(|V|))
+        if snapshot and not es_snapshot(filepath):
+            tp1.guardar_snapshot(filepath + EXTENSION_SNAPSHOT)
+
+    if cache is None:
+        obtener = lambda clave, calcular: calcular()
+        clave_influencias = clave_recomendaciones = None
+    else:
+        obtener = cache.obtener
+        huella = huella_archivo(filepath) # O(tamaño del archivo)
+        parametros = {}
+        if error is not None:
+            parametros = dict(error=error, confianza=confianza,
+                    semilla=semilla)
+        clave_influencias = cache.clave(huella, 'influencias', **parametros)
+        if centralidades:
+            clave_influencias = cache.clave(huella, 'centralidades')
+        clave_recomendaciones = cache.clave(huella, 'recomendaciones')
+
+    def calcular_centralidades():
+        medidas = tp1.get_centralidades(procesos=procesos) # O(|V|**3)
+        influencias = [ tp1.grafo.get_influencia(u)
+                for u in tp1.grafo.iternodes() ]
+        return influencias, None, 0, medidas
+
+    def calcular_influencias():
+        influencias = tp1.get_influencias(procesos=procesos, error=error,
+                confianza=confianza, semilla=semilla,
+                biconexas=biconexas) # O(|V|**3)
+        muestras = None
+        if error is not None:
+            muestras = tp1.grafo.cantidad_muestras_influencias
+        return influencias, muestras, tp1.cota_error_influencias
+
+    escritor.inicio_archivo(filepath)
+
+    escritor.inicio_seccion('popularidad')
+    with instrumentacion.fase('popularidad'):
+        # O(|V|+grado máximo)
+        popularidad = tp1.seleccionar_popularidad(top,
+                minimos.get('popularidad'))
+        escritor.popularidad(tp1.filas_popularidad(popularidad))
+    escritor.fin_seccion()
+
+    escritor.inicio_seccion('influencias')
+    with instrumentacion.fase('influencias'):
+        if centralidades:
+            influencias, muestras, cota, medidas = obtener(
+                    clave_influencias, calcular_centralidades)
+        else:
+            influencias, muestras, cota = obtener(clave_influencias,
+                    calcular_influencias)
+    # O(|V|*log(|V|))
+    escritor.influencias(tp1.filas_influencias(tp1.seleccionar_influencias(
+        influencias, top, minimos.get('influencias'))))
+    if error is not None:
+        escritor.aproximacion(muestras, cota, confianza)
+    escritor.fin_seccion()
+
+    if centralidades:
+        escritor.inicio_seccion('centralidades')
+        # O(|V|*log(|V|))
+        escritor.centralidades(tp1.filas_centralidades(medidas,
+            tp1.seleccionar_centralidades(medidas, top,
+                minimos.get('centralidades'))))
+        escritor.fin_seccion()
+
+        escritor.inicio_seccion('influencias_aristas')
+        # O(|E|*log(|E|))
+        escritor.influencias_aristas(tp1.filas_influencias_aristas(
+            tp1.seleccionar_influencias_aristas(medidas, top,
+                minimos.get('influencias_aristas'))))
+        escritor.fin_seccion()
+
+    escritor.inicio_seccion('recomendaciones')
+    with instrumentacion.fase('recomendaciones'):
+        # O(Sum(u in V,Au**2))
+        recomendaciones = obtener(clave_recomendaciones,
+                tp1.recomendaciones)
+    # O(n*log(n)), O(n) sin ordenar
+    escritor.recomendaciones(tp1.filas_recomendaciones(
+        tp1.seleccionar_recomendaciones(recomendaciones, top,
+            minimos.get('recomendaciones'), ordenar)))
+    escritor.fin_seccion()
+
+    escritor.fin_archivo()
+
+EXTENSION_SNAPSHOT = '.snap'
+
+def reporte_instrumentado(filepath, instrumentar=False, perfiles=None,
+        **opciones):
+    """
+    Genera el reporte de filepath (ver reporte_amigos_facebook_gdf). Si
+    instrumentar es verdadero o se indica un prefijo de perfiles, se
+    devuelven las estadísticas de sus fases; si no, None.
+    """
+    actual = None
+    if instrumentar or perfiles is not None:
+        prefijo = None
+        if perfiles is not None:
+            prefijo = '%s%s.' % (perfiles, os.path.basename(filepath))
+        actual = instrumentacion.activar(Instrumentacion(prefijo))
+    try:
+        # O((|V|**2)*(|V|+|A|))
+        reporte_amigos_facebook_gdf(filepath, **opciones)
+    finally:
+        instrumentacion.desactivar()
+    if actual is None:
+        return None
+    return dict(actual.como_dict(), archivo=filepath)
+
+
+def _reporte_en_archivo(argumentos):
+    """
+    Genera el reporte en un proceso del pool sobre un archivo temporal y
+    devuelve su ruta junto con sus estadísticas.
+    """
+    filepath, opciones = argumentos
+    descriptor, temporal = tempfile.mkstemp(suffix='.reporte')
+    try:
+        with os.fdopen(descriptor, 'wb') as salida:
+            estadisticas = reporte_instrumentado(filepath, salida=salida,
+                    **opciones)
+    except:
+        os.remove(temporal)
+        raise
+    return temporal, estadisticas
+
+
+def reportes(archivos, archivos_en_paralelo=1, **opciones):
+    """
+    Genera el reporte de cada archivo en el orden indicado y devuelve
+    las estadísticas de cada uno (ver reporte_instrumentado).
+    archivos_en_paralelo: cantidad de archivos que se procesan a la vez,
+    cada uno en su propio proceso. Cada reporte se escribe completo en
+    cuanto terminan él y los anteriores, mientras los procesos siguen
+    cargando y calculando los archivos siguientes. Los procesos escriben
+    su reporte en un archivo temporal, que luego se copia en bloques.
+    """
+    escritor = crear_escritor(opciones.get('formato', 'texto'))
+    escritor.encabezado()
+    escritor.vaciar()
+
+    if archivos_en_paralelo <= 1:
+        estadisticas = []
+        for filepath in archivos:
+            estadisticas.append(reporte_instrumentado(filepath, **opciones))
+        return estadisticas
+
+    pool = multiprocessing.Pool(min(archivos_en_paralelo, len(archivos)))
+    try:
+        estadisticas = []
+        for temporal, estadisticas_archivo in pool.imap(_reporte_en_archivo,
+                [ (filepath, opciones) for filepath in archivos ]):
+            try:
+                with open(temporal, 'rb') as f:
+                    shutil.copyfileobj(f, sys.stdout)
+            finally:
+                os.remove(temporal)
+            sys.stdout.flush()
+            estadisticas.append(estadisticas_archivo)
+        pool.close()
+    except:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+    return estadisticas
 
-    fin_seccion()
 
 def reporte_amigos_facebook():
-    for filepath in sys.argv[1:]:
-        reporte_amigos_facebook_gdf(filepath) # O((|V|**2)*(|V|+|A|))
+    parser = argparse.ArgumentParser(
+            description='Genera un reporte por cada archivo gdf.')
+    parser.add_argument('archivos', nargs='+', metavar='archivo_gdf')
+    parser.add_argument('--procesos', type=int, default=None,
+            help='Cantidad de procesos para el cálculo de influencias.')
+    parser.add_argument('--archivos-en-paralelo', type=int, default=1,
+            metavar='N', help='Procesa N archivos a la vez; los reportes '
+            'se emiten en el orden de los argumentos.')
+    parser.add_argument('--error', type=float, default=None,
+            help='Estima las influencias con este error relativo máximo.')
+    parser.add_argument('--confianza', type=float, default=0.95,
+            help='Probabilidad con que se cumple la cota de --error.')
+    parser.add_argument('--semilla', type=int, default=None,
+            help='Semilla para la muestra de orígenes de --error.')
+    parser.add_argument('--biconexas', action='store_true',
+            help='Calcula las influencias exactas por componente biconexa, '
+            'sin recorrer los árboles colgantes.')
+    parser.add_argument('--formato', choices=ESCRITORES.keys(),
+            default='texto', help='Formato del reporte.')
+    parser.add_argument('--top', type=int, default=None, metavar='N',
+            help='Muestra a lo sumo N filas por sección.')
+    parser.add_argument('--sin-ordenar', action='store_true',
+            help='Sin --top, escribe las recomendaciones en el orden en '
+            'que se generan en lugar de ordenarlas por amigos en común.')
+    parser.add_argument('--minimo', action='append', default=[],
+            metavar='SECCION=VALOR', help='Omite las filas de la sección '
+            '(%s) con grado, influencia o amigos en común menor a '
+            'VALOR. Puede repetirse.' % ', '.join(SECCIONES))
+    parser.add_argument('--centralidades', action='store_true',
+            help='Agrega la cercanía, la centralidad armónica, la '
+            'excentricidad y la influencia de las aristas, calculadas en '
+            'el mismo recorrido que las influencias.')
+    parser.add_argument('--guardar-snapshot', action='store_true',
+            help='Guarda un snapshot binario de cada gdf (archivo%s) '
+            'que luego puede pasarse en lugar del gdf.' % EXTENSION_SNAPSHOT)
+    parser.add_argument('--cache', default=None, metavar='DIRECTORIO',
+            help='Guarda las influencias y recomendaciones calculadas y las '
+            'reutiliza para archivos de idéntico contenido.')
+    parser.add_argument('--tamanio-cache', type=int,
+            default=TAMANIO_MAXIMO >> 20, metavar='MB',
+            help='Tamaño máximo de la caché en MB.')
+    parser.add_argument('--stats', default=None, metavar='ARCHIVO',
+            help='Guarda en JSON el tiempo, la cpu y la memoria de cada '
+            'fase y los contadores de los recorridos.')
+    parser.add_argument('--perfiles', default=None, metavar='PREFIJO',
+            help='Perfila cada fase con cProfile y la guarda en '
+            'PREFIJO<archivo>.<fase>.prof.')
+    args = parser.parse_args()
+    if args.archivos_en_paralelo > 1 and args.procesos is not None:
+        # Los procesos del pool no pueden crear a su vez otros procesos.
+        parser.error('--procesos no puede combinarse con '
+                '--archivos-en-paralelo.')
+    if args.centralidades and args.error is not None:
+        parser.error('--centralidades no puede combinarse con --error.')
+    minimos = {}
+    for minimo in args.minimo:
+        seccion, _, valor = minimo.partition('=')
+        if seccion not in SECCIONES:
+            parser.error('Sección desconocida en --minimo: %s.' % seccion)
+        try:
+            minimos[seccion] = float(valor)
+        except ValueError:
+            parser.error('Valor inválido en --minimo: %s.' % minimo)
+    cache = None
+    if args.cache is not None:
+        cache = CacheResultados(args.cache, args.tamanio_cache << 20)
+    estadisticas = reportes(args.archivos,
+            archivos_en_paralelo=args.archivos_en_paralelo,
+            instrumentar=args.stats is not None, perfiles=args.perfiles,
+            procesos=args.procesos, error=args.error,
+            confianza=args.confianza, semilla=args.semilla,
+            biconexas=args.biconexas, snapshot=args.guardar_snapshot,
+            cache=cache, formato=args.formato, top=args.top,
+            minimos=minimos, centralidades=args.centralidades,
+            ordenar=not args.sin_ordenar)
+    if args.stats is not None:
+        with open(args.stats, 'w') as f:
+            json.dump(estadisticas, f, indent=2, sort_keys=True)
 
 
 if __name__ == '__main__':